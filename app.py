@@ -1,11 +1,24 @@
-from flask import Flask, render_template, request, jsonify
-import json
+from flask import Flask, render_template, request, jsonify, g, stream_with_context
+import logging
 import os
-import requests
-import zipfile
-import io
-import sqlite3
+import time
 from dotenv import load_dotenv
+from search_engine import get_search_index
+from company_resolver import get_resolver
+from db_pool import get_pool
+from financial_cache import FinancialStatementCache
+from financial_store import FinancialStatementStore
+from opendart_client import parse_years, fetch_multi_financial_info
+from single_flight import SingleFlight, default_lock_dir
+from ratio_engine import FinancialPanel, compute_ratios, ratio_records
+from dart_transport import get_transport, get_json_many, DartTransportError, TRANSIENT_STATUSES
+from http_cache import ResponseCache, cache_policy
+from response_format import parse_format, compact_financial_data, FORMAT_COMPACT
+from series_planner import ANNUAL_REPORT, collect_annual_series
+from ratio_table import RATIO_COLUMNS, parse_filter, parse_sort
+from financial_export import CONTENT_TYPES, export_chunks, export_rows, parse_export_format
+from app_logging import setup_logging
+import metrics
 
 # 환경변수 로드
 load_dotenv()
@@ -15,26 +28,126 @@ app = Flask(__name__)
 # 디버그 모드 활성화
 app.debug = True
 
-# OpenDart API 키
+# OpenDart API 키 (없어도 시작하며, OpenDART 호출 시 오류 응답)
 API_KEY = os.getenv('OPENDART_API_KEY')
+
+# 로그는 별도 스레드에서 출력 (LOG_LEVEL, API 키는 출력 전에 가림)
+setup_logging(secrets=[API_KEY])
+logger = logging.getLogger(__name__)
+
 if not API_KEY:
-    raise ValueError("OPENDART_API_KEY not found in environment variables")
+    logger.warning("OPENDART_API_KEY가 설정되지 않았습니다. 저장소/캐시에 없는 데이터는 조회할 수 없습니다.")
+
+# 관리자 API 토큰 (설정하지 않으면 관리자 API 비활성화)
+ADMIN_TOKEN = os.getenv('ADMIN_TOKEN')
+
+# 시계열 조회 시 최대 요청 수 (사업연도 x 보고서)
+MAX_SERIES_REQUESTS = 48
+
+# 내보내기 시 최대 사업연도 x 보고서 조합 수
+MAX_EXPORT_PERIODS = 120
+
+# 다중회사 조회 시 최대 회사 수
+MAX_MULTI_COMPANIES = 1000
+
+# 일괄 식별 시 최대 식별자 수
+MAX_RESOLVE_IDS = 10000
+
+# 스크리너 기본/최대 결과 수
+DEFAULT_SCREEN_LIMIT = 50
+MAX_SCREEN_LIMIT = 500
+
+# 동일한 OpenDART 요청 합치기 (워커 간에는 파일 잠금으로 조정)
+single_flight = SingleFlight(default_lock_dir())
+
+# 재무제표 응답 캐시
+financial_cache = FinancialStatementCache(os.getenv('FINANCIAL_CACHE_DB', 'financial_cache.db'))
+
+# 정규화된 재무제표 저장소
+financial_store = FinancialStatementStore(os.getenv('FINANCIAL_STORE_DB', 'financial_statements.db'))
+
+# 직렬화/압축된 JSON 응답 캐시 (재무제표 캐시가 무효화되면 관련 응답도 제거)
+response_cache = ResponseCache(int(os.getenv('RESPONSE_CACHE_MB', '32')) * 1024 * 1024)
+financial_cache.add_invalidation_listener(response_cache.invalidate)
+
+# 재무제표 조회 (저장소 → 캐시 순, 없으면 None)
+def load_financial_data(corp_code, bsns_year, reprt_code):
+    with metrics.stage('store_lookup'):
+        data = financial_store.get_report(corp_code, bsns_year, reprt_code)
+        if data is None:
+            data = financial_cache.get(corp_code, bsns_year, reprt_code)
+    return data
+
+# OpenDART 응답을 캐시와 저장소에 저장 (요청 제한 초과 등 일시적인 오류는 저장하지 않음)
+def save_financial_data(corp_code, bsns_year, reprt_code, data):
+    if data.get('status') in TRANSIENT_STATUSES:
+        return data
+    financial_cache.put(corp_code, bsns_year, reprt_code, data)
+    financial_store.put_report(corp_code, bsns_year, reprt_code, data)
+    return dict(data)
+
+# 캐시된 응답 전송 (ETag가 일치하면 304, Accept-Encoding에 따라 압축된 본문)
+def send_cached_response(key, entry):
+    with metrics.stage('encode'):
+        status, headers, body = response_cache.render(
+            key, entry, request.headers.get('If-None-Match'), request.headers.get('Accept-Encoding')
+        )
+    return app.response_class(body, status=status, headers=headers)
+
+# 응답 캐시 조회 (없으면 None)
+def cached_response(key):
+    financial_cache.sync_invalidations()
+    entry = response_cache.get(key)
+    return None if entry is None else send_cached_response(key, entry)
 
-# 데이터베이스 연결 함수
+# 응답을 직렬화/캐시하고 전송 (periods: [(사업연도, 상태)], tags: 포함된 corp_code)
+def cacheable_response(key, payload, periods, tags):
+    cache_control, ttl = cache_policy(periods)
+    with metrics.stage('serialize'):
+        entry = response_cache.put(key, payload, cache_control, ttl, tags)
+    return send_cached_response(key, entry)
+
+# 요청한 응답 형식으로 재무제표 변환 (compact: 헤더 + 재무제표별 열 배열)
+def format_financial_data(data, response_format):
+    return compact_financial_data(data) if response_format == FORMAT_COMPACT else data
+
+# 데이터베이스 연결 함수 (스레드별 읽기 전용 연결을 재사용하므로 닫지 않음)
 def get_db_connection():
-    conn = sqlite3.connect('corp_codes.db')
-    conn.row_factory = sqlite3.Row
-    return conn
+    return get_pool('corp_codes.db').connection()
 
 # 데이터베이스 초기화 확인
 def init_db_if_needed():
+    """회사 코드 DB가 있는지 확인 (워커 시작 시 다운로드/생성하지 않음)"""
     if not os.path.exists('corp_codes.db'):
-        from create_corp_db import create_database
-        create_database()
+        logger.warning("corp_codes.db가 없습니다. 'python create_corp_db.py'로 먼저 생성하세요.")
 
 # 애플리케이션 시작 시 데이터베이스 초기화 확인
 init_db_if_needed()
 
+# 상장 회사 재무제표 백그라운드 수집 (여러 워커 중 하나만 실행)
+if os.getenv('PREFETCH_ENABLED') == '1':
+    from prefetch_financials import start_background_prefetch
+    start_background_prefetch(financial_store)
+
+@app.before_request
+def start_request_timer():
+    """요청 처리 시간 측정 시작 (하위 계층 지표의 엔드포인트 레이블 설정)"""
+    g.request_started = time.perf_counter()
+    metrics.current_endpoint.set(request.endpoint or 'unknown')
+
+@app.after_request
+def record_request_time(response):
+    """엔드포인트/상태 코드별 요청 처리 시간 기록"""
+    started = g.get('request_started')
+    if started is not None:
+        metrics.observe_request(request.endpoint or 'unknown', response.status_code, time.perf_counter() - started)
+    return response
+
+@app.route('/metrics')
+def prometheus_metrics():
+    """Prometheus 형식 지표 (모든 워커 합산)"""
+    return app.response_class(metrics.registry.render(), mimetype='text/plain; version=0.0.4')
+
 @app.route('/')
 def index():
     """메인 페이지"""
@@ -47,26 +160,9 @@ def search_company():
     if not query:
         return jsonify([])
     
-    # 데이터베이스에서 회사명 검색
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    # 회사명에 검색어가 포함된 회사들 찾기 (최대 10개)
-    cursor.execute(
-        "SELECT corp_code, corp_name, stock_code, modify_date FROM companies WHERE corp_name LIKE ? LIMIT 10",
-        (f'%{query}%',)
-    )
-    
-    results = []
-    for row in cursor.fetchall():
-        results.append({
-            'corp_code': row['corp_code'],
-            'corp_name': row['corp_name'],
-            'stock_code': row['stock_code'],
-            'modify_date': row['modify_date']
-        })
-    
-    conn.close()
+    # 메모리 검색 인덱스에서 회사명 검색 (최대 10개)
+    with metrics.stage('search_index'):
+        results = get_search_index().search(query, limit=10)
     return jsonify(results)
 
 @app.route('/get_financial_data')
@@ -79,8 +175,18 @@ def get_financial_data():
     if not corp_code:
         return jsonify({'error': '회사 코드가 필요합니다.'})
     
+    try:
+        response_format = parse_format(request.args.get('format'))
+    except ValueError:
+        return jsonify({'error': '지원하지 않는 응답 형식입니다. (full, compact)'})
+    
+    cache_key = ('get_financial_data', corp_code, bsns_year, reprt_code, response_format)
+    cached = cached_response(cache_key)
+    if cached is not None:
+        return cached
+    
     # OpenDart API 호출
-    url = "https://opendart.fss.or.kr/api/fnlttSinglAcnt.json"
+    url = "fnlttSinglAcnt.json"
     params = {
         'crtfc_key': API_KEY,
         'corp_code': corp_code,
@@ -88,29 +194,31 @@ def get_financial_data():
         'reprt_code': reprt_code
     }
     
-    print(f"OpenDART API 호출: {url} - 파라미터: {params}")
+    logger.debug("재무제표 조회: %s/%s/%s", corp_code, bsns_year, reprt_code)
     
     try:
-        response = requests.get(url, params=params)
-        data = response.json()
-        
-        print(f"OpenDART API 응답: 상태 코드={response.status_code}, 응답={data.get('status')}, 메시지={data.get('message')}")
-        
-        # 재무비율 계산 추가
-        if data.get('status') == '000' and data.get('list'):
-            print(f"재무제표 데이터 개수: {len(data['list'])}")
-            data['financial_ratios'] = calculate_financial_ratios(data['list'])
+        # 저장소나 캐시에 있으면 API 호출 생략
+        data = load_financial_data(corp_code, bsns_year, reprt_code)
+        if data is None:
+            def fetch():
+                # 다른 요청이 먼저 받아 저장했을 수 있으므로 다시 확인
+                cached = load_financial_data(corp_code, bsns_year, reprt_code)
+                if cached is not None:
+                    return cached
+                
+                result = get_transport().get_json(url, params)
+                logger.debug("OpenDART API 응답: 응답=%s, 메시지=%s", result.get('status'), result.get('message'))
+                return save_financial_data(corp_code, bsns_year, reprt_code, result)
+            
+            # 동시에 들어온 같은 요청은 한 번만 호출
+            data = dict(single_flight.do(('fnlttSinglAcnt', corp_code, bsns_year, reprt_code), fetch))
         else:
-            print(f"재무제표 데이터 없음: {data}")
-            # 빈 데이터 구조 제공
-            if 'list' not in data:
-                data['list'] = []
-            if 'financial_ratios' not in data:
-                data['financial_ratios'] = {}
+            logger.debug("재무제표 캐시 적중: %s/%s/%s", corp_code, bsns_year, reprt_code)
         
-        return jsonify(data)
+        data = format_financial_data(attach_financial_ratios(data), response_format)
+        return cacheable_response(cache_key, data, [(bsns_year, data.get('status'))], [corp_code])
     except Exception as e:
-        print(f"API 호출 중 오류 발생: {e}")
+        logger.error("API 호출 중 오류 발생: %s", e)
         return jsonify({
             'status': 'error',
             'message': str(e),
@@ -118,77 +226,310 @@ def get_financial_data():
             'financial_ratios': {}
         })
 
-def calculate_financial_ratios(financial_data):
-    """재무비율 계산"""
-    ratios = {}
+def attach_financial_ratios(data):
+    """OpenDART 응답에 재무비율 추가"""
+    if data.get('status') == '000' and data.get('list'):
+        logger.debug("재무제표 데이터 개수: %d", len(data['list']))
+        with metrics.stage('ratios'):
+            data['financial_ratios'] = calculate_financial_ratios(data['list'])
+    else:
+        logger.debug("재무제표 데이터 없음: 응답=%s, 메시지=%s", data.get('status'), data.get('message'))
+        # 빈 데이터 구조 제공
+        if 'list' not in data:
+            data['list'] = []
+        if 'financial_ratios' not in data:
+            data['financial_ratios'] = {}
+    return data
+
+def fetch_financial_series(corp_code, periods):
+    """누락된 (사업연도, 보고서 코드)를 공용 전송 계층으로 동시에 조회 ({키: 응답 또는 예외})"""
+    calls = []
+    for year, reprt_code in periods:
+        year, reprt_code = str(year), str(reprt_code)
+        calls.append(((year, reprt_code), 'fnlttSinglAcnt.json', {
+            'crtfc_key': API_KEY,
+            'corp_code': corp_code,
+            'bsns_year': year,
+            'reprt_code': reprt_code
+        }))
+    return get_json_many(calls)
+
+def load_annual_series(corp_code, years):
+    """사업보고서 시계열 수집 (전기/전전기 열을 재사용하여 필요한 보고서만 조회)
+
+    {(사업연도, '11011'): (응답, 값을 가져온 보고서 사업연도)} 반환
+    """
+    def load(year):
+        return load_financial_data(corp_code, str(year), ANNUAL_REPORT)
+
+    def fetch(plan):
+        logger.debug("사업보고서 조회 계획: %s %s", corp_code, plan)
+        periods = [(str(year), ANNUAL_REPORT) for year in plan]
+        results = {}
+        for (year, reprt_code), data in fetch_financial_series(corp_code, periods).items():
+            if isinstance(data, Exception):
+                logger.error("API 호출 중 오류 발생: %s", data)
+            else:
+                data = save_financial_data(corp_code, year, reprt_code, data)
+            results[int(year)] = data
+        return results
+
+    series, fetched = collect_annual_series(years, load, fetch)
+    results = {}
+    for year in years:
+        entry = series.get(int(year))
+        if entry is None:
+            entry = ({'status': 'error', 'message': str(fetched.get(int(year)))}, int(year))
+        results[(year, ANNUAL_REPORT)] = entry
+    return results
+
+@app.route('/get_financial_series')
+def get_financial_series():
+    """여러 사업연도 x 보고서의 재무제표를 한 번에 가져오기"""
+    corp_code = request.args.get('corp_code', '')
+    reprt_codes = [code.strip() for code in request.args.get('reprt_codes', '11011').split(',') if code.strip()]
+    
+    if not corp_code:
+        return jsonify({'error': '회사 코드가 필요합니다.'})
     
-    # 필요한 계정 추출
-    bs_data = {item['account_nm']: item for item in financial_data if item['sj_div'] == 'BS'}
-    is_data = {item['account_nm']: item for item in financial_data if item['sj_div'] == 'IS'}
+    try:
+        years = parse_years(request.args.get('years', '2023'), MAX_SERIES_REQUESTS)
+    except ValueError as e:
+        return jsonify({'error': str(e)})
     
-    print(f"재무상태표 계정 수: {len(bs_data)}, 손익계산서 계정 수: {len(is_data)}")
+    periods = [(year, reprt_code) for year in years for reprt_code in reprt_codes]
+    if not periods or len(periods) > MAX_SERIES_REQUESTS:
+        return jsonify({'error': f'사업연도 x 보고서 조합은 1~{MAX_SERIES_REQUESTS}개까지 조회할 수 있습니다.'})
     
-    # 당기 데이터로 계산
     try:
-        # 1. 유동비율 (Current Ratio) = 유동자산 / 유동부채
-        if '유동자산' in bs_data and '유동부채' in bs_data:
-            current_assets = float(bs_data['유동자산']['thstrm_amount'].replace(',', ''))
-            current_liabilities = float(bs_data['유동부채']['thstrm_amount'].replace(',', ''))
-            if current_liabilities > 0:
-                ratios['current_ratio'] = {
-                    'name': '유동비율',
-                    'value': round(current_assets / current_liabilities * 100, 2),
-                    'unit': '%'
-                }
-        
-        # 2. 부채비율 (Debt Ratio) = 부채총계 / 자본총계
-        if '부채총계' in bs_data and '자본총계' in bs_data:
-            total_liabilities = float(bs_data['부채총계']['thstrm_amount'].replace(',', ''))
-            total_equity = float(bs_data['자본총계']['thstrm_amount'].replace(',', ''))
-            if total_equity > 0:
-                ratios['debt_ratio'] = {
-                    'name': '부채비율',
-                    'value': round(total_liabilities / total_equity * 100, 2),
-                    'unit': '%'
-                }
-        
-        # 3. 매출액이익률 (Profit Margin) = 당기순이익 / 매출액
-        if '당기순이익' in is_data and '매출액' in is_data:
-            net_income = float(is_data['당기순이익']['thstrm_amount'].replace(',', ''))
-            revenue = float(is_data['매출액']['thstrm_amount'].replace(',', ''))
-            if revenue > 0:
-                ratios['profit_margin'] = {
-                    'name': '매출액이익률',
-                    'value': round(net_income / revenue * 100, 2),
-                    'unit': '%'
-                }
-        
-        # 4. 자기자본이익률 (ROE) = 당기순이익 / 자본총계
-        if '당기순이익' in is_data and '자본총계' in bs_data:
-            net_income = float(is_data['당기순이익']['thstrm_amount'].replace(',', ''))
-            total_equity = float(bs_data['자본총계']['thstrm_amount'].replace(',', ''))
-            if total_equity > 0:
-                ratios['roe'] = {
-                    'name': '자기자본이익률(ROE)',
-                    'value': round(net_income / total_equity * 100, 2),
-                    'unit': '%'
-                }
-        
-        # 5. 총자산이익률 (ROA) = 당기순이익 / 자산총계
-        if '당기순이익' in is_data and '자산총계' in bs_data:
-            net_income = float(is_data['당기순이익']['thstrm_amount'].replace(',', ''))
-            total_assets = float(bs_data['자산총계']['thstrm_amount'].replace(',', ''))
-            if total_assets > 0:
-                ratios['roa'] = {
-                    'name': '총자산이익률(ROA)',
-                    'value': round(net_income / total_assets * 100, 2),
-                    'unit': '%'
-                }
-    
-    except (ValueError, KeyError, ZeroDivisionError) as e:
-        print(f"재무비율 계산 중 오류 발생: {e}")
-    
-    print(f"계산된 재무비율: {ratios}")
+        response_format = parse_format(request.args.get('format'))
+    except ValueError:
+        return jsonify({'error': '지원하지 않는 응답 형식입니다. (full, compact)'})
+    
+    cache_key = ('get_financial_series', corp_code, tuple(periods), response_format)
+    cached = cached_response(cache_key)
+    if cached is not None:
+        return cached
+    
+    # 사업보고서는 당기/전기/전전기 열을 이어 붙여 필요한 보고서만 조회
+    results = {}
+    annual_years = [year for year, reprt_code in periods if reprt_code == ANNUAL_REPORT]
+    if annual_years:
+        results.update(load_annual_series(corp_code, annual_years))
+    
+    # 나머지는 저장소나 캐시에 없는 기간만 동시에 조회
+    missing = []
+    for year, reprt_code in periods:
+        if reprt_code == ANNUAL_REPORT:
+            continue
+        data = load_financial_data(corp_code, year, reprt_code)
+        if data is None:
+            missing.append((year, reprt_code))
+        else:
+            results[(year, reprt_code)] = (data, int(year))
+    
+    if missing:
+        for (year, reprt_code), data in fetch_financial_series(corp_code, missing).items():
+            if isinstance(data, Exception):
+                logger.error("API 호출 중 오류 발생: %s", data)
+                data = {'status': 'error', 'message': str(data)}
+            else:
+                data = save_financial_data(corp_code, year, reprt_code, data)
+            results[(year, reprt_code)] = (data, int(year))
+    
+    series = []
+    for year, reprt_code in periods:
+        data, source_year = results[(year, reprt_code)]
+        data = format_financial_data(attach_financial_ratios(data), response_format)
+        data['bsns_year'] = year
+        data['reprt_code'] = reprt_code
+        data['source_bsns_year'] = str(source_year)
+        series.append(data)
+    
+    # 캐시 유효기간은 값을 가져온 보고서의 사업연도 기준
+    return cacheable_response(cache_key, {
+        'status': '000',
+        'corp_code': corp_code,
+        'series': series
+    }, [(data['source_bsns_year'], data.get('status')) for data in series], [corp_code])
+
+def fetch_multi_financial_data(corp_codes, bsns_year, reprt_code):
+    """여러 회사의 재무제표를 다중회사 API(100개 단위)로 동시에 조회 ({corp_code: 응답 또는 예외})"""
+    results = fetch_multi_financial_info(API_KEY, corp_codes, bsns_year, reprt_code)
+    
+    # 다중회사 응답에 빠진 회사는 단일회사 API로 확인 (추정한 013을 그대로 반환하지 않음)
+    inferred = [
+        corp_code for corp_code, data in results.items()
+        if not isinstance(data, Exception) and data.get('inferred')
+    ]
+    if inferred:
+        results.update(get_json_many(
+            (corp_code, 'fnlttSinglAcnt.json', {
+                'crtfc_key': API_KEY,
+                'corp_code': corp_code,
+                'bsns_year': bsns_year,
+                'reprt_code': reprt_code
+            })
+            for corp_code in inferred
+        ))
+    return results
+
+@app.route('/get_multi_financial_data', methods=['GET', 'POST'])
+def get_multi_financial_data():
+    """여러 회사의 재무제표와 재무비율을 한 번에 가져오기"""
+    if request.method == 'POST':
+        body = request.get_json(silent=True) or {}
+        corp_codes = body.get('corp_codes') or []
+        bsns_year = str(body.get('bsns_year', '2023'))
+        reprt_code = str(body.get('reprt_code', '11011'))
+        response_format = body.get('format')
+    else:
+        corp_codes = request.args.get('corp_codes', '').split(',')
+        bsns_year = request.args.get('bsns_year', '2023')
+        reprt_code = request.args.get('reprt_code', '11011')
+        response_format = request.args.get('format')
+    
+    try:
+        response_format = parse_format(response_format)
+    except ValueError:
+        return jsonify({'error': '지원하지 않는 응답 형식입니다. (full, compact)'})
+    
+    corp_codes = list(dict.fromkeys(str(code).strip() for code in corp_codes if str(code).strip()))
+    if not corp_codes:
+        return jsonify({'error': '회사 코드가 필요합니다.'})
+    if len(corp_codes) > MAX_MULTI_COMPANIES:
+        return jsonify({'error': f'한 번에 최대 {MAX_MULTI_COMPANIES}개 회사까지 조회할 수 있습니다.'})
+    
+    # POST 요청은 브라우저/CDN이 캐시하지 않으므로 서버 응답 캐시도 GET만 사용
+    cache_key = (
+        ('get_multi_financial_data', bsns_year, reprt_code, tuple(corp_codes), response_format)
+        if request.method == 'GET' else None
+    )
+    cached = cached_response(cache_key) if cache_key else None
+    if cached is not None:
+        return cached
+    
+    # 저장소나 캐시에 없는 회사만 다중회사 API로 조회
+    results = {}
+    missing = []
+    for corp_code in corp_codes:
+        data = load_financial_data(corp_code, bsns_year, reprt_code)
+        if data is None:
+            missing.append(corp_code)
+        else:
+            results[corp_code] = data
+    
+    if missing:
+        fetched = fetch_multi_financial_data(missing, bsns_year, reprt_code)
+        for corp_code, data in fetched.items():
+            if isinstance(data, Exception):
+                logger.error("API 호출 중 오류 발생: %s", data)
+                data = {'status': 'error', 'message': str(data)}
+            else:
+                data = save_financial_data(corp_code, bsns_year, reprt_code, data)
+            results[corp_code] = data
+    
+    # 재무비율은 전체 회사를 한 번에 계산
+    with metrics.stage('ratios'):
+        panel = FinancialPanel.from_payloads(
+            (corp_code, results[corp_code].get('list') if results[corp_code].get('status') == '000' else None)
+            for corp_code in corp_codes
+        )
+        ratios = ratio_records(panel, compute_ratios(panel))
+    
+    companies = {}
+    for corp_code, financial_ratios in zip(corp_codes, ratios):
+        data = results[corp_code]
+        data.setdefault('list', [])
+        data['financial_ratios'] = financial_ratios
+        companies[corp_code] = format_financial_data(data, response_format)
+    
+    return cacheable_response(cache_key, {
+        'status': '000',
+        'bsns_year': bsns_year,
+        'reprt_code': reprt_code,
+        'companies': companies
+    }, [(bsns_year, data.get('status')) for data in companies.values()], corp_codes)
+
+@app.route('/screen')
+def screen_companies():
+    """재무비율 조건/정렬로 상위 회사 조회 (예: filter=debt_ratio<100 and roe>10&sort=-roe)"""
+    bsns_year = request.args.get('bsns_year', '2023')
+    reprt_code = request.args.get('reprt_code', '11011')
+    listed_only = request.args.get('listed') == '1'
+    
+    try:
+        conditions, params = parse_filter(request.args.get('filter', ''))
+        order = parse_sort(request.args.get('sort'))
+    except ValueError as e:
+        return jsonify({'error': str(e)})
+    
+    limit = request.args.get('limit', str(DEFAULT_SCREEN_LIMIT))
+    limit = int(limit) if limit.isdigit() else 0
+    if not 1 <= limit <= MAX_SCREEN_LIMIT:
+        return jsonify({'error': f'결과 수는 1~{MAX_SCREEN_LIMIT} 사이여야 합니다.'})
+    
+    try:
+        with metrics.stage('screen'):
+            rows = financial_store.screen(bsns_year, reprt_code, conditions, params, order, limit,
+                                          directory_db='corp_codes.db', listed_only=listed_only)
+    except ValueError as e:
+        return jsonify({'error': str(e)})
+    
+    results = []
+    for row in rows:
+        results.append({
+            'corp_code': row['corp_code'],
+            'corp_name': row.get('corp_name'),
+            'stock_code': row.get('stock_code'),
+            'ratios': {name: round(row[name], 2) for name in RATIO_COLUMNS if row[name] is not None}
+        })
+    
+    return jsonify({
+        'status': '000',
+        'bsns_year': bsns_year,
+        'reprt_code': reprt_code,
+        'sort': [('-' if descending else '') + name for name, descending in order],
+        'count': len(results),
+        'results': results
+    })
+
+@app.route('/export')
+def export_financial_data():
+    """저장소/캐시에 있는 재무제표 계정 행을 NDJSON/CSV/Parquet으로 스트리밍 (OpenDART 호출 없음)"""
+    corp_codes = [code.strip() for code in request.args.get('corp_codes', '').split(',') if code.strip()]
+    reprt_codes = [code.strip() for code in request.args.get('reprt_codes', '11011').split(',') if code.strip()]
+    
+    try:
+        years = parse_years(request.args.get('years', '2023'), MAX_EXPORT_PERIODS)
+    except ValueError as e:
+        return jsonify({'error': str(e)})
+    
+    try:
+        export_format = parse_export_format(request.args.get('format'))
+    except ValueError as e:
+        # 지원하지 않는 형식 또는 pyarrow가 없는 서버의 parquet 요청
+        return jsonify({'error': str(e)}), 400
+    
+    if not years or not reprt_codes:
+        return jsonify({'error': '사업연도와 보고서 코드가 필요합니다.'})
+    if len(years) * len(reprt_codes) > MAX_EXPORT_PERIODS:
+        return jsonify({'error': f'사업연도 x 보고서 조합은 최대 {MAX_EXPORT_PERIODS}개까지 내보낼 수 있습니다.'})
+    
+    # 행을 청크 단위로 바로 보내므로(chunked) 응답 전체를 메모리에 만들지 않음
+    rows = export_rows(financial_store, years, reprt_codes, corp_codes, financial_cache)
+    filename = f"financial-{years[0]}-{years[-1]}.{export_format}"
+    return app.response_class(
+        stream_with_context(export_chunks(rows, export_format)),
+        content_type=CONTENT_TYPES[export_format],
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+    )
+
+def calculate_financial_ratios(financial_data):
+    """재무비율 계산 (다중회사 조회와 같은 ratio_engine 사용, 연결재무제표가 없으면 별도재무제표)"""
+    panel = FinancialPanel.from_payloads([(None, financial_data)])
+    ratios = ratio_records(panel, compute_ratios(panel))[0]
+    logger.debug("계산된 재무비율: %s", ratios)
     return ratios
 
 @app.route('/get_company_info')
@@ -199,17 +540,25 @@ def get_company_info():
     if not corp_code:
         return jsonify({'error': '회사 코드가 필요합니다.'})
     
+    cache_key = ('get_company_info', corp_code)
+    cached = cached_response(cache_key)
+    if cached is not None:
+        return cached
+    
     # OpenDart API 호출
-    url = "https://opendart.fss.or.kr/api/company.json"
+    url = "company.json"
     params = {
         'crtfc_key': API_KEY,
         'corp_code': corp_code
     }
     
-    response = requests.get(url, params=params)
-    data = response.json()
+    try:
+        data = single_flight.do(('company', corp_code), lambda: get_transport().get_json(url, params))
+    except DartTransportError as e:
+        return jsonify({'status': 'error', 'message': str(e)})
     
-    return jsonify(data)
+    # 회사 정보는 사업연도와 무관하므로 진행 중인 사업연도와 같은 유효기간 적용
+    return cacheable_response(cache_key, data, [(None, data.get('status'))], [corp_code])
 
 @app.route('/get_company_by_code')
 def get_company_by_code():
@@ -219,16 +568,12 @@ def get_company_by_code():
     if not corp_code:
         return jsonify({'error': '회사 코드가 필요합니다.'})
     
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute(
-        "SELECT corp_code, corp_name, stock_code, modify_date FROM companies WHERE corp_code = ?",
-        (corp_code,)
-    )
-    
-    row = cursor.fetchone()
-    conn.close()
+    with metrics.stage('db_query'):
+        conn = get_db_connection()
+        row = conn.execute(
+            "SELECT corp_code, corp_name, stock_code, modify_date FROM companies WHERE corp_code = ?",
+            (corp_code,)
+        ).fetchone()
     
     if row:
         return jsonify({
@@ -240,6 +585,63 @@ def get_company_by_code():
     else:
         return jsonify({'error': '해당 회사 코드를 찾을 수 없습니다.'})
 
+@app.route('/resolve_companies', methods=['POST'])
+def resolve_companies():
+    """종목코드/회사 코드/회사명 목록을 한 번에 회사 정보로 변환 (입력 순서 유지)"""
+    body = request.get_json(silent=True) or {}
+    ids = body.get('ids')
+    
+    if not isinstance(ids, list) or not ids:
+        return jsonify({'error': '식별자 목록(ids)이 필요합니다.'})
+    if len(ids) > MAX_RESOLVE_IDS:
+        return jsonify({'error': f'한 번에 최대 {MAX_RESOLVE_IDS}개까지 조회할 수 있습니다.'})
+    
+    with metrics.stage('resolve'):
+        results = get_resolver().resolve(ids)
+    
+    return jsonify({
+        'count': len(results),
+        'resolved': sum(1 for result in results if 'error' not in result),
+        'results': results
+    })
+
+def is_admin_request():
+    """관리자 토큰 확인"""
+    return bool(ADMIN_TOKEN) and request.headers.get('X-Admin-Token') == ADMIN_TOKEN
+
+@app.route('/admin/cache/stats')
+def admin_cache_stats():
+    """재무제표 캐시 통계"""
+    if not is_admin_request():
+        return jsonify({'error': '권한이 없습니다.'}), 403
+    
+    stats = financial_cache.get_stats()
+    stats['responses'] = response_cache.get_stats()
+    stats['typeahead'] = get_search_index().typeahead.get_stats()
+    return jsonify(stats)
+
+@app.route('/admin/single_flight/stats')
+def admin_single_flight_stats():
+    """동시 요청 합치기 통계"""
+    if not is_admin_request():
+        return jsonify({'error': '권한이 없습니다.'}), 403
+    
+    return jsonify(single_flight.get_stats())
+
+@app.route('/admin/cache/invalidate', methods=['POST'])
+def admin_cache_invalidate():
+    """회사 코드별 재무제표 캐시 무효화"""
+    if not is_admin_request():
+        return jsonify({'error': '권한이 없습니다.'}), 403
+    
+    corp_code = request.args.get('corp_code', '')
+    if not corp_code:
+        return jsonify({'error': '회사 코드가 필요합니다.'}), 400
+    
+    removed = financial_cache.invalidate(corp_code)
+    removed_reports = financial_store.invalidate(corp_code)
+    return jsonify({'corp_code': corp_code, 'removed': removed, 'removed_reports': removed_reports})
+
 if __name__ == '__main__':
     # 개발 환경에서는 디버그 모드로 실행
     # 프로덕션 환경에서는 호스트와 포트를 환경 변수에서 가져옴
@@ -0,0 +1,67 @@
+"""비동기 로깅 설정
+
+요청 처리 스레드는 로그 레코드를 큐에 넣기만 하고, 별도 스레드(QueueListener)가
+형식화와 stderr 출력을 맡는다. 레벨은 LOG_LEVEL 환경 변수로 정하며 (기본 INFO),
+비활성 레벨의 로그는 메시지 형식화도 하지 않는다. OpenDART API 키는 출력 전에 가린다.
+"""
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import re
+
+LOG_FORMAT = '%(asctime)s %(levelname)s [%(process)d] %(name)s: %(message)s'
+
+# URL/파라미터에 포함된 API 키 (crtfc_key=..., 'crtfc_key': '...')
+API_KEY_PATTERN = re.compile(r"""(crtfc_key['"]?\s*[=:]\s*['"]?)[^&\s'",}]+""")
+REDACTED = '***'
+
+_listener = None
+
+
+class RedactSecretsFilter(logging.Filter):
+    """로그 메시지에서 API 키를 가림"""
+
+    def __init__(self, secrets=()):
+        super().__init__()
+        self.secrets = [secret for secret in secrets if secret]
+
+    def filter(self, record):
+        message = record.getMessage()
+        redacted = API_KEY_PATTERN.sub(r'\1' + REDACTED, message)
+        for secret in self.secrets:
+            redacted = redacted.replace(secret, REDACTED)
+        if redacted != message:
+            record.msg = redacted
+            record.args = None
+        return True
+
+
+def setup_logging(level=None, secrets=()):
+    """루트 로거를 큐 기반 핸들러로 설정 (프로세스당 한 번만 적용)"""
+    global _listener
+    if _listener is not None:
+        return
+
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    handler.addFilter(RedactSecretsFilter(secrets))
+
+    log_queue = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(log_queue, handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+    root = logging.getLogger()
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel((level or os.getenv('LOG_LEVEL') or 'INFO').upper())
+
+    # gunicorn --preload처럼 임포트 후 fork되면 자식 프로세스에서 출력 스레드를 다시 시작
+    os.register_at_fork(after_in_child=_restart_listener)
+
+
+def _restart_listener():
+    if _listener is not None:
+        _listener._thread = None
+        _listener.start()
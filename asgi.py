@@ -0,0 +1,187 @@
+"""ASGI 진입점 (비동기 서빙 모드)
+
+OpenDART를 호출하는 엔드포인트는 이벤트 루프에서 비동기로 처리하여 업스트림 대기 중에도
+워커가 다른 요청을 받을 수 있게 하고, 나머지 경로는 기존 Flask 앱으로 넘긴다.
+
+    gunicorn asgi:application -k uvicorn.workers.UvicornWorker -w 4
+"""
+import asyncio
+import json
+import logging
+import time
+from urllib.parse import parse_qs
+
+from asgiref.wsgi import WsgiToAsgi
+
+import app as flask_app
+from async_opendart_client import AsyncOpenDartClient
+from dart_transport import DartTransportError
+import metrics
+from http_cache import cache_policy
+from response_format import parse_format
+from single_flight import AsyncSingleFlight
+
+# 워커당 업스트림 동시 요청 수
+UPSTREAM_CONCURRENCY = 256
+
+wsgi_application = WsgiToAsgi(flask_app.app)
+# Flask 앱과 같은 파일 잠금 single-flight를 써서 다른 워커와도 같은 호출을 합침
+single_flight = AsyncSingleFlight(flask_app.single_flight)
+client = None
+
+logger = logging.getLogger(__name__)
+
+
+async def send_json(send, payload, status=200):
+    """JSON 응답 전송"""
+    body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [
+            (b'content-type', b'application/json; charset=utf-8'),
+            (b'content-length', str(len(body)).encode('ascii'))
+        ]
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def send_cached(send, scope, key, entry):
+    """캐시된 응답 전송 (ETag가 일치하면 304, Accept-Encoding에 따라 압축된 본문)"""
+    request_headers = {name.decode('latin-1').lower(): value.decode('latin-1') for name, value in scope['headers']}
+    status, headers, body = flask_app.response_cache.render(
+        key, entry, request_headers.get('if-none-match'), request_headers.get('accept-encoding')
+    )
+    headers.append(('Content-Length', str(len(body))))
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers]
+    })
+    await send({'type': 'http.response.body', 'body': body})
+    return status
+
+
+def cached_entry(key):
+    """응답 캐시 조회 (다른 워커의 무효화 기록도 반영)"""
+    flask_app.financial_cache.sync_invalidations()
+    return flask_app.response_cache.get(key)
+
+
+def cache_response(key, payload, periods, tags):
+    cache_control, ttl = cache_policy(periods)
+    return flask_app.response_cache.put(key, payload, cache_control, ttl, tags)
+
+
+def query_params(scope):
+    """쿼리 문자열을 {이름: 첫 번째 값} 형태로 변환"""
+    parsed = parse_qs(scope.get('query_string', b'').decode('utf-8'))
+    return {key: values[0] for key, values in parsed.items()}
+
+
+async def get_financial_data(params):
+    """재무제표 데이터 가져오기 (app.get_financial_data의 비동기 버전)
+
+    오류 응답은 dict, 정상 응답은 (캐시 키, CachedResponse)로 반환한다.
+    """
+    corp_code = params.get('corp_code', '')
+    bsns_year = params.get('bsns_year', '2023')
+    reprt_code = params.get('reprt_code', '11011')
+
+    if not corp_code:
+        return {'error': '회사 코드가 필요합니다.'}
+
+    try:
+        response_format = parse_format(params.get('format'))
+    except ValueError:
+        return {'error': '지원하지 않는 응답 형식입니다. (full, compact)'}
+
+    key = ('get_financial_data', corp_code, bsns_year, reprt_code, response_format)
+    entry = cached_entry(key)
+    if entry is not None:
+        return key, entry
+
+    try:
+        data = await asyncio.to_thread(flask_app.load_financial_data, corp_code, bsns_year, reprt_code)
+        if data is None:
+            async def fetch():
+                # 다른 요청(워커)이 먼저 받아 저장했을 수 있으므로 다시 확인
+                cached = await asyncio.to_thread(flask_app.load_financial_data, corp_code, bsns_year, reprt_code)
+                if cached is not None:
+                    return cached
+                result = await client.get_financial_info(corp_code, bsns_year, reprt_code)
+                return await asyncio.to_thread(flask_app.save_financial_data, corp_code, bsns_year, reprt_code, result)
+
+            data = dict(await single_flight.do(('fnlttSinglAcnt', corp_code, bsns_year, reprt_code), fetch))
+
+        data = flask_app.format_financial_data(flask_app.attach_financial_ratios(data), response_format)
+        return key, cache_response(key, data, [(bsns_year, data.get('status'))], [corp_code])
+    except Exception as e:
+        logger.error("API 호출 중 오류 발생: %s", e)
+        return {'status': 'error', 'message': str(e), 'list': [], 'financial_ratios': {}}
+
+
+async def get_company_info(params):
+    """회사 정보 가져오기 (app.get_company_info의 비동기 버전)"""
+    corp_code = params.get('corp_code', '')
+
+    if not corp_code:
+        return {'error': '회사 코드가 필요합니다.'}
+
+    key = ('get_company_info', corp_code)
+    entry = cached_entry(key)
+    if entry is not None:
+        return key, entry
+
+    try:
+        data = await single_flight.do(('company', corp_code), lambda: client.get_company_info(corp_code))
+    except DartTransportError as e:
+        return {'status': 'error', 'message': str(e)}
+
+    return key, cache_response(key, data, [(None, data.get('status'))], [corp_code])
+
+
+ASYNC_ROUTES = {
+    '/get_financial_data': get_financial_data,
+    '/get_company_info': get_company_info
+}
+
+
+async def lifespan(receive, send):
+    """워커 시작/종료 시 OpenDART 클라이언트 세션 생성/종료"""
+    global client
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            client = AsyncOpenDartClient(api_key=flask_app.API_KEY, concurrency=UPSTREAM_CONCURRENCY)
+            await client.__aenter__()
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            if client is not None:
+                await client.close()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def application(scope, receive, send):
+    """ASGI 애플리케이션"""
+    if scope['type'] == 'lifespan':
+        await lifespan(receive, send)
+        return
+
+    handler = ASYNC_ROUTES.get(scope.get('path')) if scope['type'] == 'http' else None
+    if handler is None or scope.get('method') != 'GET':
+        await wsgi_application(scope, receive, send)
+        return
+
+    # Flask 쪽과 같은 엔드포인트 이름(뷰 함수 이름)으로 기록
+    endpoint = handler.__name__
+    started = time.perf_counter()
+    metrics.current_endpoint.set(endpoint)
+    result = await handler(query_params(scope))
+    if isinstance(result, dict):
+        status = 200
+        await send_json(send, result)
+    else:
+        status = await send_cached(send, scope, *result)
+    metrics.observe_request(endpoint, status, time.perf_counter() - started)
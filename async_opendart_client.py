@@ -0,0 +1,167 @@
+import asyncio
+import os
+import time
+
+import aiohttp
+from dotenv import load_dotenv
+
+import metrics
+from dart_transport import (
+    get_transport, backoff_delay, api_name, check_api_key, parse_json, DartTransportError,
+    CONNECT_TIMEOUT, READ_TIMEOUT, MAX_RETRIES, RETRY_HTTP_STATUSES, TRANSIENT_STATUSES
+)
+from opendart_client import chunk_corp_codes, split_multi_response
+
+# Load environment variables from .env file
+load_dotenv()
+
+# 동시에 진행할 수 있는 최대 요청 수
+DEFAULT_CONCURRENCY = 16
+
+
+class AsyncOpenDartClient:
+    """asyncio 기반 OpenDART 클라이언트 (OpenDartClient의 비동기 버전)
+
+    요청 속도 제한과 서킷 브레이커는 동기 전송 계층과 공유하므로
+    같은 프로세스에서 두 클라이언트를 함께 써도 할당량을 넘지 않는다.
+
+        async with AsyncOpenDartClient() as client:
+            data = await client.get_financial_info('00126380', 2023, '11011')
+    """
+
+    def __init__(self, api_key=None, concurrency=DEFAULT_CONCURRENCY, session=None):
+        # 키가 없으면 요청 시점에 DartTransportError
+        self.api_key = api_key or os.getenv('OPENDART_API_KEY')
+
+        transport = get_transport()
+        self.transport = transport
+        self.rate_limiter = transport.rate_limiter
+        self.circuit_breaker = transport.circuit_breaker
+
+        self.concurrency = concurrency
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._session = session
+        self._owns_session = session is None
+
+    async def __aenter__(self):
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.concurrency, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(sock_connect=CONNECT_TIMEOUT, sock_read=READ_TIMEOUT)
+            )
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        if self._session is not None and self._owns_session:
+            await self._session.close()
+            self._session = None
+
+    async def _send(self, url, params):
+        self.circuit_breaker.before_request()
+        wait = self.rate_limiter.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+        try:
+            async with self._session.get(url, params=params) as response:
+                if response.status >= 500:
+                    self.circuit_breaker.record_failure()
+                    return response.status, None
+                self.circuit_breaker.record_success()
+                if response.status != 200:
+                    return response.status, None
+                body = await response.read()
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            self.circuit_breaker.record_failure()
+            raise
+
+        with metrics.stage('json_decode'):
+            return response.status, parse_json(body)
+
+    async def get_json(self, path, params):
+        """JSON API 호출 (5xx, 네트워크 오류, 일시적인 상태 코드 재시도)"""
+        check_api_key(params)
+        url = self.transport.url_for(path)
+        params = {key: str(value) for key, value in params.items()}
+
+        async with self._semaphore:
+            started = time.perf_counter()
+            attempt = 0
+            while True:
+                try:
+                    status, data = await self._send(url, params)
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    if attempt >= MAX_RETRIES:
+                        metrics.observe_upstream(api_name(path), 'error', time.perf_counter() - started)
+                        raise DartTransportError(f"OpenDART 요청 실패: {e}") from e
+                else:
+                    if data is not None:
+                        if data.get('status') not in TRANSIENT_STATUSES or attempt >= MAX_RETRIES:
+                            metrics.observe_upstream(api_name(path), data.get('status'), time.perf_counter() - started)
+                            return data
+                    elif status == 200:
+                        # 해석할 수 없는 본문은 일시적인 오류로 보고 재시도
+                        if attempt >= MAX_RETRIES:
+                            metrics.observe_upstream(api_name(path), 'error', time.perf_counter() - started)
+                            raise DartTransportError("OpenDART 응답을 해석할 수 없습니다.")
+                    elif status not in RETRY_HTTP_STATUSES or attempt >= MAX_RETRIES:
+                        metrics.observe_upstream(api_name(path), 'error', time.perf_counter() - started)
+                        raise DartTransportError(f"OpenDART 요청 실패: HTTP {status}")
+
+                await asyncio.sleep(backoff_delay(attempt))
+                attempt += 1
+
+    async def get_company_info(self, corp_code):
+        """기업 정보 조회"""
+        return await self.get_json('company.json', {
+            'crtfc_key': self.api_key,
+            'corp_code': corp_code
+        })
+
+    async def get_financial_info(self, corp_code, year, report_code):
+        """재무정보 조회"""
+        return await self.get_json('fnlttSinglAcnt.json', {
+            'crtfc_key': self.api_key,
+            'corp_code': corp_code,
+            'bsns_year': year,
+            'reprt_code': report_code
+        })
+
+    async def get_financial_series(self, corp_code, periods):
+        """여러 (사업연도, 보고서 코드)의 재무정보를 동시에 조회
+
+        {(bsns_year, reprt_code): 응답 또는 예외} 형태로 반환한다.
+        """
+        keys = [(str(year), str(report_code)) for year, report_code in periods]
+        results = await asyncio.gather(
+            *(self.get_financial_info(corp_code, year, report_code) for year, report_code in keys),
+            return_exceptions=True
+        )
+        return dict(zip(keys, results))
+
+    async def get_multi_financial_info(self, corp_codes, year, report_code):
+        """여러 회사의 재무정보를 100개 단위 다중회사 요청으로 나누어 동시에 조회
+
+        {corp_code: 단일회사 응답 형식 또는 예외} 형태로 반환한다.
+        """
+        chunks = chunk_corp_codes(corp_codes)
+        responses = await asyncio.gather(
+            *(self.get_json('fnlttMultiAcnt.json', {
+                'crtfc_key': self.api_key,
+                'corp_code': ','.join(chunk),
+                'bsns_year': year,
+                'reprt_code': report_code
+            }) for chunk in chunks),
+            return_exceptions=True
+        )
+
+        results = {}
+        for chunk, data in zip(chunks, responses):
+            if isinstance(data, Exception):
+                results.update((corp_code, data) for corp_code in chunk)
+            else:
+                results.update(split_multi_response(chunk, data))
+        return results
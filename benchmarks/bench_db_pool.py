@@ -0,0 +1,93 @@
+"""회사 코드 조회 부하 테스트: 요청마다 새 연결 vs 스레드별 읽기 전용 연결 재사용
+
+사용법:
+    python -m benchmarks.bench_db_pool [--db corp_codes.db] [--threads 8] [--seconds 5]
+
+/get_company_by_code와 같은 단건 조회를 여러 스레드에서 반복 실행하여
+초당 처리 요청 수를 비교한다. --db를 지정하지 않으면 합성 DB를 사용한다.
+"""
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+
+from benchmarks.synthetic import create_synthetic_db
+from db_pool import ReadOnlyConnectionPool
+
+QUERY = "SELECT corp_code, corp_name, stock_code, modify_date FROM companies WHERE corp_code = ?"
+
+
+def per_request_connect(db_path):
+    """기존 app.get_db_connection 방식"""
+    def lookup(corp_code):
+        conn = sqlite3.connect(db_path)
+        conn.row_factory = sqlite3.Row
+        row = conn.execute(QUERY, (corp_code,)).fetchone()
+        conn.close()
+        return row
+    return lookup
+
+
+def pooled(db_path):
+    """db_pool.ReadOnlyConnectionPool 방식"""
+    pool = ReadOnlyConnectionPool(db_path)
+
+    def lookup(corp_code):
+        return pool.execute(QUERY, (corp_code,)).fetchone()
+    return lookup
+
+
+def load_test(lookup, corp_codes, threads, seconds):
+    """지정한 시간 동안 여러 스레드에서 조회를 반복하고 초당 요청 수 반환"""
+    counts = [0] * threads
+    deadline = time.perf_counter() + seconds
+
+    def worker(slot):
+        rng = random.Random(slot)
+        count = 0
+        while time.perf_counter() < deadline:
+            lookup(rng.choice(corp_codes))
+            count += 1
+        counts[slot] = count
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return sum(counts) / (time.perf_counter() - started)
+
+
+def run(db_path, threads, seconds):
+    conn = sqlite3.connect(db_path)
+    corp_codes = [row[0] for row in conn.execute('SELECT corp_code FROM companies')]
+    conn.close()
+
+    for label, factory in (('per-request connect', per_request_connect), ('pooled read-only', pooled)):
+        rps = load_test(factory(db_path), corp_codes, threads, seconds)
+        print(f"{label:<22} {rps:10.0f} req/s ({threads} threads)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--db', help='회사 코드 DB 경로 (기본: 합성 데이터)')
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=5.0)
+    args = parser.parse_args()
+
+    if args.db:
+        run(args.db, args.threads, args.seconds)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'corp_codes.db')
+        create_synthetic_db(db_path)
+        run(db_path, args.threads, args.seconds)
+
+
+if __name__ == '__main__':
+    main()
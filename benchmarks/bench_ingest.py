@@ -0,0 +1,175 @@
+"""corpCode.xml 적재 벤치마크: 기존 전체 버퍼링 방식과 스트리밍 방식 비교
+
+사용법:
+    python -m benchmarks.bench_ingest [--count 100000] [--fixtures benchmarks/fixtures]
+
+로컬 HTTP 서버로 corpCode.xml ZIP(--fixtures에 기록된 corpCode.zip이 있으면 그 파일,
+없으면 합성 데이터)을 제공하고, 각 방식을 별도 프로세스에서 실행하여 소요 시간과
+최대 RSS(peak RSS)를 측정한다.
+"""
+import argparse
+import functools
+import io
+import json
+import os
+import resource
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import zipfile
+import xml.etree.ElementTree as ET
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+from benchmarks.synthetic import write_corp_code_zip
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+def legacy_ingest(db_path):
+    """기존 create_corp_db 방식 (응답 전체 버퍼링 + ET.fromstring + 행 단위 INSERT)"""
+    import requests
+    from dart_transport import DEFAULT_BASE_URL
+
+    response = requests.get(f"{DEFAULT_BASE_URL}/corpCode.xml", params={'crtfc_key': 'bench'})
+    with zipfile.ZipFile(io.BytesIO(response.content)) as zip_file:
+        with zip_file.open(zip_file.namelist()[0]) as xml_file:
+            xml_content = xml_file.read().decode('utf-8')
+    root = ET.fromstring(xml_content)
+    companies = []
+    for corp in root.findall('.//list'):
+        companies.append({
+            'corp_code': corp.find('corp_code').text,
+            'corp_name': corp.find('corp_name').text,
+            'stock_code': corp.find('stock_code').text,
+            'modify_date': corp.find('modify_date').text
+        })
+
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    cursor.execute('DROP TABLE IF EXISTS companies')
+    cursor.execute('''
+    CREATE TABLE companies (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        corp_code TEXT NOT NULL,
+        corp_name TEXT NOT NULL,
+        stock_code TEXT,
+        modify_date TEXT
+    )
+    ''')
+    cursor.execute('CREATE INDEX idx_corp_name ON companies (corp_name)')
+    cursor.execute('CREATE INDEX idx_corp_code ON companies (corp_code)')
+    cursor.execute('CREATE INDEX idx_stock_code ON companies (stock_code)')
+    for company in companies:
+        cursor.execute(
+            'INSERT INTO companies (corp_code, corp_name, stock_code, modify_date) VALUES (?, ?, ?, ?)',
+            (company['corp_code'], company['corp_name'], company['stock_code'], company['modify_date'])
+        )
+    conn.commit()
+    conn.close()
+
+
+def streaming_ingest(db_path):
+    """현재 create_corp_db.create_database 방식"""
+    from create_corp_db import create_database
+    create_database(db_path)
+
+
+def peak_rss_mb():
+    """현재 프로세스의 최대 RSS (MB)
+
+    ru_maxrss는 exec 이전 부모 프로세스의 값을 물려받으므로 Linux에서는 VmHWM을 사용한다.
+    """
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_child(mode, db_path):
+    """자식 프로세스에서 한 가지 방식을 실행하고 결과를 JSON으로 출력"""
+    baseline_rss_mb = peak_rss_mb()
+
+    started = time.perf_counter()
+    if mode == 'legacy':
+        legacy_ingest(db_path)
+    else:
+        streaming_ingest(db_path)
+    elapsed = time.perf_counter() - started
+
+    peak_mb = peak_rss_mb()
+    rows = sqlite3.connect(db_path).execute('SELECT COUNT(*) FROM companies').fetchone()[0]
+    print(json.dumps({
+        'mode': mode,
+        'seconds': round(elapsed, 3),
+        'peak_rss_mb': round(peak_mb, 1),
+        'ingest_rss_mb': round(peak_mb - baseline_rss_mb, 1),
+        'rows': rows
+    }))
+
+
+def run(count, fixtures=None):
+    """적재 방식별 {seconds, peak_rss_mb, ingest_rss_mb, rows} 반환"""
+    with tempfile.TemporaryDirectory() as tmp:
+        api_dir = os.path.join(tmp, 'api')
+        os.makedirs(api_dir)
+        recorded = os.path.join(fixtures, 'corpCode.zip') if fixtures else None
+        if recorded and os.path.exists(recorded):
+            shutil.copyfile(recorded, os.path.join(api_dir, 'corpCode.xml'))
+        else:
+            write_corp_code_zip(os.path.join(api_dir, 'corpCode.xml'), count)
+
+        handler = functools.partial(QuietHandler, directory=tmp)
+        server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        env = dict(os.environ)
+        env['OPENDART_API_KEY'] = 'bench'
+        env['OPENDART_BASE_URL'] = f'http://127.0.0.1:{server.server_port}/api'
+
+        results = {}
+        for mode in ('legacy', 'streaming'):
+            db_path = os.path.join(tmp, f'{mode}.db')
+            output = subprocess.run(
+                [sys.executable, '-m', 'benchmarks.bench_ingest', '--child', mode, '--db', db_path],
+                env=env, check=True, capture_output=True, text=True
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            results[result.pop('mode')] = result
+
+        server.shutdown()
+
+    for mode, result in results.items():
+        print(f"{mode:<10} {result['seconds']:8.2f}s  "
+              f"peak RSS {result['peak_rss_mb']:7.1f} MB (적재 중 증가분 {result['ingest_rss_mb']:6.1f} MB)  "
+              f"{result['rows']} rows")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=100000)
+    parser.add_argument('--fixtures', help='기록된 응답 디렉터리 (corpCode.zip 사용)')
+    parser.add_argument('--child', choices=['legacy', 'streaming'], help=argparse.SUPPRESS)
+    parser.add_argument('--db', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.db)
+        return
+
+    run(args.count, args.fixtures)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""재무비율 계산 벤치마크: 응답마다 계산(단일회사 조회 경로) vs 전체 배치 벡터 연산
+
+사용법:
+    python -m benchmarks.bench_ratios [--companies 3000] [--years 3]
+"""
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+from benchmarks.synthetic import create_synthetic_db, generate_financial_rows
+from ratio_engine import FinancialPanel, compute_ratios, RATIO_CATALOG
+
+
+def load_app_module(tmp):
+    """합성 DB가 있는 임시 디렉터리에서 app 모듈 임포트 (네트워크 접근 없음)"""
+    create_synthetic_db(os.path.join(tmp, 'corp_codes.db'), count=100)
+    cwd = os.getcwd()
+    os.chdir(tmp)
+    try:
+        import app
+    finally:
+        os.chdir(cwd)
+    return app
+
+
+def run(companies, years):
+    """계산 방식별 소요 시간 반환"""
+    payloads = [
+        ((f'{i:08d}', str(year), '11011'), generate_financial_rows(f'{i:08d}', year))
+        for i in range(companies)
+        for year in range(2023 - years + 1, 2024)
+    ]
+    print(f"{len(payloads)}개 (회사 x 사업연도) 응답")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = load_app_module(tmp)
+
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _, rows in payloads:
+                app.calculate_financial_ratios(rows)
+        legacy = time.perf_counter() - started
+
+    started = time.perf_counter()
+    panel = FinancialPanel.from_payloads(payloads)
+    parsed = time.perf_counter() - started
+    ratios = compute_ratios(panel)
+    vectorized = time.perf_counter() - started
+
+    print(f"calculate_financial_ratios 반복   {legacy:8.3f}s (응답마다 패널 생성, 당기만)")
+    print(f"ratio_engine (파싱 {parsed:.3f}s 포함) {vectorized:8.3f}s "
+          f"({len(RATIO_CATALOG)}개 비율, 당기/전기/전전기, {sum(v.size for v in ratios.values())}개 값)")
+    return {
+        'responses': len(payloads),
+        'calculate_financial_ratios_seconds': round(legacy, 4),
+        'ratio_engine_seconds': round(vectorized, 4),
+        'ratio_engine_parse_seconds': round(parsed, 4)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--companies', type=int, default=3000)
+    parser.add_argument('--years', type=int, default=3)
+    args = parser.parse_args()
+    run(args.companies, args.years)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""재무제표 응답 형식 벤치마크: OpenDART 원본 행(full) vs compact 형식
+
+사용법:
+    python -m benchmarks.bench_response_format [--responses 2000]
+
+응답 크기(원본/gzip)와 JSON 직렬화 시간을 비교한다. full은 기존 jsonify와 같은
+json.dumps 기본 설정(ASCII 이스케이프, 키 정렬), compact는 형식 변환 시간을 포함하여
+응답 캐시와 같은 UTF-8 직렬화를 사용한다.
+"""
+import argparse
+import gzip
+import json
+import time
+
+from benchmarks.synthetic import generate_financial_rows
+from ratio_engine import FinancialPanel, compute_ratios, ratio_records
+from response_format import compact_financial_data
+
+
+def sample_payloads(count):
+    """/get_financial_data 응답과 같은 형식의 합성 응답 (재무비율 포함)"""
+    payloads = []
+    for i in range(count):
+        rows = generate_financial_rows(f'{i:08d}', 2022 + i % 2)
+        panel = FinancialPanel.from_payloads([(i, rows)])
+        payloads.append({
+            'status': '000',
+            'message': '정상',
+            'list': rows,
+            'financial_ratios': ratio_records(panel, compute_ratios(panel))[0]
+        })
+    return payloads
+
+
+def measure(label, payloads, serialize):
+    started = time.perf_counter()
+    bodies = [serialize(payload) for payload in payloads]
+    elapsed = time.perf_counter() - started
+    size = sum(len(body) for body in bodies) / len(bodies)
+    gzipped = sum(len(gzip.compress(body, 6)) for body in bodies) / len(bodies)
+    print(f"{label:<8} 평균 {size / 1024:6.1f}KB  gzip {gzipped / 1024:5.1f}KB  "
+          f"변환+직렬화 {elapsed / len(payloads) * 1e6:7.1f}us/응답")
+    return {
+        'size_kb': round(size / 1024, 2),
+        'gzip_kb': round(gzipped / 1024, 2),
+        'serialize_us': round(elapsed / len(payloads) * 1e6, 1)
+    }
+
+
+def run(responses):
+    """형식별 {size_kb, gzip_kb, serialize_us} 반환"""
+    payloads = sample_payloads(responses)
+    print(f"응답 {len(payloads)}개, 응답당 계정 행 {len(payloads[0]['list'])}개")
+
+    full = measure(
+        'full', payloads, lambda payload: json.dumps(payload, sort_keys=True).encode('utf-8'))
+    compact = measure(
+        'compact', payloads, lambda payload: json.dumps(
+            compact_financial_data(payload), ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+    print(f"크기 {full['size_kb'] / compact['size_kb']:.1f}배 감소, "
+          f"시간 {full['serialize_us'] / compact['serialize_us']:.1f}배 단축")
+    return {'full': full, 'compact': compact}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--responses', type=int, default=2000)
+    args = parser.parse_args()
+    run(args.responses)
+
+
+if __name__ == '__main__':
+    main()
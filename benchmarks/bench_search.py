@@ -0,0 +1,127 @@
+"""회사명 검색 벤치마크: 기존 SQL LIKE 검색과 메모리 검색 인덱스, 타이핑 후보 캐시 비교
+
+사용법:
+    python -m benchmarks.bench_search [--db corp_codes.db] [--iterations 20000]
+
+--db를 지정하지 않으면 10만 건의 합성 데이터로 임시 DB를 만들어 사용한다.
+"""
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+from benchmarks.synthetic import create_synthetic_db
+from search_engine import CompanySearchIndex, is_chosung_query
+
+# 타이핑 중 입력되는 검색어 예시 (부분 일치, 접두어, 초성)
+QUERIES = [
+    '삼성', '삼성전', '삼성전자', '현대', '현대중공업', '전자', '바이오', '에너지',
+    '한국', '홀딩스', '카카오', '제약', 'ㅅㅅ', 'ㅅㅅㅈㅈ', 'ㅎㄷ', '솔루션', '대한', '리츠'
+]
+
+
+def keystrokes(query):
+    """화면에서 두 글자부터 입력할 때마다 보내는 검색어 순서 ("삼성", "삼성전", "삼성전자")"""
+    return [query[:end] for end in range(min(2, len(query)), len(query) + 1)]
+
+
+def sql_search(conn, query):
+    """기존 app.search_company 방식 (요청마다 새 연결 + LIKE 전체 스캔)"""
+    cursor = conn.execute(
+        "SELECT corp_code, corp_name, stock_code, modify_date FROM companies WHERE corp_name LIKE ? LIMIT 10",
+        (f'%{query}%',)
+    )
+    return cursor.fetchall()
+
+
+def percentile(samples, pct):
+    samples = sorted(samples)
+    index = min(len(samples) - 1, int(round(pct / 100.0 * (len(samples) - 1))))
+    return samples[index]
+
+
+def report(label, samples):
+    """지연 시간 분위수와 처리량을 출력하고 dict로 반환"""
+    result = {
+        'p50_us': round(percentile(samples, 50) * 1e6, 1),
+        'p99_us': round(percentile(samples, 99) * 1e6, 1),
+        'qps': round(len(samples) / sum(samples))
+    }
+    print(f"{label:<16} p50={result['p50_us']:8.1f}us p99={result['p99_us']:8.1f}us qps={result['qps']:10.0f}")
+    return result
+
+
+def run(db_path, iterations):
+    """검색 방식별 {p50_us, p99_us, qps} 반환"""
+    rng = random.Random(0)
+    queries = [rng.choice(QUERIES) for _ in range(iterations)]
+
+    started = time.perf_counter()
+    index = CompanySearchIndex.from_db(db_path)
+    build_seconds = time.perf_counter() - started
+    print(f"인덱스 생성: {len(index)}개 회사, {build_seconds:.2f}s")
+
+    index_samples = []
+    for query in queries:
+        t0 = time.perf_counter()
+        index.search(query, limit=10)
+        index_samples.append(time.perf_counter() - t0)
+
+    # SQL 경로는 느리므로 일부만 측정
+    sql_samples = []
+    for query in queries[:max(1, iterations // 20)]:
+        t0 = time.perf_counter()
+        conn = sqlite3.connect(db_path)
+        sql_search(conn, query)
+        conn.close()
+        sql_samples.append(time.perf_counter() - t0)
+
+    results = {
+        'companies': len(index),
+        'index_build_seconds': round(build_seconds, 3),
+        'sql_like': report('sql LIKE', sql_samples),
+        'search_index': report('search index', index_samples)
+    }
+
+    # 타이핑 순서대로 검색 (캐시 없이 인덱스만 사용 vs 타이핑 후보 캐시)
+    typed = [prefix for query in queries for prefix in keystrokes(query)]
+    uncached_samples = []
+    for query in typed:
+        key_index = index.chosung_index if is_chosung_query(query) else index.name_index
+        t0 = time.perf_counter()
+        key_index.search(query, 10)
+        uncached_samples.append(time.perf_counter() - t0)
+
+    index = CompanySearchIndex.from_db(db_path)
+    typeahead_samples = []
+    for query in typed:
+        t0 = time.perf_counter()
+        index.search(query, limit=10)
+        typeahead_samples.append(time.perf_counter() - t0)
+
+    results['typing_index'] = report('typing (index)', uncached_samples)
+    results['typing_cache'] = report('typing (cache)', typeahead_samples)
+    print(f"타이핑 후보 캐시: {index.typeahead.get_stats()}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--db', help='회사 코드 DB 경로 (기본: 합성 데이터)')
+    parser.add_argument('--iterations', type=int, default=20000)
+    args = parser.parse_args()
+
+    if args.db:
+        run(args.db, args.iterations)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'corp_codes.db')
+        create_synthetic_db(db_path)
+        run(db_path, args.iterations)
+
+
+if __name__ == '__main__':
+    main()
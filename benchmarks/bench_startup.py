@@ -0,0 +1,90 @@
+"""워커 시작 벤치마크: DB에서 검색 인덱스 생성 vs 스냅샷 mmap 로드
+
+사용법:
+    python -m benchmarks.bench_startup [--db corp_codes.db] [--iterations 20000]
+
+새 프로세스에서 검색이 가능해질 때까지의 시간과 프로세스 RSS를 비교하고,
+두 인덱스의 검색 결과가 같은지와 검색 지연 시간을 확인한다.
+--db를 지정하지 않으면 10만 건의 합성 데이터로 임시 DB를 만들어 사용한다.
+"""
+import argparse
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_search import QUERIES, report
+from benchmarks.synthetic import create_synthetic_db
+from company_snapshot import build_snapshot, load_snapshot
+from search_engine import CompanySearchIndex
+
+# 새 프로세스에서 인덱스를 준비하고 (소요 시간, VmRSS)를 출력
+STARTUP_SCRIPT = '''
+import sys, time
+started = time.perf_counter()
+if sys.argv[1] == 'snapshot':
+    from company_snapshot import load_snapshot
+    index = load_snapshot(sys.argv[2])
+else:
+    from search_engine import CompanySearchIndex
+    index = CompanySearchIndex.from_db(sys.argv[2])
+index.search('삼성', limit=10)
+elapsed = time.perf_counter() - started
+rss = [line.split()[1] for line in open('/proc/self/status') if line.startswith('VmRSS')][0]
+print(elapsed, rss)
+'''
+
+
+def measure_startup(mode, path):
+    project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.run(
+        [sys.executable, '-c', STARTUP_SCRIPT, mode, path],
+        cwd=project_dir, capture_output=True, text=True, check=True
+    ).stdout.split()
+    return float(output[0]), int(output[1]) / 1024
+
+
+def run(db_path, snapshot_path, iterations):
+    started = time.perf_counter()
+    build_snapshot(db_path, snapshot_path)
+    print(f"스냅샷 생성 (오프라인 1회): {time.perf_counter() - started:.2f}s, "
+          f"{os.path.getsize(snapshot_path) / 1024 / 1024:.1f}MB")
+
+    for label, mode, path in (('DB에서 생성', 'db', db_path), ('스냅샷 로드', 'snapshot', snapshot_path)):
+        elapsed, rss = measure_startup(mode, path)
+        print(f"{label:<10} 첫 검색까지 {elapsed * 1000:9.1f}ms  RSS {rss:6.1f}MB")
+
+    built = CompanySearchIndex.from_db(db_path)
+    mapped = load_snapshot(snapshot_path)
+    rng = random.Random(0)
+    queries = [rng.choice(QUERIES) for _ in range(iterations)]
+    mismatches = sum(built.search(query) != mapped.search(query) for query in QUERIES)
+    print(f"검색 결과 불일치: {mismatches}/{len(QUERIES)}개 검색어")
+
+    for label, index in (('in-memory', built), ('snapshot', mapped)):
+        samples = []
+        for query in queries:
+            t0 = time.perf_counter()
+            index.search(query, limit=10)
+            samples.append(time.perf_counter() - t0)
+        report(label, samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--db', help='회사 코드 DB 경로 (기본: 합성 데이터)')
+    parser.add_argument('--iterations', type=int, default=20000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = args.db
+        if not db_path:
+            db_path = os.path.join(tmp, 'corp_codes.db')
+            create_synthetic_db(db_path)
+        run(db_path, os.path.join(tmp, 'corp_codes.snapshot'), args.iterations)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,187 @@
+"""동기(gunicorn sync) vs 비동기(uvicorn 워커) 서빙 모드 부하 테스트
+
+사용법:
+    python -m benchmarks.load_test [--users 500] [--requests 2000] [--latency 0.2] [--workers 4]
+        [--modes sync,async] [--jitter 0.05] [--error-rate 0.01] [--fixtures DIR] [--json results.json]
+
+스텁 OpenDART 서버(benchmarks.stub_dart_server)를 띄우고 합성 DB가 있는 임시
+디렉터리에서 두 서빙 모드를 차례로 실행한 뒤, 동시 사용자 --users명이
+/get_financial_data를 호출할 때의 초당 처리량과 지연 시간 분위수를 비교한다.
+요청마다 다른 (회사, 사업연도)를 사용하므로 캐시 적중 없이 업스트림을 거친다.
+--error-rate를 지정하면 스텁 서버가 그 비율만큼 오류(5xx, 요청 제한 등)로 응답한다.
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import aiohttp
+
+from benchmarks.stub_dart_server import ERROR_KINDS, free_port, start_stub
+from benchmarks.synthetic import create_synthetic_db
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 기본으로 주입하는 오류 (timeout은 요청마다 오래 기다리므로 명시적으로 지정할 때만 사용)
+DEFAULT_ERROR_KINDS = ('http', 'rate_limit')
+
+SERVING_MODES = {
+    'sync': ['app:app'],
+    'async': ['asgi:application', '-k', 'uvicorn.workers.UvicornWorker']
+}
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+async def wait_until_ready(session, base_url, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            async with session.get(f'{base_url}/search_company', params={'query': '삼성'}) as response:
+                if response.status == 200:
+                    return
+        except aiohttp.ClientError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError(f'서버가 시작되지 않았습니다: {base_url}')
+
+
+async def run_load(base_url, users, total_requests, offset):
+    """동시 사용자 users명이 total_requests개 요청을 보내고 (소요 시간, 지연 시간 목록, 오류 수) 반환"""
+    latencies = []
+    errors = 0
+    queue = asyncio.Queue()
+    for i in range(total_requests):
+        queue.put_nowait(i)
+
+    connector = aiohttp.TCPConnector(limit=users)
+    timeout = aiohttp.ClientTimeout(total=120)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        await wait_until_ready(session, base_url)
+
+        async def user():
+            nonlocal errors
+            while not queue.empty():
+                i = queue.get_nowait() + offset
+                params = {'corp_code': f'{i // 10:08d}', 'bsns_year': str(2015 + i % 10)}
+                started = time.perf_counter()
+                try:
+                    async with session.get(f'{base_url}/get_financial_data', params=params) as response:
+                        payload = await response.json(content_type=None)
+                        if response.status != 200 or payload.get('status') != '000':
+                            errors += 1
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    errors += 1
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(user() for _ in range(users)))
+        return time.perf_counter() - started, latencies, errors
+
+
+def summarize(elapsed, latencies, errors):
+    """부하 테스트 결과를 JSON으로 저장할 수 있는 dict로 변환"""
+    return {
+        'requests': len(latencies),
+        'seconds': round(elapsed, 3),
+        'rps': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 0.5) * 1000, 1),
+        'p90_ms': round(percentile(latencies, 0.9) * 1000, 1),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 1),
+        'errors': errors
+    }
+
+
+async def benchmark(args):
+    """서빙 모드별 summarize() 결과와 스텁 서버 요청 수 반환"""
+    stub, stub_url = await start_stub(
+        latency=args.latency, jitter=args.jitter, fixtures=args.fixtures,
+        error_rate=args.error_rate, error_kinds=args.error_kinds, seed=0
+    )
+    results = {}
+    try:
+        for offset, mode in enumerate(args.modes):
+            target = SERVING_MODES[mode]
+            with tempfile.TemporaryDirectory() as tmp:
+                create_synthetic_db(os.path.join(tmp, 'corp_codes.db'), count=1000)
+                port = free_port()
+                env = dict(
+                    os.environ,
+                    PYTHONPATH=PROJECT_DIR,
+                    OPENDART_API_KEY='bench',
+                    OPENDART_BASE_URL=stub_url,
+                    OPENDART_RATE_LIMIT='100000',
+                    OPENDART_RATE_BURST='100000',
+                    OPENDART_DAILY_QUOTA='0',
+                    SINGLE_FLIGHT_DIR=os.path.join(tmp, 'single-flight')
+                )
+                server = subprocess.Popen(
+                    [sys.executable, '-m', 'gunicorn', *target, '-w', str(args.workers),
+                     '-b', f'127.0.0.1:{port}', '--log-level', 'warning', '--timeout', '120'],
+                    cwd=tmp, env=env, stdout=subprocess.DEVNULL
+                )
+                try:
+                    results[mode] = summarize(*await run_load(
+                        f'http://127.0.0.1:{port}', args.users, args.requests, offset * args.requests))
+                finally:
+                    server.terminate()
+                    server.wait()
+        upstream = dict(stub.app['stats'])
+    finally:
+        await stub.cleanup()
+    return {'modes': results, 'upstream_requests': upstream}
+
+
+def run(users=500, requests=2000, latency=0.2, workers=4, modes=tuple(SERVING_MODES),
+        jitter=0.0, error_rate=0.0, error_kinds=DEFAULT_ERROR_KINDS, fixtures=None):
+    """부하 테스트 실행 (benchmarks.suite에서 사용)"""
+    args = argparse.Namespace(users=users, requests=requests, latency=latency, workers=workers,
+                              modes=list(modes), jitter=jitter, error_rate=error_rate,
+                              error_kinds=list(error_kinds), fixtures=fixtures)
+    return report(args, asyncio.run(benchmark(args)))
+
+
+def report(args, results):
+    print(f"동시 사용자 {args.users}명, 요청 {args.requests}개, 업스트림 지연 {args.latency * 1000:.0f}ms, "
+          f"워커 {args.workers}개, 오류 주입 {args.error_rate:.1%}")
+    for mode, result in results['modes'].items():
+        print(f"{mode:6s} {result['rps']:8.1f} req/s  p50 {result['p50_ms']:7.1f}ms  "
+              f"p99 {result['p99_ms']:7.1f}ms  오류 {result['errors']}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--users', type=int, default=500)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--latency', type=float, default=0.2, help='스텁 OpenDART 응답 지연 (초)')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--modes', default=','.join(SERVING_MODES), help='서빙 모드 (sync, async)')
+    parser.add_argument('--jitter', type=float, default=0.0, help='스텁 응답 지연에 더할 최대 무작위 지연 (초)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='스텁 서버가 오류로 응답할 비율 (0~1)')
+    parser.add_argument('--error-kinds', default=','.join(DEFAULT_ERROR_KINDS), help=f'주입할 오류 종류 ({", ".join(ERROR_KINDS)})')
+    parser.add_argument('--fixtures', help='기록된 OpenDART 응답 디렉터리')
+    parser.add_argument('--json', help='결과를 저장할 JSON 파일')
+    args = parser.parse_args()
+    args.modes = [mode.strip() for mode in args.modes.split(',') if mode.strip()]
+    args.error_kinds = [kind.strip() for kind in args.error_kinds.split(',') if kind.strip()]
+    if set(args.modes) - set(SERVING_MODES):
+        parser.error(f'서빙 모드는 {", ".join(SERVING_MODES)} 중에서 선택합니다.')
+    if set(args.error_kinds) - set(ERROR_KINDS):
+        parser.error(f'오류 종류는 {", ".join(ERROR_KINDS)} 중에서 선택합니다.')
+
+    results = report(args, asyncio.run(benchmark(args)))
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
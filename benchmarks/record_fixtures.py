@@ -0,0 +1,83 @@
+"""실제 OpenDART 응답을 스텁 서버용 fixture로 기록
+
+사용법:
+    OPENDART_API_KEY=... python -m benchmarks.record_fixtures --out benchmarks/fixtures \\
+        --corp-codes 00126380,00164779 --years 2019-2023 [--reprt-codes 11011] [--no-corp-codes]
+
+corpCode.xml ZIP, 회사별 company.json, (회사 x 사업연도 x 보고서)별 fnlttSinglAcnt 응답을
+benchmarks.stub_dart_server --fixtures가 읽는 구조로 저장한다. API 키는 저장하지 않는다.
+"""
+import argparse
+import json
+import os
+import shutil
+
+from dotenv import load_dotenv
+
+from benchmarks.stub_dart_server import fixture_path
+from corp_code_stream import download_corp_code_zip
+from dart_transport import get_transport
+from opendart_client import parse_years
+
+
+def save_json(path, payload):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, ensure_ascii=False)
+
+
+def record(out, api_key, corp_codes, years, reprt_codes, corp_code_zip=True):
+    """fixture를 기록하고 저장한 파일 수를 반환"""
+    transport = get_transport()
+    saved = 0
+
+    if corp_code_zip:
+        os.makedirs(out, exist_ok=True)
+        with download_corp_code_zip(transport, api_key) as spool:
+            with open(os.path.join(out, 'corpCode.zip'), 'wb') as f:
+                shutil.copyfileobj(spool, f)
+        saved += 1
+
+    for corp_code in corp_codes:
+        payload = transport.get_json('company.json', {'crtfc_key': api_key, 'corp_code': corp_code})
+        save_json(fixture_path(out, 'company', corp_code), payload)
+        saved += 1
+
+        for year in years:
+            for reprt_code in reprt_codes:
+                payload = transport.get_json('fnlttSinglAcnt.json', {
+                    'crtfc_key': api_key,
+                    'corp_code': corp_code,
+                    'bsns_year': year,
+                    'reprt_code': reprt_code
+                })
+                save_json(fixture_path(out, 'fnlttSinglAcnt', corp_code, year, reprt_code), payload)
+                saved += 1
+                print(f"{corp_code} {year} {reprt_code}: {payload.get('status')} "
+                      f"({len(payload.get('list') or [])}행)")
+    return saved
+
+
+def main():
+    load_dotenv()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--out', default=os.path.join(os.path.dirname(__file__), 'fixtures'))
+    parser.add_argument('--corp-codes', required=True, help='쉼표로 구분한 회사 코드')
+    parser.add_argument('--years', default='2019-2023', help="사업연도 ('2019-2023' 또는 '2021,2023')")
+    parser.add_argument('--reprt-codes', default='11011', help='쉼표로 구분한 보고서 코드')
+    parser.add_argument('--no-corp-codes', action='store_true', help='corpCode.xml ZIP을 기록하지 않음')
+    args = parser.parse_args()
+
+    api_key = os.getenv('OPENDART_API_KEY')
+    if not api_key:
+        parser.error('OPENDART_API_KEY 환경 변수가 필요합니다.')
+
+    corp_codes = [code.strip() for code in args.corp_codes.split(',') if code.strip()]
+    reprt_codes = [code.strip() for code in args.reprt_codes.split(',') if code.strip()]
+    saved = record(args.out, api_key, corp_codes, parse_years(args.years), reprt_codes,
+                   corp_code_zip=not args.no_corp_codes)
+    print(f"{args.out}에 {saved}개 파일 기록")
+
+
+if __name__ == '__main__':
+    main()
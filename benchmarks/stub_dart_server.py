@@ -0,0 +1,217 @@
+"""OpenDART API 스텁 서버 (네트워크 없이 부하 테스트/벤치마크용)
+
+사용법:
+    python -m benchmarks.stub_dart_server [--port 8900] [--latency 0.2] [--jitter 0.05]
+        [--fixtures benchmarks/fixtures] [--companies 100000]
+        [--error-rate 0.01] [--error-kinds http,rate_limit,timeout]
+
+fnlttSinglAcnt, fnlttMultiAcnt, company, corpCode.xml 응답을 돌려준다. --fixtures 디렉터리에
+benchmarks.record_fixtures로 기록한 응답이 있으면 그대로 제공하고, 없으면 합성 데이터를 쓴다.
+
+    <fixtures>/corpCode.zip
+    <fixtures>/fnlttSinglAcnt/<corp_code>-<bsns_year>-<reprt_code>.json
+    <fixtures>/company/<corp_code>.json
+
+--latency(+ 0~--jitter)만큼 응답을 지연시켜 실제 OpenDART의 업스트림 대기 시간을 흉내 내고,
+--error-rate 비율의 요청은 --error-kinds 중 하나의 오류로 응답한다.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import tempfile
+
+from aiohttp import web
+
+from benchmarks.synthetic import generate_financial_rows, write_corp_code_zip
+
+# 주입할 수 있는 오류 종류
+#   http: HTTP 503, rate_limit: 요청 제한 초과(020), no_data: 조회된 데이터 없음(013),
+#   timeout: 클라이언트 읽기 제한 시간보다 오래 지연
+ERROR_KINDS = ('http', 'rate_limit', 'no_data', 'timeout')
+
+# timeout 오류 시 지연 시간 (초)
+TIMEOUT_DELAY = 60.0
+
+
+def json_response(payload):
+    return web.Response(body=json.dumps(payload, ensure_ascii=False).encode('utf-8'),
+                        content_type='application/json', charset='utf-8')
+
+
+def fixture_path(fixtures, api, *key):
+    """기록된 응답 파일 경로"""
+    return os.path.join(fixtures, api, '-'.join(str(part) for part in key) + '.json')
+
+
+def load_fixture(fixtures, api, *key):
+    """기록된 응답 (없으면 None)"""
+    if not fixtures:
+        return None
+    try:
+        with open(fixture_path(fixtures, api, *key), encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def synthetic_corp_code_zip(count):
+    """합성 corpCode.xml ZIP 바이트"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'corpCode.zip')
+        write_corp_code_zip(path, count)
+        with open(path, 'rb') as f:
+            return f.read()
+
+
+def create_app(latency=0.0, jitter=0.0, fixtures=None, companies=1000,
+               error_rate=0.0, error_kinds=ERROR_KINDS, seed=None):
+    """스텁 aiohttp 애플리케이션 생성 (app['stats']에 API별 요청 수와 주입한 오류 수 집계)"""
+    app = web.Application()
+    app['latency'] = latency
+    app['jitter'] = jitter
+    app['fixtures'] = fixtures
+    app['companies'] = companies
+    app['error_rate'] = error_rate
+    app['error_kinds'] = tuple(error_kinds)
+    app['random'] = random.Random(seed)
+    app['corp_code_zip'] = None
+    app['stats'] = {}
+
+    def count(request, name):
+        stats = request.app['stats']
+        stats[name] = stats.get(name, 0) + 1
+
+    async def delay(request, name):
+        """요청 수 집계와 응답 지연, 오류 주입 (주입한 오류 응답 또는 None 반환)"""
+        app = request.app
+        count(request, name)
+        wait = app['latency'] + (app['random'].uniform(0, app['jitter']) if app['jitter'] else 0.0)
+        if wait:
+            await asyncio.sleep(wait)
+
+        if not app['error_rate'] or app['random'].random() >= app['error_rate']:
+            return None
+        kind = app['random'].choice(app['error_kinds'])
+        count(request, f'error:{kind}')
+        if kind == 'http':
+            return web.Response(status=503, text='Service Unavailable')
+        if kind == 'rate_limit':
+            return json_response({'status': '020', 'message': '요청 제한을 초과하였습니다.'})
+        if kind == 'no_data':
+            return json_response({'status': '013', 'message': '조회된 데이타가 없습니다.'})
+        await asyncio.sleep(TIMEOUT_DELAY)
+        return web.Response(status=504, text='Gateway Timeout')
+
+    async def single_account(request):
+        error = await delay(request, 'fnlttSinglAcnt')
+        if error is not None:
+            return error
+        query = request.query
+        reprt_code = query.get('reprt_code', '11011')
+        payload = load_fixture(request.app['fixtures'], 'fnlttSinglAcnt',
+                               query['corp_code'], query['bsns_year'], reprt_code)
+        if payload is None:
+            rows = generate_financial_rows(query['corp_code'], query['bsns_year'], reprt_code)
+            payload = {'status': '000', 'message': '정상', 'list': rows}
+        return json_response(payload)
+
+    async def multi_account(request):
+        error = await delay(request, 'fnlttMultiAcnt')
+        if error is not None:
+            return error
+        query = request.query
+        reprt_code = query.get('reprt_code', '11011')
+        rows = []
+        for corp_code in query['corp_code'].split(','):
+            payload = load_fixture(request.app['fixtures'], 'fnlttSinglAcnt',
+                                   corp_code, query['bsns_year'], reprt_code)
+            if payload is None:
+                rows.extend(generate_financial_rows(corp_code, query['bsns_year'], reprt_code))
+            else:
+                rows.extend(payload.get('list') or [])
+        return json_response({'status': '000', 'message': '정상', 'list': rows})
+
+    async def company(request):
+        error = await delay(request, 'company')
+        if error is not None:
+            return error
+        corp_code = request.query['corp_code']
+        payload = load_fixture(request.app['fixtures'], 'company', corp_code)
+        if payload is None:
+            payload = {
+                'status': '000',
+                'message': '정상',
+                'corp_code': corp_code,
+                'corp_name': f'스텁회사{corp_code}',
+                'stock_code': '005930',
+                'ceo_nm': '홍길동',
+                'corp_cls': 'Y'
+            }
+        return json_response(payload)
+
+    async def corp_code(request):
+        error = await delay(request, 'corpCode')
+        if error is not None:
+            return error
+        app = request.app
+        if app['corp_code_zip'] is None:
+            path = os.path.join(app['fixtures'], 'corpCode.zip') if app['fixtures'] else None
+            if path and os.path.exists(path):
+                with open(path, 'rb') as f:
+                    app['corp_code_zip'] = f.read()
+            else:
+                app['corp_code_zip'] = await asyncio.get_running_loop().run_in_executor(
+                    None, synthetic_corp_code_zip, app['companies'])
+        return web.Response(body=app['corp_code_zip'], content_type='application/zip')
+
+    app.router.add_get('/fnlttSinglAcnt.json', single_account)
+    app.router.add_get('/fnlttMultiAcnt.json', multi_account)
+    app.router.add_get('/company.json', company)
+    app.router.add_get('/corpCode.xml', corp_code)
+    return app
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+async def start_stub(**options):
+    """현재 이벤트 루프에서 스텁 서버를 빈 포트로 시작하고 (runner, base URL) 반환"""
+    runner = web.AppRunner(create_app(**options), access_log=None)
+    await runner.setup()
+    port = free_port()
+    await web.TCPSite(runner, '127.0.0.1', port).start()
+    return runner, f'http://127.0.0.1:{port}'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8900)
+    parser.add_argument('--latency', type=float, default=0.2, help='응답 지연 (초)')
+    parser.add_argument('--jitter', type=float, default=0.0, help='응답 지연에 더할 최대 무작위 지연 (초)')
+    parser.add_argument('--fixtures', help='기록된 응답 디렉터리')
+    parser.add_argument('--companies', type=int, default=100000, help='합성 corpCode.xml 회사 수')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='오류로 응답할 요청 비율 (0~1)')
+    parser.add_argument('--error-kinds', default=','.join(ERROR_KINDS),
+                        help=f'주입할 오류 종류 ({", ".join(ERROR_KINDS)})')
+    parser.add_argument('--seed', type=int, help='지연/오류 난수 시드')
+    args = parser.parse_args()
+
+    error_kinds = [kind.strip() for kind in args.error_kinds.split(',') if kind.strip()]
+    unknown = set(error_kinds) - set(ERROR_KINDS)
+    if unknown:
+        parser.error(f'알 수 없는 오류 종류: {", ".join(sorted(unknown))}')
+
+    web.run_app(create_app(args.latency, args.jitter, args.fixtures, args.companies,
+                           args.error_rate, error_kinds, args.seed),
+                host=args.host, port=args.port, print=None)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+"""오프라인 벤치마크 모음 실행 (결과를 JSON으로 저장하여 릴리스 간 회귀 비교)
+
+사용법:
+    python -m benchmarks.suite [--output benchmark-results.json] [--baseline 이전결과.json]
+        [--only search,ratios,ingest,response_format,load] [--quick] [--fixtures benchmarks/fixtures]
+
+OpenDART API 키나 네트워크 없이 실행된다. 검색/재무비율/corpCode 적재/응답 직렬화
+마이크로 벤치마크와 스텁 OpenDART 서버를 상대로 한 gunicorn 부하 테스트를 차례로
+실행하고, 환경 정보(커밋, Python, CPU)와 함께 하나의 JSON 파일로 저장한다.
+--baseline을 지정하면 같은 항목의 수치 변화를 출력한다.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+
+from benchmarks import bench_ingest, bench_ratios, bench_response_format, bench_search, load_test
+from benchmarks.synthetic import create_synthetic_db
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 벤치마크별 (기본 설정, --quick 설정)
+SETTINGS = {
+    'search': ({'companies': 100000, 'iterations': 20000}, {'companies': 20000, 'iterations': 2000}),
+    'ratios': ({'companies': 3000, 'years': 3}, {'companies': 300, 'years': 3}),
+    'ingest': ({'count': 100000}, {'count': 10000}),
+    'response_format': ({'responses': 2000}, {'responses': 200}),
+    'load': (
+        {'users': 200, 'requests': 2000, 'latency': 0.1, 'workers': 4, 'error_rate': 0.01},
+        {'users': 50, 'requests': 300, 'latency': 0.05, 'workers': 2, 'error_rate': 0.01}
+    ),
+}
+
+# 값이 작을수록 좋은 지표 (나머지는 클수록 좋음: qps, rps)
+LOWER_IS_BETTER = ('_us', '_ms', 'seconds', '_mb', 'errors', 'bytes', '_kb')
+
+
+def run_search(companies, iterations, fixtures=None):
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'corp_codes.db')
+        create_synthetic_db(db_path, count=companies)
+        return bench_search.run(db_path, iterations)
+
+
+def run_ratios(companies, years, fixtures=None):
+    return bench_ratios.run(companies, years)
+
+
+def run_ingest(count, fixtures=None):
+    return bench_ingest.run(count, fixtures)
+
+
+def run_response_format(responses, fixtures=None):
+    return bench_response_format.run(responses)
+
+
+def run_load(fixtures=None, **options):
+    return load_test.run(fixtures=fixtures, **options)
+
+
+BENCHMARKS = {
+    'search': run_search,
+    'ratios': run_ratios,
+    'ingest': run_ingest,
+    'response_format': run_response_format,
+    'load': run_load,
+}
+
+
+def environment():
+    """결과 비교에 필요한 실행 환경 정보"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=PROJECT_DIR,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'started_at': time.strftime('%Y-%m-%dT%H:%M:%S%z')
+    }
+
+
+def flatten(results, prefix=''):
+    """중첩된 결과를 {'search.search_index.p50_us': 값} 형태로 변환 (숫자만)"""
+    values = {}
+    for key, value in results.items():
+        name = f'{prefix}{key}'
+        if isinstance(value, dict):
+            values.update(flatten(value, f'{name}.'))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            values[name] = value
+    return values
+
+
+def compare(results, baseline):
+    """기준 결과 대비 변화 출력 (나빠진 항목에 표시)"""
+    current = flatten(results['benchmarks'])
+    previous = flatten(baseline.get('benchmarks', {}))
+    print(f"\n기준: {baseline.get('environment', {}).get('commit')} "
+          f"({baseline.get('environment', {}).get('started_at')})")
+    for name in sorted(current.keys() & previous.keys()):
+        before, after = previous[name], current[name]
+        if not before:
+            continue
+        change = (after - before) / before
+        lower_is_better = name.endswith(LOWER_IS_BETTER)
+        worse = change > 0.1 if lower_is_better else change < -0.1
+        print(f"{'!' if worse else ' '} {name:<55} {before:>12} -> {after:>12} ({change:+.1%})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--output', default='benchmark-results.json', help='결과 JSON 파일')
+    parser.add_argument('--baseline', help='비교할 이전 결과 JSON 파일')
+    parser.add_argument('--only', help=f'실행할 벤치마크 ({", ".join(BENCHMARKS)})')
+    parser.add_argument('--quick', action='store_true', help='작은 데이터로 빠르게 실행')
+    parser.add_argument('--fixtures', help='기록된 OpenDART 응답 디렉터리 (benchmarks.record_fixtures)')
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.only.split(',')] if args.only else list(BENCHMARKS)
+    unknown = set(names) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f'알 수 없는 벤치마크: {", ".join(sorted(unknown))}')
+
+    # 하위 프로세스(gunicorn, 적재 자식 프로세스)가 프로젝트 모듈을 임포트하도록 프로젝트 디렉터리에서 실행
+    for name in ('output', 'baseline', 'fixtures'):
+        if getattr(args, name):
+            setattr(args, name, os.path.abspath(getattr(args, name)))
+    os.chdir(PROJECT_DIR)
+
+    results = {'environment': environment(), 'settings': {}, 'benchmarks': {}}
+    for name in names:
+        settings = SETTINGS[name][1 if args.quick else 0]
+        print(f"\n== {name} {settings}")
+        started = time.perf_counter()
+        results['settings'][name] = settings
+        results['benchmarks'][name] = BENCHMARKS[name](fixtures=args.fixtures, **settings)
+        print(f"({time.perf_counter() - started:.1f}s)")
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"\n결과 저장: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            compare(results, json.load(f))
+
+
+if __name__ == '__main__':
+    main()
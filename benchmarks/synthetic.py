@@ -0,0 +1,117 @@
+import random
+import sqlite3
+
+# 합성 회사명 생성용 어휘
+PREFIXES = [
+    '삼성', '현대', '엘지', '에스케이', '한화', '롯데', '신한', '대한', '한국', '동양',
+    '제일', '미래', '대우', '동부', '효성', '코오롱', '두산', '포스코', '카카오', '네이버'
+]
+SUFFIXES = [
+    '전자', '화학', '건설', '증권', '생명', '바이오', '에너지', '홀딩스', '제약', '중공업',
+    '물산', '정밀', '테크', '솔루션', '시스템', '산업', '통신', '식품', '로지스', '리츠'
+]
+SYLLABLES = '가나다라마바사아자차카타파하강남동서북신성진한우주미래영광명'
+
+
+def generate_companies(count=100000, seed=42):
+    """(corp_code, corp_name, stock_code, modify_date) 합성 데이터 생성"""
+    rng = random.Random(seed)
+    companies = []
+    for i in range(count):
+        name = rng.choice(PREFIXES)
+        if rng.random() < 0.7:
+            name += ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 3)))
+        name += rng.choice(SUFFIXES)
+        if rng.random() < 0.1:
+            name = '(주)' + name
+        stock_code = f'{rng.randint(0, 999999):06d}' if rng.random() < 0.03 else ' '
+        modify_date = f'20{rng.randint(15, 24)}{rng.randint(1, 12):02d}{rng.randint(1, 28):02d}'
+        companies.append((f'{i:08d}', name, stock_code, modify_date))
+    return companies
+
+
+def create_synthetic_db(db_path, count=100000, seed=42):
+    """create_corp_db와 같은 스키마의 합성 회사 코드 DB 생성"""
+    conn = sqlite3.connect(db_path)
+    conn.execute('DROP TABLE IF EXISTS companies')
+    conn.execute('''
+    CREATE TABLE companies (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        corp_code TEXT NOT NULL,
+        corp_name TEXT NOT NULL,
+        stock_code TEXT,
+        modify_date TEXT
+    )
+    ''')
+    conn.executemany(
+        'INSERT INTO companies (corp_code, corp_name, stock_code, modify_date) VALUES (?, ?, ?, ?)',
+        generate_companies(count, seed)
+    )
+    conn.execute('CREATE INDEX idx_corp_name ON companies (corp_name)')
+    conn.execute('CREATE INDEX idx_corp_code ON companies (corp_code)')
+    conn.execute('CREATE INDEX idx_stock_code ON companies (stock_code)')
+    conn.commit()
+    conn.close()
+
+
+def write_corp_code_zip(zip_path, count=100000, seed=42):
+    """OpenDART corpCode.xml과 같은 형식의 ZIP 파일 생성"""
+    import zipfile
+    from xml.sax.saxutils import escape
+
+    with zipfile.ZipFile(zip_path, 'w', compression=zipfile.ZIP_DEFLATED) as zip_file:
+        with zip_file.open('CORPCODE.xml', 'w') as xml_file:
+            xml_file.write(b'<?xml version="1.0" encoding="UTF-8"?>\n<result>\n')
+            for corp_code, corp_name, stock_code, modify_date in generate_companies(count, seed):
+                xml_file.write((
+                    f'    <list>\n'
+                    f'        <corp_code>{corp_code}</corp_code>\n'
+                    f'        <corp_name>{escape(corp_name)}</corp_name>\n'
+                    f'        <stock_code>{stock_code}</stock_code>\n'
+                    f'        <modify_date>{modify_date}</modify_date>\n'
+                    f'    </list>\n'
+                ).encode('utf-8'))
+            xml_file.write(b'</result>\n')
+
+
+# fnlttSinglAcnt 응답의 주요 계정 (재무제표 구분, 계정명)
+FINANCIAL_ACCOUNTS = [
+    ('BS', '유동자산'), ('BS', '비유동자산'), ('BS', '자산총계'),
+    ('BS', '유동부채'), ('BS', '비유동부채'), ('BS', '부채총계'),
+    ('BS', '자본금'), ('BS', '이익잉여금'), ('BS', '자본총계'),
+    ('IS', '매출액'), ('IS', '영업이익'), ('IS', '법인세차감전 순이익'), ('IS', '당기순이익')
+]
+
+
+def generate_financial_rows(corp_code, bsns_year, reprt_code='11011', seed=None):
+    """fnlttSinglAcnt 응답의 list와 같은 형식의 합성 재무제표 행 생성"""
+    rng = random.Random(seed if seed is not None else f'{corp_code}-{bsns_year}-{reprt_code}')
+    rows = []
+    for fs_div, fs_nm in (('CFS', '연결재무제표'), ('OFS', '재무제표')):
+        scale = rng.uniform(1e9, 1e13)
+        for ord_, (sj_div, account_nm) in enumerate(FINANCIAL_ACCOUNTS, start=1):
+            amounts = [f'{int(scale * rng.uniform(0.05, 1.0)):,}' for _ in range(3)]
+            rows.append({
+                'rcept_no': f'{bsns_year}0331{rng.randint(0, 999999):06d}',
+                'reprt_code': reprt_code,
+                'bsns_year': str(bsns_year),
+                'corp_code': corp_code,
+                'stock_code': '005930',
+                'fs_div': fs_div,
+                'fs_nm': fs_nm,
+                'sj_div': sj_div,
+                'sj_nm': '재무상태표' if sj_div == 'BS' else '손익계산서',
+                'account_nm': account_nm,
+                'thstrm_nm': f'제 {int(bsns_year) - 1968} 기',
+                'thstrm_dt': f'{bsns_year}.12.31 현재',
+                'thstrm_amount': amounts[0],
+                'frmtrm_nm': f'제 {int(bsns_year) - 1969} 기',
+                'frmtrm_dt': f'{int(bsns_year) - 1}.12.31 현재',
+                'frmtrm_amount': amounts[1],
+                'bfefrmtrm_nm': f'제 {int(bsns_year) - 1970} 기',
+                'bfefrmtrm_dt': f'{int(bsns_year) - 2}.12.31 현재',
+                'bfefrmtrm_amount': amounts[2],
+                'ord': str(ord_),
+                'currency': 'KRW'
+            })
+    return rows
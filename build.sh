@@ -1,6 +1,12 @@
 #!/usr/bin/env bash
 # 의존성 설치
 pip install -r requirements.txt
+
+# 회사 코드 DB와 검색 스냅샷 생성 (워커 시작 시에는 생성하지 않음)
+python create_corp_db.py
+
+# 저장된 보고서의 재무비율 채우기 (비율 계산 규칙이 바뀌었으면 다시 계산)
+python financial_store.py
  
 # 빌드 완료 메시지
 echo "Build completed successfully!" 
\ No newline at end of file
@@ -0,0 +1,124 @@
+"""종목코드/회사 코드/회사명 일괄 식별
+
+companies 테이블에서 워커별 해시 맵 세 개(corp_code, stock_code, 정규화한 회사명 -> 레코드 번호)를
+만들어 두고 식별자 목록을 한 번에 찾는다. corp_codes.db가 바뀌면(동기화, 재생성) 다시 만든다.
+"""
+import threading
+import time
+
+from db_pool import get_pool
+from search_engine import RELOAD_CHECK_INTERVAL, db_signature, normalize
+
+# 식별 방법 (찾는 순서)
+MATCH_CORP_CODE = 'corp_code'
+MATCH_STOCK_CODE = 'stock_code'
+MATCH_NAME = 'name'
+
+
+class CompanyResolver:
+    """corp_code, stock_code, 회사명 해시 맵"""
+
+    def __init__(self, records):
+        # 상장사 우선, 이름 순 (같은 이름이 여러 개면 상장사를 먼저 반환)
+        self.records = sorted(records, key=lambda r: (not (r[2] or '').strip(), r[1]))
+        self.by_corp_code = {}
+        self.by_stock_code = {}
+        self.by_name = {}
+
+        for record_id, (corp_code, corp_name, stock_code, _) in enumerate(self.records):
+            self.by_corp_code[corp_code] = record_id
+            stock_code = (stock_code or '').strip()
+            if stock_code:
+                self.by_stock_code.setdefault(stock_code, record_id)
+            name = normalize(corp_name)
+            ids = self.by_name.get(name)
+            if ids is None:
+                # 대부분 이름은 회사 하나이므로 정수로 두고, 중복될 때만 튜플로 바꿈
+                self.by_name[name] = record_id
+            else:
+                self.by_name[name] = (ids if isinstance(ids, tuple) else (ids,)) + (record_id,)
+
+    @classmethod
+    def from_db(cls, db_path='corp_codes.db'):
+        """회사 코드 데이터베이스에서 해시 맵 생성"""
+        rows = get_pool(db_path).execute(
+            "SELECT corp_code, corp_name, stock_code, modify_date FROM companies"
+        ).fetchall()
+        return cls([tuple(row) for row in rows])
+
+    def __len__(self):
+        return len(self.records)
+
+    def lookup(self, identifier):
+        """식별자 하나를 (식별 방법, 레코드 번호 튜플)로 변환 (없으면 (None, ()))"""
+        identifier = identifier.strip()
+        record_id = self.by_corp_code.get(identifier)
+        if record_id is not None:
+            return MATCH_CORP_CODE, (record_id,)
+
+        # 'A005930' 형식의 종목코드도 허용
+        stock_code = identifier.upper()
+        record_id = self.by_stock_code.get(stock_code)
+        if record_id is None and len(stock_code) == 7 and stock_code.startswith('A'):
+            record_id = self.by_stock_code.get(stock_code[1:])
+        if record_id is not None:
+            return MATCH_STOCK_CODE, (record_id,)
+
+        ids = self.by_name.get(normalize(identifier))
+        if ids is not None:
+            return MATCH_NAME, ids if isinstance(ids, tuple) else (ids,)
+        return None, ()
+
+    def resolve(self, identifiers):
+        """식별자 목록을 입력 순서대로 회사 정보로 변환
+
+        이름이 같은 회사가 여러 개면 상장사 우선으로 첫 회사를 반환하고
+        나머지 회사 코드를 alternatives에 담는다.
+        """
+        results = []
+        for identifier in identifiers:
+            identifier = str(identifier)
+            matched_by, ids = self.lookup(identifier)
+            if not ids:
+                results.append({'query': identifier, 'error': '해당 회사를 찾을 수 없습니다.'})
+                continue
+
+            corp_code, corp_name, stock_code, modify_date = self.records[ids[0]]
+            result = {
+                'query': identifier,
+                'matched_by': matched_by,
+                'corp_code': corp_code,
+                'corp_name': corp_name,
+                'stock_code': stock_code,
+                'modify_date': modify_date
+            }
+            if len(ids) > 1:
+                result['alternatives'] = [self.records[record_id][0] for record_id in ids[1:]]
+            results.append(result)
+        return results
+
+
+_resolver = None
+_resolver_signature = None
+_resolver_checked_at = 0.0
+_resolver_lock = threading.Lock()
+
+
+def get_resolver(db_path='corp_codes.db'):
+    """워커별 식별자 해시 맵 반환 (DB 파일이 바뀌면 다시 생성)"""
+    global _resolver, _resolver_signature, _resolver_checked_at
+
+    now = time.monotonic()
+    if _resolver is not None and now - _resolver_checked_at < RELOAD_CHECK_INTERVAL:
+        return _resolver
+
+    with _resolver_lock:
+        if _resolver is not None and now - _resolver_checked_at < RELOAD_CHECK_INTERVAL:
+            return _resolver
+
+        signature = db_signature(db_path)
+        if _resolver is None or signature != _resolver_signature:
+            _resolver = CompanyResolver.from_db(db_path)
+            _resolver_signature = signature
+        _resolver_checked_at = now
+        return _resolver
@@ -0,0 +1,276 @@
+"""회사 디렉터리 스냅샷 (회사 목록 + 검색 인덱스를 담은 읽기 전용 바이너리 파일)
+
+create_corp_db.py가 DB를 만들거나 동기화한 뒤 한 번 생성하고, 각 워커는 파일을
+mmap으로 열기만 하므로 시작 시간이 수 밀리초이며 페이지 캐시를 워커끼리 공유한다.
+
+    python company_snapshot.py [--db corp_codes.db] [--out corp_codes.snapshot]
+
+파일 구성: 헤더(매직, 형식 버전, 목차 길이) + JSON 목차 + 8바이트 정렬된 섹션들.
+섹션은 UTF-8 문자열 묶음과 uint32 배열이며, 검색 시 필요한 부분만 읽어서 사용한다.
+"""
+import argparse
+import json
+import mmap
+import os
+import sqlite3
+import struct
+import sys
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+
+from search_engine import CompanySearchIndex, TypeaheadCache, _KeyIndex
+
+SNAPSHOT_MAGIC = b'FSDIRSNP'
+SNAPSHOT_FORMAT_VERSION = 1
+HEADER = struct.Struct('<8sII')
+SECTION_ALIGN = 8
+
+# 레코드 필드 (corp_code, corp_name, stock_code, modify_date)
+RECORD_FIELDS = 4
+
+# 검색 인덱스 이름 (CompanySearchIndex 속성)
+KEY_INDEXES = ('name_index', 'chosung_index')
+
+
+class SnapshotError(Exception):
+    """스냅샷 파일이 없거나 형식이 맞지 않음"""
+
+
+def default_snapshot_path(db_path='corp_codes.db'):
+    """DB 옆의 기본 스냅샷 경로 (COMPANY_SNAPSHOT 환경 변수로 변경 가능)"""
+    return os.getenv('COMPANY_SNAPSHOT') or os.path.splitext(db_path)[0] + '.snapshot'
+
+
+def _string_sections(strings):
+    """문자열 목록을 (UTF-8 묶음, uint32 시작 위치 배열)로 변환"""
+    blob = bytearray()
+    offsets = array('I', [0])
+    for text in strings:
+        blob += text.encode('utf-8')
+        offsets.append(len(blob))
+    return bytes(blob), offsets
+
+
+def _index_sections(prefix, index):
+    """_KeyIndex 하나를 섹션 목록으로 변환"""
+    grams = sorted(index.postings)
+    posting_offsets = array('I', [0])
+    postings = array('I')
+    for gram in grams:
+        postings.extend(index.postings[gram])
+        posting_offsets.append(len(postings))
+
+    keys_blob, key_offsets = _string_sections(index.keys)
+    grams_blob, gram_offsets = _string_sections(grams)
+    return [
+        (f'{prefix}.keys', keys_blob),
+        (f'{prefix}.key_offsets', key_offsets),
+        (f'{prefix}.sorted_ids', array('I', index.sorted_ids)),
+        (f'{prefix}.grams', grams_blob),
+        (f'{prefix}.gram_offsets', gram_offsets),
+        (f'{prefix}.posting_offsets', posting_offsets),
+        (f'{prefix}.postings', postings),
+    ]
+
+
+def data_version(db_path):
+    """DB의 동기화 버전 (sync_state가 없으면 None)"""
+    conn = sqlite3.connect(db_path)
+    try:
+        row = conn.execute('SELECT version FROM sync_state WHERE id = 1').fetchone()
+    except sqlite3.OperationalError:
+        row = None
+    finally:
+        conn.close()
+    return row[0] if row else None
+
+
+def write_snapshot(path, index, version=None):
+    """CompanySearchIndex를 스냅샷 파일로 저장 (임시 파일에 쓴 뒤 교체)"""
+    fields = []
+    for record in index.records:
+        fields.extend(value or '' for value in record)
+    records_blob, record_offsets = _string_sections(fields)
+
+    sections = [('records', records_blob), ('record_offsets', record_offsets)]
+    for name in KEY_INDEXES:
+        sections.extend(_index_sections(name, getattr(index, name)))
+
+    toc = {
+        'data_version': version,
+        'built_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'count': len(index.records),
+        'byteorder': sys.byteorder,
+        'sections': {}
+    }
+    # 섹션 위치는 목차 길이에 따라 달라지므로 목차가 예약한 길이에 들어갈 때까지 다시 계산
+    toc_length = 0
+    while True:
+        position = HEADER.size + toc_length
+        for name, data in sections:
+            position += -position % SECTION_ALIGN
+            size = len(data) * data.itemsize if isinstance(data, array) else len(data)
+            toc['sections'][name] = [position, size]
+            position += size
+        encoded = json.dumps(toc).encode('utf-8')
+        if len(encoded) <= toc_length:
+            toc_bytes = encoded.ljust(toc_length)
+            break
+        toc_length = len(encoded)
+
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_FORMAT_VERSION, len(toc_bytes)))
+        f.write(toc_bytes)
+        for name, data in sections:
+            f.write(b'\0' * (toc['sections'][name][0] - f.tell()))
+            f.write(data.tobytes() if isinstance(data, array) else data)
+    os.replace(tmp_path, path)
+
+
+def build_snapshot(db_path='corp_codes.db', path=None):
+    """회사 코드 DB에서 검색 인덱스를 만들어 스냅샷으로 저장하고 경로를 반환"""
+    path = path or default_snapshot_path(db_path)
+    conn = sqlite3.connect(db_path)
+    try:
+        rows = conn.execute(
+            "SELECT corp_code, corp_name, stock_code, modify_date FROM companies"
+        ).fetchall()
+    finally:
+        conn.close()
+    write_snapshot(path, CompanySearchIndex(rows), data_version(db_path))
+    return path
+
+
+class _StringTable:
+    """UTF-8 묶음과 시작 위치 배열에 대한 읽기 전용 문자열 시퀀스"""
+
+    def __init__(self, blob, offsets):
+        self.blob = blob
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        return str(self.blob[self.offsets[i]:self.offsets[i + 1]], 'utf-8')
+
+
+class _PermutedStrings:
+    """order 순서로 본 문자열 시퀀스 (정렬된 키 배열 대신 사용)"""
+
+    def __init__(self, strings, order):
+        self.strings = strings
+        self.order = order
+
+    def __len__(self):
+        return len(self.order)
+
+    def __getitem__(self, i):
+        return self.strings[self.order[i]]
+
+
+class _PostingTable:
+    """정렬된 n-gram 목록을 이진 탐색하여 posting 배열을 찾는 dict 대용"""
+
+    def __init__(self, grams, offsets, postings):
+        self.grams = grams
+        self.offsets = offsets
+        self.postings = postings
+
+    def get(self, gram, default=None):
+        i = bisect_left(self.grams, gram)
+        if i < len(self.grams) and self.grams[i] == gram:
+            return self.postings[self.offsets[i]:self.offsets[i + 1]]
+        return default
+
+
+class _ExactTable:
+    """정렬된 키 배열에서 정확히 일치하는 레코드 id를 찾는 dict 대용"""
+
+    def __init__(self, sorted_keys, sorted_ids):
+        self.sorted_keys = sorted_keys
+        self.sorted_ids = sorted_ids
+
+    def get(self, key, default=()):
+        start = bisect_left(self.sorted_keys, key)
+        end = bisect_right(self.sorted_keys, key, start)
+        return sorted(self.sorted_ids[start:end]) if end > start else default
+
+
+class _RecordTable:
+    """레코드 id로 (corp_code, corp_name, stock_code, modify_date)를 반환"""
+
+    def __init__(self, fields):
+        self.fields = fields
+
+    def __len__(self):
+        return len(self.fields) // RECORD_FIELDS
+
+    def __getitem__(self, i):
+        base = i * RECORD_FIELDS
+        return tuple(self.fields[base + field] for field in range(RECORD_FIELDS))
+
+
+def load_snapshot(path):
+    """스냅샷을 mmap으로 열어 CompanySearchIndex와 같은 검색 인터페이스로 반환"""
+    try:
+        with open(path, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError) as e:
+        raise SnapshotError(f"스냅샷을 열 수 없습니다: {path} ({e})") from e
+
+    if len(buffer) < HEADER.size:
+        raise SnapshotError(f"스냅샷 형식이 올바르지 않습니다: {path}")
+    magic, format_version, toc_length = HEADER.unpack_from(buffer)
+    if magic != SNAPSHOT_MAGIC or format_version != SNAPSHOT_FORMAT_VERSION:
+        raise SnapshotError(f"지원하지 않는 스냅샷 형식입니다: {path}")
+    toc = json.loads(buffer[HEADER.size:HEADER.size + toc_length])
+    if toc['byteorder'] != sys.byteorder:
+        raise SnapshotError(f"바이트 순서가 다른 스냅샷입니다: {path}")
+
+    view = memoryview(buffer)
+
+    def section(name, typecode=None):
+        start, size = toc['sections'][name]
+        data = view[start:start + size]
+        return data.cast(typecode) if typecode else data
+
+    def strings(name, offsets_name):
+        return _StringTable(section(name), section(offsets_name, 'I'))
+
+    index = CompanySearchIndex.__new__(CompanySearchIndex)
+    index.records = _RecordTable(strings('records', 'record_offsets'))
+    for name in KEY_INDEXES:
+        key_index = _KeyIndex.__new__(_KeyIndex)
+        key_index.keys = strings(f'{name}.keys', f'{name}.key_offsets')
+        key_index.sorted_ids = section(f'{name}.sorted_ids', 'I')
+        key_index.sorted_keys = _PermutedStrings(key_index.keys, key_index.sorted_ids)
+        key_index.exact = _ExactTable(key_index.sorted_keys, key_index.sorted_ids)
+        key_index.postings = _PostingTable(
+            strings(f'{name}.grams', f'{name}.gram_offsets'),
+            section(f'{name}.posting_offsets', 'I'),
+            section(f'{name}.postings', 'I')
+        )
+        setattr(index, name, key_index)
+    index.typeahead = TypeaheadCache()
+    index.snapshot_info = {
+        'path': path,
+        'data_version': toc['data_version'],
+        'built_at': toc['built_at'],
+        'count': toc['count']
+    }
+    return index
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="회사 디렉터리 스냅샷 생성")
+    parser.add_argument('--db', default='corp_codes.db', help="회사 코드 데이터베이스 경로")
+    parser.add_argument('--out', help="스냅샷 경로 (기본값: DB 이름.snapshot)")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    path = build_snapshot(args.db, args.out)
+    print(f"스냅샷 생성 완료: {path} ({os.path.getsize(path) / 1024 / 1024:.1f}MB, "
+          f"{time.perf_counter() - started:.1f}s)")
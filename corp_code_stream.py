@@ -0,0 +1,61 @@
+import tempfile
+import zipfile
+import xml.etree.ElementTree as ET
+from contextlib import contextmanager
+
+# 다운로드한 ZIP을 메모리에 둘 최대 크기 (초과 시 임시 파일로 전환)
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+CORP_CODE_FIELDS = ('corp_code', 'corp_name', 'stock_code', 'modify_date')
+
+
+@contextmanager
+def download_corp_code_zip(transport, api_key):
+    """corpCode.xml ZIP을 스풀 임시 파일로 스트리밍 다운로드"""
+    response = transport.get('corpCode.xml', {'crtfc_key': api_key}, stream=True, raise_for_status=False)
+    if response.status_code != 200:
+        response.close()
+        raise Exception(f"Failed to download corp codes: {response.status_code}")
+
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE) as spool:
+        try:
+            for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                spool.write(chunk)
+        finally:
+            response.close()
+        spool.seek(0)
+        yield spool
+
+
+def iter_corp_codes(zip_source):
+    """ZIP 안의 XML을 iterparse로 읽으며 (corp_code, corp_name, stock_code, modify_date)를 순서대로 생성"""
+    try:
+        zip_file = zipfile.ZipFile(zip_source)
+    except zipfile.BadZipFile:
+        raise Exception("응답이 유효한 ZIP 파일이 아닙니다.")
+
+    with zip_file:
+        xml_filename = next((name for name in zip_file.namelist() if name.endswith('.xml')), None)
+        if xml_filename is None:
+            raise Exception("ZIP 파일에서 XML 파일을 찾을 수 없습니다.")
+
+        with zip_file.open(xml_filename) as xml_file:
+            root = None
+            values = {}
+            for event, elem in ET.iterparse(xml_file, events=('start', 'end')):
+                if root is None:
+                    root = elem
+                    continue
+                if event != 'end':
+                    continue
+
+                if elem.tag != 'list':
+                    values[elem.tag] = elem.text or ''
+                    continue
+
+                yield tuple(values.get(field, '') for field in CORP_CODE_FIELDS)
+                values = {}
+
+                # 처리한 요소는 바로 해제하여 메모리 사용량을 일정하게 유지
+                root.clear()
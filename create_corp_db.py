@@ -1,10 +1,12 @@
+import argparse
 import os
-import requests
-import zipfile
-import io
 import sqlite3
-import xml.etree.ElementTree as ET
+from datetime import datetime
+from itertools import islice
 from dotenv import load_dotenv
+from dart_transport import get_transport
+from corp_code_stream import download_corp_code_zip, iter_corp_codes
+from company_snapshot import build_snapshot, default_snapshot_path
 
 # 환경변수 로드
 load_dotenv()
@@ -14,68 +16,39 @@ API_KEY = os.getenv('OPENDART_API_KEY')
 if not API_KEY:
     raise ValueError("OPENDART_API_KEY not found in environment variables")
 
+# 한 번에 삽입할 행 수
+INSERT_BATCH_SIZE = 5000
+
 def download_corp_codes():
-    """회사코드(고유번호) 다운로드"""
+    """회사코드(고유번호)를 스트리밍으로 다운로드하며 한 건씩 생성"""
     print("OpenDART에서 회사 코드 다운로드 중...")
-    url = f"https://opendart.fss.or.kr/api/corpCode.xml"
-    params = {
-        'crtfc_key': API_KEY
-    }
-    
-    response = requests.get(url, params=params)
-    if response.status_code == 200:
-        # ZIP 파일로 응답이 오므로 압축 해제
-        try:
-            with zipfile.ZipFile(io.BytesIO(response.content)) as zip_file:
-                # ZIP 파일 내의 XML 파일 읽기
-                xml_filename = None
-                for filename in zip_file.namelist():
-                    if filename.endswith('.xml'):
-                        xml_filename = filename
-                        break
-                
-                if xml_filename:
-                    with zip_file.open(xml_filename) as xml_file:
-                        xml_content = xml_file.read().decode('utf-8')
-                    
-                    # XML 파싱
-                    root = ET.fromstring(xml_content)
-                    
-                    companies = []
-                    for corp in root.findall('.//list'):
-                        corp_code_elem = corp.find('corp_code')
-                        corp_name_elem = corp.find('corp_name')
-                        stock_code_elem = corp.find('stock_code')
-                        modify_date_elem = corp.find('modify_date')
-                        
-                        company_info = {
-                            'corp_code': corp_code_elem.text if corp_code_elem is not None else '',
-                            'corp_name': corp_name_elem.text if corp_name_elem is not None else '',
-                            'stock_code': stock_code_elem.text if stock_code_elem is not None else '',
-                            'modify_date': modify_date_elem.text if modify_date_elem is not None else ''
-                        }
-                        companies.append(company_info)
-                    
-                    return companies
-                else:
-                    raise Exception("ZIP 파일에서 XML 파일을 찾을 수 없습니다.")
-        except zipfile.BadZipFile:
-            raise Exception("응답이 유효한 ZIP 파일이 아닙니다.")
-    else:
-        raise Exception(f"Failed to download corp codes: {response.status_code}")
+    with download_corp_code_zip(get_transport(), API_KEY) as zip_file:
+        yield from iter_corp_codes(zip_file)
 
-def create_database():
-    """회사 코드 데이터베이스 생성"""
-    print("SQLite 데이터베이스 생성 중...")
-    
-    # 데이터베이스 연결
-    conn = sqlite3.connect('corp_codes.db')
-    cursor = conn.cursor()
-    
-    # 테이블 생성 (이미 존재하면 삭제)
-    cursor.execute('DROP TABLE IF EXISTS companies')
+def insert_companies(cursor, companies, table='companies'):
+    """회사 코드를 배치 단위로 삽입하고 삽입한 행 수를 반환"""
+    total = 0
+    while True:
+        batch = list(islice(companies, INSERT_BATCH_SIZE))
+        if not batch:
+            return total
+        cursor.executemany(
+            f'INSERT INTO {table} (corp_code, corp_name, stock_code, modify_date) VALUES (?, ?, ?, ?)',
+            batch
+        )
+        total += len(batch)
+
+def connect_for_write(db_path):
+    """쓰기용 연결 (WAL 모드, 트랜잭션은 직접 관리)"""
+    conn = sqlite3.connect(db_path, isolation_level=None, timeout=30)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA cache_size=-4096')
+    return conn
+
+def create_schema(cursor):
+    """companies 및 sync_state 테이블 생성 (없을 때만)"""
     cursor.execute('''
-    CREATE TABLE companies (
+    CREATE TABLE IF NOT EXISTS companies (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
         corp_code TEXT NOT NULL,
         corp_name TEXT NOT NULL,
@@ -83,35 +56,192 @@ def create_database():
         modify_date TEXT
     )
     ''')
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS sync_state (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        version INTEGER NOT NULL,
+        last_sync_at TEXT NOT NULL,
+        last_modify_date TEXT,
+        total INTEGER,
+        inserted INTEGER,
+        updated INTEGER,
+        deleted INTEGER
+    )
+    ''')
+
+def create_indexes(cursor):
+    """companies 인덱스 생성 (corp_code는 고유 인덱스)"""
+    unique = cursor.execute(
+        "SELECT 1 FROM pragma_index_list('companies') WHERE name = 'idx_corp_code' AND \"unique\" = 1"
+    ).fetchone()
+    if not unique:
+        # 이전 버전 DB의 일반 인덱스를 고유 인덱스로 교체
+        cursor.execute('DROP INDEX IF EXISTS idx_corp_code')
+        cursor.execute('CREATE UNIQUE INDEX idx_corp_code ON companies (corp_code)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_corp_name ON companies (corp_name)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_stock_code ON companies (stock_code)')
+
+def record_sync_state(cursor, inserted, updated, deleted):
+    """동기화 결과와 워터마크(가장 최근 modify_date) 기록 (변경이 있을 때만 version 증가)"""
+    total, last_modify_date = cursor.execute(
+        'SELECT COUNT(*), MAX(modify_date) FROM companies'
+    ).fetchone()
+    cursor.execute('''
+    INSERT INTO sync_state (id, version, last_sync_at, last_modify_date, total, inserted, updated, deleted)
+    VALUES (1, 1, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (id) DO UPDATE SET
+        version = version + (excluded.inserted + excluded.updated + excluded.deleted > 0),
+        last_sync_at = excluded.last_sync_at,
+        last_modify_date = excluded.last_modify_date,
+        total = excluded.total,
+        inserted = excluded.inserted,
+        updated = excluded.updated,
+        deleted = excluded.deleted
+    ''', (datetime.now().isoformat(timespec='seconds'), last_modify_date, total, inserted, updated, deleted))
+
+def get_sync_state(db_path='corp_codes.db'):
+    """마지막 동기화 정보 조회 (없으면 None)"""
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    try:
+        row = conn.execute('SELECT * FROM sync_state WHERE id = 1').fetchone()
+    except sqlite3.OperationalError:
+        row = None
+    finally:
+        conn.close()
+    return dict(row) if row else None
+
+def create_database(db_path='corp_codes.db', companies=None):
+    """회사 코드 데이터베이스 생성 (전체 재생성)"""
+    print("SQLite 데이터베이스 생성 중...")
     
-    # 인덱스 생성
-    cursor.execute('CREATE INDEX idx_corp_name ON companies (corp_name)')
-    cursor.execute('CREATE INDEX idx_corp_code ON companies (corp_code)')
-    cursor.execute('CREATE INDEX idx_stock_code ON companies (stock_code)')
+    # 데이터베이스 연결
+    conn = connect_for_write(db_path)
+    cursor = conn.cursor()
     
-    # 회사 코드 다운로드
-    companies = download_corp_codes()
+    # 대량 적재용 설정
+    cursor.execute('PRAGMA synchronous=OFF')
     
-    # 데이터 삽입
-    print(f"데이터베이스에 {len(companies)}개 회사 정보 삽입 중...")
-    for company in companies:
-        cursor.execute(
-            'INSERT INTO companies (corp_code, corp_name, stock_code, modify_date) VALUES (?, ?, ?, ?)',
-            (
-                company['corp_code'],
-                company['corp_name'],
-                company['stock_code'],
-                company['modify_date']
-            )
-        )
+    if companies is None:
+        companies = download_corp_codes()
     
-    # 변경사항 저장
-    conn.commit()
+    # WAL 모드이므로 커밋 전까지 읽기 요청은 이전 데이터를 그대로 봄
+    cursor.execute('BEGIN IMMEDIATE')
+    try:
+        # 테이블 생성 (이미 존재하면 삭제)
+        cursor.execute('DROP TABLE IF EXISTS companies')
+        create_schema(cursor)
+        
+        # 데이터 삽입
+        print("데이터베이스에 회사 정보 삽입 중...")
+        total = insert_companies(cursor, iter(companies))
+        
+        # 인덱스는 적재 후 한 번에 생성
+        create_indexes(cursor)
+        record_sync_state(cursor, total, 0, 0)
+        
+        # 변경사항 저장
+        cursor.execute('COMMIT')
+    except BaseException:
+        cursor.execute('ROLLBACK')
+        raise
+    finally:
+        # 연결 종료
+        conn.close()
     
-    # 연결 종료
-    conn.close()
+    print(f"데이터베이스 생성 완료! (총 {total}개 회사)")
+
+def sync_database(db_path='corp_codes.db', companies=None):
+    """변경된 회사 코드만 반영하는 증분 동기화
+
+    다운로드한 목록을 임시 테이블에 적재한 뒤 corp_code 기준으로 비교하여
+    새 회사는 추가, modify_date(또는 이름/종목코드)가 바뀐 회사는 갱신,
+    목록에서 사라진 회사는 삭제한다. 반영은 하나의 트랜잭션으로 처리되므로
+    WAL 모드의 읽기 요청은 차단되지 않고 중간 상태도 보지 않는다.
+    """
+    print("회사 코드 증분 동기화 중...")
     
-    print("데이터베이스 생성 완료!")
+    conn = connect_for_write(db_path)
+    cursor = conn.cursor()
+    
+    if companies is None:
+        companies = download_corp_codes()
+    
+    try:
+        # 다운로드 목록은 쓰기 잠금 없이 임시 테이블에 적재
+        cursor.execute('''
+        CREATE TEMP TABLE incoming (
+            corp_code TEXT PRIMARY KEY,
+            corp_name TEXT NOT NULL,
+            stock_code TEXT,
+            modify_date TEXT
+        )
+        ''')
+        cursor.execute('BEGIN')
+        received = insert_companies(cursor, iter(companies), table='temp.incoming')
+        cursor.execute('COMMIT')
+        
+        if received == 0:
+            raise Exception("다운로드한 회사 코드가 없습니다. 동기화를 중단합니다.")
+        
+        cursor.execute('BEGIN IMMEDIATE')
+        try:
+            create_schema(cursor)
+            create_indexes(cursor)
+            
+            # 새 회사 추가
+            inserted = cursor.execute('''
+            INSERT INTO companies (corp_code, corp_name, stock_code, modify_date)
+            SELECT i.corp_code, i.corp_name, i.stock_code, i.modify_date
+            FROM temp.incoming i
+            WHERE NOT EXISTS (SELECT 1 FROM companies c WHERE c.corp_code = i.corp_code)
+            ''').rowcount
+            
+            # 변경된 회사 갱신
+            updated = cursor.execute('''
+            INSERT INTO companies (corp_code, corp_name, stock_code, modify_date)
+            SELECT i.corp_code, i.corp_name, i.stock_code, i.modify_date
+            FROM temp.incoming i
+            JOIN companies c ON c.corp_code = i.corp_code
+            WHERE c.modify_date IS NOT i.modify_date
+               OR c.corp_name IS NOT i.corp_name
+               OR c.stock_code IS NOT i.stock_code
+            ON CONFLICT (corp_code) DO UPDATE SET
+                corp_name = excluded.corp_name,
+                stock_code = excluded.stock_code,
+                modify_date = excluded.modify_date
+            ''').rowcount
+            
+            # 목록에서 사라진 회사 삭제
+            deleted = cursor.execute('''
+            DELETE FROM companies
+            WHERE corp_code NOT IN (SELECT corp_code FROM temp.incoming)
+            ''').rowcount
+            
+            record_sync_state(cursor, inserted, updated, deleted)
+            cursor.execute('COMMIT')
+        except BaseException:
+            cursor.execute('ROLLBACK')
+            raise
+    finally:
+        conn.close()
+    
+    print(f"동기화 완료! (추가 {inserted}, 갱신 {updated}, 삭제 {deleted})")
+    return {'received': received, 'inserted': inserted, 'updated': updated, 'deleted': deleted}
 
 if __name__ == "__main__":
-    create_database() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="OpenDART 회사 코드 데이터베이스 생성/동기화")
+    parser.add_argument('--full', action='store_true', help="테이블을 삭제하고 전체를 다시 생성")
+    parser.add_argument('--db', default='corp_codes.db', help="데이터베이스 경로")
+    args = parser.parse_args()
+    
+    if args.full or not os.path.exists(args.db):
+        create_database(args.db)
+        changed = True
+    else:
+        result = sync_database(args.db)
+        changed = result['inserted'] + result['updated'] + result['deleted'] > 0
+    
+    # 워커가 mmap으로 여는 검색 스냅샷도 함께 갱신
+    if changed or not os.path.exists(default_snapshot_path(args.db)):
+        print(f"검색 스냅샷 생성: {build_snapshot(args.db)}")
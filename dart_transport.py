@@ -0,0 +1,357 @@
+import contextvars
+import datetime
+import fcntl
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import metrics
+from single_flight import default_lock_dir
+
+# OpenDART API 기본 주소 (테스트 시 로컬 스텁 서버로 변경 가능)
+DEFAULT_BASE_URL = os.getenv('OPENDART_BASE_URL', 'https://opendart.fss.or.kr/api')
+
+# 연결/읽기 타임아웃 (초)
+CONNECT_TIMEOUT = 3.05
+READ_TIMEOUT = 15.0
+
+# 재시도 설정
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 8.0
+RETRY_HTTP_STATUSES = frozenset([500, 502, 503, 504])
+
+# 일시적인 OpenDART 상태 코드 (020: 요청 제한 초과, 800: 시스템 점검, 900: 정의되지 않은 오류)
+TRANSIENT_STATUSES = frozenset(['020', '800', '900'])
+
+# API 키 할당량에 맞춘 클라이언트 측 요청 속도 (모든 워커를 합친 초당 요청 수, 버스트 크기)
+RATE_LIMIT = float(os.getenv('OPENDART_RATE_LIMIT', '10'))
+RATE_BURST = int(os.getenv('OPENDART_RATE_BURST', '20'))
+
+# API 키의 일일 요청 한도 (OpenDART 개인 키 기본 20,000건, 0이면 제한하지 않음)
+DAILY_QUOTA = int(os.getenv('OPENDART_DAILY_QUOTA', '20000'))
+
+# 일일 한도가 초기화되는 기준 시간대 (한국 표준시)
+QUOTA_TIMEZONE = datetime.timezone(datetime.timedelta(hours=9))
+
+# 동기 코드에서 여러 요청을 동시에 보낼 때 쓰는 프로세스별 스레드 수 (커넥션 풀 크기 이하)
+FANOUT_THREADS = int(os.getenv('OPENDART_FANOUT_THREADS', '16'))
+
+# 서킷 브레이커 설정
+FAILURE_THRESHOLD = 5
+RESET_TIMEOUT = 30.0
+
+
+class DartTransportError(Exception):
+    """OpenDART 요청 실패"""
+
+
+class CircuitOpenError(DartTransportError):
+    """서킷 브레이커가 열려 있어 요청을 보내지 않음"""
+
+
+class QuotaExceededError(CircuitOpenError):
+    """API 키의 일일 요청 한도를 다 써서 다음 날까지 요청을 보내지 않음"""
+
+
+class TokenBucket:
+    """토큰 버킷 기반 요청 속도 제한기"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """토큰 하나를 예약하고 요청 전에 기다려야 할 시간(초)을 반환"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def acquire(self):
+        """토큰을 얻을 때까지 대기"""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+
+class SharedTokenBucket:
+    """워커 프로세스가 함께 쓰는 토큰 버킷과 일일 요청 한도
+
+    남은 토큰, 갱신 시각, 날짜, 그날 보낸 요청 수를 상태 파일 하나에 기록하고
+    파일 잠금으로 갱신하므로 워커 수와 관계없이 API 키 전체의 요청 속도를 지킨다.
+    일일 한도를 다 쓰면 QuotaExceededError를 낸다.
+    """
+
+    def __init__(self, path, rate, capacity, daily_quota=DAILY_QUOTA):
+        self.path = path
+        self.rate = rate
+        self.capacity = capacity
+        self.daily_quota = daily_quota
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+    def _load(self, f):
+        f.seek(0)
+        try:
+            state = json.loads(f.read())
+        except ValueError:
+            state = None
+        return state if isinstance(state, dict) else {}
+
+    def _save(self, f, state):
+        f.seek(0)
+        f.truncate()
+        f.write(json.dumps(state))
+        f.flush()
+
+    def reserve(self):
+        """토큰 하나를 예약하고 요청 전에 기다려야 할 시간(초)을 반환"""
+        now = time.time()
+        today = datetime.datetime.fromtimestamp(now, QUOTA_TIMEZONE).date().isoformat()
+        with open(self.path, 'a+') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            state = self._load(f)
+            used = state.get('used', 0) if state.get('day') == today else 0
+            if self.daily_quota and used >= self.daily_quota:
+                raise QuotaExceededError("OpenDART 일일 요청 한도를 모두 사용했습니다.")
+
+            tokens = state.get('tokens', float(self.capacity))
+            elapsed = max(0.0, now - state.get('updated_at', now))
+            tokens = min(self.capacity, tokens + elapsed * self.rate) - 1
+            self._save(f, {'tokens': tokens, 'updated_at': now, 'day': today, 'used': used + 1})
+
+        if tokens >= 0:
+            return 0.0
+        return -tokens / self.rate
+
+    def acquire(self):
+        """토큰을 얻을 때까지 대기"""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+
+def default_rate_limiter(rate=RATE_LIMIT, burst=RATE_BURST):
+    """워커 간 조정 디렉터리의 상태 파일을 쓰는 요청 속도/일일 한도 제한기"""
+    return SharedTokenBucket(os.path.join(default_lock_dir(), 'opendart-rate-limit.json'), rate, burst)
+
+
+class CircuitBreaker:
+    """연속 실패 시 일정 시간 동안 요청을 즉시 실패시키는 서킷 브레이커"""
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=FAILURE_THRESHOLD, reset_timeout=RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def before_request(self):
+        """요청 가능 여부 확인 (열려 있으면 CircuitOpenError)"""
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    raise CircuitOpenError("OpenDART 서비스 장애로 요청을 일시 중단했습니다.")
+                # 시험 요청 하나만 통과
+                self.state = self.HALF_OPEN
+            elif self.state == self.HALF_OPEN:
+                raise CircuitOpenError("OpenDART 서비스 복구 확인 중입니다.")
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+
+def api_name(path):
+    """지표 레이블용 API 이름 ('fnlttSinglAcnt.json' -> 'fnlttSinglAcnt')"""
+    return path.rsplit('/', 1)[-1].split('.', 1)[0]
+
+
+def check_api_key(params):
+    """crtfc_key가 비어 있으면 요청하지 않고 오류 (API 키는 요청 시점에 확인)"""
+    if params is not None and 'crtfc_key' in params and not params['crtfc_key']:
+        raise DartTransportError("OPENDART_API_KEY가 설정되지 않았습니다.")
+
+
+def parse_json(body):
+    """응답 본문을 JSON 객체로 해석 (HTML 오류 페이지, 잘린 본문 등 객체가 아니면 None)"""
+    try:
+        data = json.loads(body)
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def backoff_delay(attempt):
+    """지수 백오프 + 전체 지터"""
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * (2 ** attempt)))
+
+
+class DartTransport:
+    """OpenDART 공용 HTTP 전송 계층
+
+    호스트별 커넥션 풀(keep-alive), 타임아웃, 지터가 있는 재시도,
+    토큰 버킷 속도 제한(워커 간 공유, 일일 한도 포함), 서킷 브레이커를 한 곳에서 처리한다.
+    """
+
+    def __init__(self, base_url=DEFAULT_BASE_URL, pool_maxsize=32,
+                 rate=RATE_LIMIT, burst=RATE_BURST, max_retries=MAX_RETRIES,
+                 timeout=(CONNECT_TIMEOUT, READ_TIMEOUT), rate_limiter=None):
+        self.base_url = base_url.rstrip('/')
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter or default_rate_limiter(rate, burst)
+        self.circuit_breaker = CircuitBreaker()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def url_for(self, path):
+        if path.startswith('http://') or path.startswith('https://'):
+            return path
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def _send(self, url, params, stream):
+        self.circuit_breaker.before_request()
+        self.rate_limiter.acquire()
+        try:
+            response = self.session.get(url, params=params, timeout=self.timeout, stream=stream)
+        except requests.RequestException:
+            self.circuit_breaker.record_failure()
+            raise
+
+        if response.status_code >= 500:
+            self.circuit_breaker.record_failure()
+        else:
+            self.circuit_breaker.record_success()
+        return response
+
+    def get(self, path, params=None, stream=False, raise_for_status=True):
+        """GET 요청 (5xx 및 네트워크 오류 시 재시도)"""
+        check_api_key(params)
+        url = self.url_for(path)
+        attempt = 0
+        while True:
+            try:
+                response = self._send(url, params, stream)
+            except CircuitOpenError:
+                raise
+            except requests.RequestException as e:
+                if attempt >= self.max_retries:
+                    raise DartTransportError(f"OpenDART 요청 실패: {e}") from e
+            else:
+                if response.status_code not in RETRY_HTTP_STATUSES or attempt >= self.max_retries:
+                    break
+                response.close()
+
+            time.sleep(backoff_delay(attempt))
+            attempt += 1
+
+        if raise_for_status and response.status_code != 200:
+            response.close()
+            raise DartTransportError(f"OpenDART 요청 실패: HTTP {response.status_code}")
+        return response
+
+    def get_json(self, path, params=None):
+        """JSON API 호출 (일시적인 OpenDART 상태 코드도 재시도)"""
+        started = time.perf_counter()
+        attempt = 0
+        while True:
+            try:
+                response = self.get(path, params)
+            except DartTransportError:
+                metrics.observe_upstream(api_name(path), 'error', time.perf_counter() - started)
+                raise
+            with metrics.stage('json_decode'):
+                data = parse_json(response.content)
+            if data is None:
+                # 해석할 수 없는 본문은 일시적인 오류로 보고 재시도
+                if attempt >= self.max_retries:
+                    metrics.observe_upstream(api_name(path), 'error', time.perf_counter() - started)
+                    raise DartTransportError("OpenDART 응답을 해석할 수 없습니다.")
+            elif data.get('status') not in TRANSIENT_STATUSES or attempt >= self.max_retries:
+                metrics.observe_upstream(api_name(path), data.get('status'), time.perf_counter() - started)
+                return data
+            time.sleep(backoff_delay(attempt))
+            attempt += 1
+
+
+_transport = None
+_transport_lock = threading.Lock()
+
+
+def get_transport():
+    """프로세스 공용 전송 계층 반환"""
+    global _transport
+    if _transport is None:
+        with _transport_lock:
+            if _transport is None:
+                _transport = DartTransport()
+    return _transport
+
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """프로세스 공용 요청 스레드 풀 반환 (fork된 워커에서는 처음 사용할 때 새로 생성)"""
+    global _executor, _executor_pid
+    pid = os.getpid()
+    if _executor is None or _executor_pid != pid:
+        with _executor_lock:
+            if _executor is None or _executor_pid != pid:
+                _executor = ThreadPoolExecutor(max_workers=FANOUT_THREADS, thread_name_prefix='opendart')
+                _executor_pid = pid
+    return _executor
+
+
+def get_json_many(calls):
+    """여러 JSON API를 공용 전송 계층으로 동시에 호출
+
+    calls는 [(키, 경로, 파라미터), ...]이며 {키: 응답 또는 예외}를 반환한다.
+    지표 레이블(엔드포인트)이 유지되도록 호출한 스레드의 컨텍스트에서 실행한다.
+    """
+    transport = get_transport()
+    executor = get_executor()
+    futures = [
+        (key, executor.submit(contextvars.copy_context().run, transport.get_json, path, params))
+        for key, path, params in calls
+    ]
+
+    results = {}
+    for key, future in futures:
+        try:
+            results[key] = future.result()
+        except Exception as e:
+            results[key] = e
+    return results
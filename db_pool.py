@@ -0,0 +1,95 @@
+import os
+import sqlite3
+import threading
+import time
+from urllib.request import pathname2url
+
+# 읽기 전용 연결 설정
+MMAP_SIZE = 256 * 1024 * 1024
+CACHE_SIZE_KB = 16 * 1024
+CACHED_STATEMENTS = 256
+
+# DB 파일 교체 여부 확인 주기 (초)
+REOPEN_CHECK_INTERVAL = 1.0
+
+
+def file_identity(path):
+    """파일 교체 감지용 (장치, inode) 값 (파일이 없으면 None)"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_dev, stat.st_ino)
+
+
+class ReadOnlyConnectionPool:
+    """스레드별 읽기 전용 SQLite 연결 관리자
+
+    각 스레드는 워커가 살아 있는 동안 하나의 `mode=ro` 연결을 재사용한다.
+    동기화 작업이 DB 파일 자체를 교체하면(inode 변경) 다음 요청에서 자동으로
+    다시 연결한다. 반환된 연결은 호출 측에서 닫지 않는다.
+    """
+
+    def __init__(self, db_path='corp_codes.db'):
+        self.db_path = os.path.abspath(db_path)
+        self._local = threading.local()
+
+    def _open(self):
+        conn = sqlite3.connect(
+            f'file:{pathname2url(self.db_path)}?mode=ro',
+            uri=True,
+            cached_statements=CACHED_STATEMENTS
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute(f'PRAGMA mmap_size={MMAP_SIZE}')
+        conn.execute(f'PRAGMA cache_size=-{CACHE_SIZE_KB}')
+        conn.execute('PRAGMA query_only=1')
+        return conn
+
+    def connection(self):
+        """현재 스레드의 읽기 전용 연결 반환 (필요하면 다시 연결)"""
+        local = self._local
+        conn = getattr(local, 'conn', None)
+        now = time.monotonic()
+
+        if conn is not None and now - local.checked_at < REOPEN_CHECK_INTERVAL:
+            return conn
+
+        identity = file_identity(self.db_path)
+        if conn is not None and identity == local.identity:
+            local.checked_at = now
+            return conn
+
+        if conn is not None:
+            conn.close()
+        local.conn = self._open()
+        local.identity = identity
+        local.checked_at = now
+        return local.conn
+
+    def execute(self, sql, params=()):
+        """현재 스레드의 연결로 쿼리 실행"""
+        return self.connection().execute(sql, params)
+
+    def close(self):
+        """현재 스레드의 연결 종료"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path='corp_codes.db'):
+    """DB 경로별 공용 연결 관리자 반환"""
+    key = os.path.abspath(db_path)
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = _pools[key] = ReadOnlyConnectionPool(db_path)
+    return pool
@@ -1,6 +1,6 @@
 import os
-import requests
 from dotenv import load_dotenv
+from dart_transport import get_transport
 
 # Load environment variables from .env file
 load_dotenv()
@@ -11,13 +11,13 @@ def debug_corp_codes():
         print("API 키를 찾을 수 없습니다.")
         return
     
-    url = "https://opendart.fss.or.kr/api/corpCode.xml"
+    url = "corpCode.xml"
     params = {
         'crtfc_key': api_key
     }
     
     print("API 요청 중...")
-    response = requests.get(url, params=params)
+    response = get_transport().get(url, params, raise_for_status=False)
     
     print(f"상태 코드: {response.status_code}")
     print(f"응답 헤더: {response.headers}")
@@ -0,0 +1,226 @@
+import datetime
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+# 상태별 캐시 유효기간 (초). None이면 만료되지 않음
+CLOSED_YEAR_TTL = None          # 마감된 사업연도: 영구 보관
+CURRENT_YEAR_TTL = 6 * 60 * 60  # 진행 중인 사업연도: 6시간
+NO_DATA_TTL = 30 * 24 * 60 * 60  # 제출 기한이 지난 사업연도의 '데이터 없음'(013) 응답: 30일
+ERROR_TTL = 10 * 60             # 그 밖의 status != '000' 응답: 10분
+
+# 다른 워커의 무효화 기록 확인 주기 (초)
+INVALIDATION_CHECK_INTERVAL = 2.0
+
+
+def ttl_for(bsns_year, status, today=None):
+    """응답 상태와 사업연도에 따른 캐시 유효기간 계산"""
+    if status not in ('000', '013'):
+        return ERROR_TTL
+
+    today = today or datetime.date.today()
+    try:
+        year = int(bsns_year)
+    except (TypeError, ValueError):
+        return CURRENT_YEAR_TTL if status == '000' else ERROR_TTL
+
+    if status == '013':
+        # 보고서는 다음 해에 제출되므로 그 이전 사업연도만 오래 보관
+        return NO_DATA_TTL if year < today.year - 1 else CURRENT_YEAR_TTL
+    if year < today.year:
+        return CLOSED_YEAR_TTL
+    return CURRENT_YEAR_TTL
+
+
+class FinancialStatementCache:
+    """OpenDART 재무제표 응답 캐시 (프로세스별 LRU + 공유 SQLite 저장소)
+
+    키는 (corp_code, bsns_year, reprt_code)이며 값은 OpenDART 원본 응답이다.
+    get()은 최상위 dict의 얕은 복사본을 반환하므로 호출 측에서 키를 추가해도
+    캐시된 값은 바뀌지 않는다.
+    """
+
+    def __init__(self, db_path='financial_cache.db', max_entries=2048):
+        self.db_path = db_path
+        self.max_entries = max_entries
+
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+        self._last_invalidation_id = 0
+        self._invalidation_checked_at = 0.0
+        self._invalidation_listeners = []
+
+        self.stats = {
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'stores': 0,
+            'invalidations': 0
+        }
+
+        self._init_db()
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _init_db(self):
+        conn = self._connect()
+        conn.execute('''
+        CREATE TABLE IF NOT EXISTS financial_cache (
+            corp_code TEXT NOT NULL,
+            bsns_year TEXT NOT NULL,
+            reprt_code TEXT NOT NULL,
+            status TEXT,
+            payload TEXT NOT NULL,
+            fetched_at REAL NOT NULL,
+            expires_at REAL,
+            PRIMARY KEY (corp_code, bsns_year, reprt_code)
+        )
+        ''')
+        conn.execute('''
+        CREATE TABLE IF NOT EXISTS financial_cache_invalidations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            corp_code TEXT NOT NULL,
+            invalidated_at REAL NOT NULL
+        )
+        ''')
+        conn.commit()
+
+        row = conn.execute('SELECT MAX(id) FROM financial_cache_invalidations').fetchone()
+        self._last_invalidation_id = row[0] or 0
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def _remember(self, key, payload, expires_at):
+        with self._lock:
+            self._lru[key] = (payload, expires_at)
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.max_entries:
+                self._lru.popitem(last=False)
+
+    def add_invalidation_listener(self, listener):
+        """corp_code가 무효화될 때(다른 워커에서 무효화한 경우 포함) 호출할 함수 등록
+
+        listener는 무효화된 corp_code 집합을 인자로 받는다.
+        """
+        self._invalidation_listeners.append(listener)
+
+    def _notify_invalidation(self, corp_codes):
+        for listener in self._invalidation_listeners:
+            listener(corp_codes)
+
+    def sync_invalidations(self):
+        """다른 워커에서 무효화한 corp_code를 로컬 LRU에서도 제거"""
+        now = time.monotonic()
+        if now - self._invalidation_checked_at < INVALIDATION_CHECK_INTERVAL:
+            return
+        self._invalidation_checked_at = now
+
+        rows = self._connect().execute(
+            'SELECT id, corp_code FROM financial_cache_invalidations WHERE id > ?',
+            (self._last_invalidation_id,)
+        ).fetchall()
+        if not rows:
+            return
+
+        corp_codes = {corp_code for _, corp_code in rows}
+        with self._lock:
+            self._last_invalidation_id = max(self._last_invalidation_id, rows[-1][0])
+            for key in [k for k in self._lru if k[0] in corp_codes]:
+                del self._lru[key]
+        self._notify_invalidation(corp_codes)
+
+    def get(self, corp_code, bsns_year, reprt_code):
+        """캐시된 응답 반환 (없거나 만료되었으면 None)"""
+        self.sync_invalidations()
+        key = (corp_code, str(bsns_year), str(reprt_code))
+        now = time.time()
+
+        with self._lock:
+            entry = self._lru.get(key)
+            if entry is not None:
+                payload, expires_at = entry
+                if expires_at is None or expires_at > now:
+                    self._lru.move_to_end(key)
+                    self.stats['memory_hits'] += 1
+                    return dict(payload)
+                del self._lru[key]
+
+        row = self._connect().execute(
+            'SELECT payload, expires_at FROM financial_cache '
+            'WHERE corp_code = ? AND bsns_year = ? AND reprt_code = ?',
+            key
+        ).fetchone()
+        if row is None or (row[1] is not None and row[1] <= now):
+            self._count('misses')
+            return None
+
+        payload = json.loads(row[0])
+        self._remember(key, payload, row[1])
+        self._count('disk_hits')
+        return dict(payload)
+
+    def put(self, corp_code, bsns_year, reprt_code, payload):
+        """OpenDART 응답 저장 (상태에 따라 유효기간 결정)"""
+        if payload.get('inferred'):
+            # 다중회사 응답에 빠져서 만든 013은 단일회사 응답으로 캐시하지 않음
+            return
+        key = (corp_code, str(bsns_year), str(reprt_code))
+        status = payload.get('status')
+        ttl = ttl_for(bsns_year, status)
+        now = time.time()
+        expires_at = None if ttl is None else now + ttl
+
+        payload = dict(payload)
+        conn = self._connect()
+        conn.execute(
+            'INSERT OR REPLACE INTO financial_cache '
+            '(corp_code, bsns_year, reprt_code, status, payload, fetched_at, expires_at) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?)',
+            key + (status, json.dumps(payload, ensure_ascii=False), now, expires_at)
+        )
+        conn.commit()
+
+        self._remember(key, payload, expires_at)
+        self._count('stores')
+
+    def invalidate(self, corp_code):
+        """corp_code의 모든 캐시 항목 삭제 (다른 워커에도 전파)"""
+        conn = self._connect()
+        cursor = conn.execute('DELETE FROM financial_cache WHERE corp_code = ?', (corp_code,))
+        removed = cursor.rowcount
+        conn.execute(
+            'INSERT INTO financial_cache_invalidations (corp_code, invalidated_at) VALUES (?, ?)',
+            (corp_code, time.time())
+        )
+        conn.commit()
+
+        with self._lock:
+            for key in [k for k in self._lru if k[0] == corp_code]:
+                del self._lru[key]
+            self.stats['invalidations'] += 1
+        self._notify_invalidation({corp_code})
+
+        return removed
+
+    def get_stats(self):
+        """캐시 적중/미스 카운터"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['memory_entries'] = len(self._lru)
+        hits = stats['memory_hits'] + stats['disk_hits']
+        lookups = hits + stats['misses']
+        stats['hit_rate'] = round(hits / lookups, 4) if lookups else 0.0
+        return stats
@@ -0,0 +1,220 @@
+"""저장소/캐시의 재무제표 계정 행을 NDJSON, CSV, Parquet으로 스트리밍 내보내기
+
+사용법:
+    python financial_export.py --years 2019-2023 [--reprt-codes 11011,11012]
+        [--corp-codes 00126380,00164779] [--format ndjson|csv|parquet] [--output 파일]
+
+OpenDART를 호출하지 않고 로컬 데이터만 내보낸다. --corp-codes를 생략하면 저장소에
+정상 보고서가 있는 모든 회사를 내보낸다. 행은 보고서 단위로 저장소에서 읽어 일정 수씩
+묶어 바로 쓰므로 내보내는 양과 관계없이 메모리 사용량이 일정하다.
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+
+from dotenv import load_dotenv
+
+from financial_cache import FinancialStatementCache
+from financial_store import AMOUNT_FIELDS, ROW_FIELDS, FinancialStatementStore, normalize_row
+from opendart_client import parse_years
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+EXPORT_FORMATS = ('ndjson', 'csv', 'parquet')
+
+CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+    'csv': 'text/csv; charset=utf-8',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+# NDJSON/CSV 청크 하나에 담는 행 수
+CHUNK_ROWS = 1000
+
+# Parquet 행 그룹 크기 (행 그룹 하나씩 메모리에서 열 배열로 만든 뒤 바로 내보냄)
+PARQUET_ROW_GROUP_ROWS = 10000
+
+
+def parse_export_format(value):
+    """내보내기 형식 확인 (지원하지 않으면 ValueError)"""
+    export_format = (value or 'ndjson').lower()
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"지원하지 않는 내보내기 형식입니다. ({', '.join(EXPORT_FORMATS)})")
+    if export_format == 'parquet' and pyarrow is None:
+        raise ValueError("Parquet 내보내기에는 pyarrow 패키지가 필요합니다. (pip install -r requirements-export.txt)")
+    return export_format
+
+
+def export_rows(store, bsns_years, reprt_codes, corp_codes=None, cache=None):
+    """(사업연도, 보고서, 회사) 순으로 계정 행을 ROW_FIELDS 순서의 튜플로 하나씩 반환
+
+    corp_codes를 지정하면 저장소에 없는 보고서는 cache(응답 캐시)에서 찾는다.
+    """
+    for bsns_year in bsns_years:
+        for reprt_code in reprt_codes:
+            codes = corp_codes if corp_codes else store.stored_corp_codes(bsns_year, reprt_code)
+            for corp_code in codes:
+                found = False
+                for row in store.iter_statement_rows(corp_code, bsns_year, reprt_code):
+                    found = True
+                    yield row
+                if found or cache is None or not corp_codes:
+                    continue
+
+                payload = cache.get(corp_code, bsns_year, reprt_code)
+                if payload and payload.get('status') == '000':
+                    key = (corp_code, str(bsns_year), str(reprt_code))
+                    for row in payload.get('list') or ():
+                        yield normalize_row(key, row)
+
+
+def batched(rows, size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def ndjson_chunks(rows):
+    """한 줄에 계정 행 하나인 NDJSON 청크"""
+    for batch in batched(rows, CHUNK_ROWS):
+        lines = [json.dumps(dict(zip(ROW_FIELDS, row)), ensure_ascii=False) for row in batch]
+        yield ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+def csv_chunks(rows):
+    """헤더 행 + 계정 행 CSV 청크"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(ROW_FIELDS)
+    for batch in batched(rows, CHUNK_ROWS):
+        writer.writerows(batch)
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+class ChunkSink:
+    """ParquetWriter가 쓰는 바이트를 모아 두었다가 꺼내 가는 쓰기 전용 파일 객체
+
+    Parquet 메타데이터의 열 오프셋은 tell() 값으로 기록되므로 꺼내 간 바이트도 위치에 포함한다.
+    """
+
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data):
+        data = bytes(data)
+        self.chunks.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def writable(self):
+        return True
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def parquet_schema():
+    return pyarrow.schema([
+        (field, pyarrow.int64() if field in AMOUNT_FIELDS else pyarrow.string())
+        for field in ROW_FIELDS
+    ])
+
+
+def parquet_chunks(rows):
+    """행 그룹 단위로 쓴 Parquet 파일 청크 (마지막 청크에 footer 포함)"""
+    schema = parquet_schema()
+    sink = ChunkSink()
+    writer = pyarrow.parquet.ParquetWriter(sink, schema, compression='zstd')
+    try:
+        for batch in batched(rows, PARQUET_ROW_GROUP_ROWS):
+            columns = list(zip(*batch))
+            writer.write_table(pyarrow.Table.from_arrays(
+                [pyarrow.array(column, type=field.type) for column, field in zip(columns, schema)],
+                schema=schema
+            ))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+WRITERS = {
+    'ndjson': ndjson_chunks,
+    'csv': csv_chunks,
+    'parquet': parquet_chunks,
+}
+
+
+def export_chunks(rows, export_format):
+    """계정 행을 지정한 형식의 바이트 청크로 변환"""
+    for chunk in WRITERS[export_format](rows):
+        if chunk:
+            yield chunk
+
+
+def main():
+    load_dotenv()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--years', required=True, help="사업연도 ('2019-2023' 또는 '2021,2023')")
+    parser.add_argument('--reprt-codes', default='11011', help='쉼표로 구분한 보고서 코드')
+    parser.add_argument('--corp-codes', help='쉼표로 구분한 회사 코드 (생략하면 저장된 전체 회사)')
+    parser.add_argument('--format', help=f'내보내기 형식 ({", ".join(EXPORT_FORMATS)}, 기본값: 출력 파일 확장자 또는 ndjson)')
+    parser.add_argument('--output', help='출력 파일 (생략하면 표준 출력)')
+    args = parser.parse_args()
+
+    export_format = args.format
+    if not export_format and args.output:
+        export_format = os.path.splitext(args.output)[1].lstrip('.') or None
+    try:
+        export_format = parse_export_format(export_format)
+        years = parse_years(args.years)
+    except ValueError as e:
+        parser.error(str(e))
+
+    reprt_codes = [code.strip() for code in args.reprt_codes.split(',') if code.strip()]
+    corp_codes = [code.strip() for code in (args.corp_codes or '').split(',') if code.strip()]
+
+    store = FinancialStatementStore(os.getenv('FINANCIAL_STORE_DB', 'financial_statements.db'))
+    cache = FinancialStatementCache(os.getenv('FINANCIAL_CACHE_DB', 'financial_cache.db'))
+    rows = export_rows(store, years, reprt_codes, corp_codes, cache)
+
+    output = open(args.output, 'wb') if args.output else sys.stdout.buffer
+    try:
+        for chunk in export_chunks(rows, export_format):
+            output.write(chunk)
+    finally:
+        if args.output:
+            output.close()
+
+
+if __name__ == '__main__':
+    main()
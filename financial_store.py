@@ -0,0 +1,351 @@
+import argparse
+import os
+import sqlite3
+import threading
+import time
+from urllib.request import pathname2url
+
+from db_pool import file_identity
+from financial_cache import ttl_for
+from ratio_table import BACKFILL_BATCH_SIZE, RATIO_VERSION, create_ratio_table, materialize, screen_query
+
+# 보관하는 응답 상태 (000: 정상, 013: 조회된 데이터 없음)
+STORED_STATUSES = ('000', '013')
+
+# 금액 필드 (정수로 정규화하여 저장)
+AMOUNT_FIELDS = (
+    'thstrm_amount', 'frmtrm_amount', 'bfefrmtrm_amount', 'thstrm_add_amount', 'frmtrm_add_amount'
+)
+
+# 계정 행의 나머지 필드 (문자열 그대로 저장, fnlttSinglAcnt/fnlttMultiAcnt 응답 필드 전체)
+TEXT_FIELDS = (
+    'rcept_no', 'stock_code', 'fs_nm', 'sj_nm',
+    'thstrm_nm', 'thstrm_dt', 'frmtrm_nm', 'frmtrm_dt', 'bfefrmtrm_nm', 'bfefrmtrm_dt',
+    'ord', 'currency'
+)
+
+KEY_FIELDS = ('corp_code', 'bsns_year', 'reprt_code', 'fs_div', 'sj_div', 'account_nm')
+ROW_FIELDS = KEY_FIELDS + TEXT_FIELDS + AMOUNT_FIELDS
+
+
+def parse_amount(text):
+    """'1,234,567' 형식의 금액 문자열을 정수로 변환 (빈 값이나 '-'는 None)"""
+    if text is None:
+        return None
+    text = text.replace(',', '').strip()
+    try:
+        return int(text)
+    except ValueError:
+        try:
+            return int(float(text))
+        except ValueError:
+            return None
+
+
+def format_amount(value):
+    """정수 금액을 OpenDART 응답과 같은 '1,234,567' 형식으로 변환"""
+    return '' if value is None else f'{value:,}'
+
+
+def normalize_row(key, row):
+    """OpenDART 계정 행을 ROW_FIELDS 순서의 튜플로 변환 (key: (corp_code, bsns_year, reprt_code))"""
+    return (
+        tuple(key)
+        + (row.get('fs_div') or '', row.get('sj_div') or '', row.get('account_nm') or '')
+        + tuple(row.get(field) for field in TEXT_FIELDS)
+        + tuple(parse_amount(row.get(field)) for field in AMOUNT_FIELDS)
+    )
+
+
+class FinancialStatementStore:
+    """정규화된 재무제표 저장소 (corp_codes.db 옆의 financial_statements.db)
+
+    계정 행은 (corp_code, bsns_year, reprt_code, fs_div, sj_div, account_nm) 기본키로
+    저장하여 단건 조회에 쓰고, (bsns_year, reprt_code, account_nm, fs_div) 인덱스로
+    "2023년 전체 회사의 매출액" 같은 횡단면 조회를 처리한다.
+
+    보고서를 저장할 때 같은 트랜잭션에서 financial_ratios(보고서별 당기 재무비율)도
+    갱신하므로 screen()은 비율 인덱스만 읽는다.
+    """
+
+    def __init__(self, db_path='financial_statements.db'):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._init_db()
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _init_db(self):
+        conn = self._connect()
+        conn.execute('''
+        CREATE TABLE IF NOT EXISTS statement_reports (
+            corp_code TEXT NOT NULL,
+            bsns_year TEXT NOT NULL,
+            reprt_code TEXT NOT NULL,
+            status TEXT NOT NULL,
+            message TEXT,
+            row_count INTEGER NOT NULL,
+            fetched_at REAL NOT NULL,
+            expires_at REAL,
+            inferred INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (corp_code, bsns_year, reprt_code)
+        )
+        ''')
+        conn.execute(f'''
+        CREATE TABLE IF NOT EXISTS financial_statements (
+            corp_code TEXT NOT NULL,
+            bsns_year TEXT NOT NULL,
+            reprt_code TEXT NOT NULL,
+            fs_div TEXT NOT NULL,
+            sj_div TEXT NOT NULL,
+            account_nm TEXT NOT NULL,
+            {', '.join(f'{field} TEXT' for field in TEXT_FIELDS)},
+            {', '.join(f'{field} INTEGER' for field in AMOUNT_FIELDS)},
+            PRIMARY KEY (corp_code, bsns_year, reprt_code, fs_div, sj_div, account_nm)
+        ) WITHOUT ROWID
+        ''')
+        # 나중에 추가된 필드는 기존 DB에 열로 추가
+        existing = {row['name'] for row in conn.execute('PRAGMA table_info(financial_statements)')}
+        for field in TEXT_FIELDS + AMOUNT_FIELDS:
+            if field not in existing:
+                column_type = 'INTEGER' if field in AMOUNT_FIELDS else 'TEXT'
+                conn.execute(f'ALTER TABLE financial_statements ADD COLUMN {field} {column_type}')
+        existing = {row['name'] for row in conn.execute('PRAGMA table_info(statement_reports)')}
+        if 'inferred' not in existing:
+            conn.execute('ALTER TABLE statement_reports ADD COLUMN inferred INTEGER NOT NULL DEFAULT 0')
+        conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_statement_reports_period
+        ON statement_reports (bsns_year, reprt_code)
+        ''')
+        conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_statements_cross_section
+        ON financial_statements (bsns_year, reprt_code, account_nm, fs_div)
+        ''')
+        create_ratio_table(conn)
+        conn.commit()
+
+    def backfill_ratios(self):
+        """재무비율이 구체화되지 않은 정상 보고서의 비율을 계산하여 저장하고 보고서 수를 반환
+
+        워커 시작 시에는 실행하지 않으며 빌드 단계(python financial_store.py)에서 호출한다.
+        계산 규칙 버전(RATIO_VERSION)이 바뀌었으면 기존 비율을 지우고 모두 다시 계산한다.
+        """
+        conn = self._connect()
+        if conn.execute('PRAGMA user_version').fetchone()[0] < RATIO_VERSION:
+            with conn:
+                conn.execute('DELETE FROM financial_ratios')
+
+        missing = conn.execute(
+            'SELECT r.corp_code, r.bsns_year, r.reprt_code FROM statement_reports r '
+            'LEFT JOIN financial_ratios f '
+            'ON f.corp_code = r.corp_code AND f.bsns_year = r.bsns_year AND f.reprt_code = r.reprt_code '
+            "WHERE r.status = '000' AND f.corp_code IS NULL"
+        ).fetchall()
+
+        total = 0
+        for start in range(0, len(missing), BACKFILL_BATCH_SIZE):
+            keys = [tuple(row) for row in missing[start:start + BACKFILL_BATCH_SIZE]]
+            with conn:
+                total += materialize(conn, [(key, self._report_rows(conn, key)) for key in keys])
+        conn.execute(f'PRAGMA user_version = {RATIO_VERSION}')
+        return total
+
+    def put_report(self, corp_code, bsns_year, reprt_code, payload):
+        """OpenDART 응답을 정규화하여 저장 (정상/데이터 없음 응답만 저장)
+
+        다중회사 응답에 빠져서 만든 013('inferred')은 수집 건너뛰기 기록으로만 남기고
+        get_report()에서는 저장되지 않은 것으로 본다.
+        """
+        status = payload.get('status')
+        if status not in STORED_STATUSES:
+            return False
+
+        key = (corp_code, str(bsns_year), str(reprt_code))
+        rows = (payload.get('list') or []) if status == '000' else []
+        now = time.time()
+        ttl = ttl_for(bsns_year, status)
+
+        values = [normalize_row(key, row) for row in rows]
+
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                'DELETE FROM financial_statements WHERE corp_code = ? AND bsns_year = ? AND reprt_code = ?',
+                key
+            )
+            conn.executemany(
+                f'INSERT OR REPLACE INTO financial_statements ({", ".join(ROW_FIELDS)}) '
+                f'VALUES ({", ".join("?" for _ in ROW_FIELDS)})',
+                values
+            )
+            conn.execute(
+                'INSERT OR REPLACE INTO statement_reports '
+                '(corp_code, bsns_year, reprt_code, status, message, row_count, fetched_at, expires_at, inferred) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                key + (status, payload.get('message'), len(values), now, None if ttl is None else now + ttl,
+                       1 if payload.get('inferred') else 0)
+            )
+            # 재무비율 구체화 테이블도 같은 트랜잭션에서 갱신
+            conn.execute(
+                'DELETE FROM financial_ratios WHERE corp_code = ? AND bsns_year = ? AND reprt_code = ?',
+                key
+            )
+            if rows:
+                materialize(conn, [(key, rows)])
+        return True
+
+    def get_report(self, corp_code, bsns_year, reprt_code):
+        """저장된 보고서를 OpenDART 응답 형식으로 반환 (없거나 만료되었거나 추정한 013이면 None)"""
+        key = (corp_code, str(bsns_year), str(reprt_code))
+        conn = self._connect()
+
+        report = conn.execute(
+            'SELECT status, message, expires_at, inferred FROM statement_reports '
+            'WHERE corp_code = ? AND bsns_year = ? AND reprt_code = ?',
+            key
+        ).fetchone()
+        if report is None or report['inferred'] or (
+                report['expires_at'] is not None and report['expires_at'] <= time.time()):
+            return None
+
+        if report['status'] != '000':
+            return {'status': report['status'], 'message': report['message']}
+
+        return {'status': '000', 'message': report['message'] or '정상', 'list': self._report_rows(conn, key)}
+
+    def _report_rows(self, conn, key):
+        """저장된 계정 행을 OpenDART list 행 형식으로 반환"""
+        rows = conn.execute(
+            f'SELECT {", ".join(ROW_FIELDS)} FROM financial_statements '
+            'WHERE corp_code = ? AND bsns_year = ? AND reprt_code = ? '
+            'ORDER BY fs_div, CAST(ord AS INTEGER)',
+            key
+        ).fetchall()
+
+        # OpenDART 응답처럼 모든 필드를 채우고 빈 값은 ''
+        items = []
+        for row in rows:
+            item = {field: row[field] or '' for field in KEY_FIELDS + TEXT_FIELDS}
+            for field in AMOUNT_FIELDS:
+                item[field] = format_amount(row[field])
+            items.append(item)
+        return items
+
+    def stored_corp_codes(self, bsns_year, reprt_code):
+        """정상 보고서가 저장된 회사 코드 목록 (corp_code 순)"""
+        return [
+            row[0] for row in self._connect().execute(
+                "SELECT corp_code FROM statement_reports "
+                "WHERE bsns_year = ? AND reprt_code = ? AND status = '000' ORDER BY corp_code",
+                (str(bsns_year), str(reprt_code))
+            )
+        ]
+
+    def iter_statement_rows(self, corp_code, bsns_year, reprt_code):
+        """저장된 계정 행을 ROW_FIELDS 순서의 튜플로 하나씩 반환 (금액은 정수, 만료 여부 무관)"""
+        cursor = self._connect().execute(
+            f'SELECT {", ".join(ROW_FIELDS)} FROM financial_statements '
+            'WHERE corp_code = ? AND bsns_year = ? AND reprt_code = ? '
+            'ORDER BY fs_div, CAST(ord AS INTEGER)',
+            (corp_code, str(bsns_year), str(reprt_code))
+        )
+        for row in cursor:
+            yield tuple(row)
+
+    def has_report(self, corp_code, bsns_year, reprt_code):
+        """만료되지 않은 보고서가 저장되어 있는지 확인"""
+        row = self._connect().execute(
+            'SELECT 1 FROM statement_reports '
+            'WHERE corp_code = ? AND bsns_year = ? AND reprt_code = ? AND inferred = 0 '
+            'AND (expires_at IS NULL OR expires_at > ?)',
+            (corp_code, str(bsns_year), str(reprt_code), time.time())
+        ).fetchone()
+        return row is not None
+
+    def missing_corp_codes(self, corp_codes, bsns_year, reprt_code):
+        """저장되어 있지 않거나 만료된 회사 코드 목록 (추정한 013도 만료 전까지는 건너뜀)"""
+        conn = self._connect()
+        stored = {
+            row[0] for row in conn.execute(
+                'SELECT corp_code FROM statement_reports '
+                'WHERE bsns_year = ? AND reprt_code = ? AND (expires_at IS NULL OR expires_at > ?)',
+                (str(bsns_year), str(reprt_code), time.time())
+            )
+        }
+        return [corp_code for corp_code in corp_codes if corp_code not in stored]
+
+    def invalidate(self, corp_code):
+        """corp_code의 저장된 보고서를 모두 삭제하고 삭제한 보고서 수를 반환"""
+        conn = self._connect()
+        with conn:
+            conn.execute('DELETE FROM financial_statements WHERE corp_code = ?', (corp_code,))
+            conn.execute('DELETE FROM financial_ratios WHERE corp_code = ?', (corp_code,))
+            return conn.execute('DELETE FROM statement_reports WHERE corp_code = ?', (corp_code,)).rowcount
+
+    def cross_section(self, bsns_year, reprt_code, account_nm, fs_div='CFS', sj_div=None):
+        """한 사업연도/보고서의 특정 계정을 전체 회사에 대해 조회 [(corp_code, 당기 금액), ...]"""
+        sql = (
+            'SELECT corp_code, thstrm_amount FROM financial_statements '
+            'WHERE bsns_year = ? AND reprt_code = ? AND account_nm = ? AND fs_div = ?'
+        )
+        params = [str(bsns_year), str(reprt_code), account_nm, fs_div]
+        if sj_div:
+            sql += ' AND sj_div = ?'
+            params.append(sj_div)
+        return [tuple(row) for row in self._connect().execute(sql, params)]
+
+    def _attach_directory(self, conn, directory_db):
+        """회사 목록 DB(corp_codes.db)를 directory 스키마로 연결 (파일이 교체되었으면 다시 연결)"""
+        path = os.path.abspath(directory_db)
+        identity = file_identity(path)
+        if identity is None:
+            return False
+
+        attached = getattr(self._local, 'directory', None)
+        if attached == (path, identity):
+            return True
+        if attached is not None:
+            conn.execute('DETACH DATABASE directory')
+            self._local.directory = None
+        conn.execute('ATTACH DATABASE ? AS directory', (f'file:{pathname2url(path)}?mode=ro',))
+        self._local.directory = (path, identity)
+        return True
+
+    def screen(self, bsns_year, reprt_code, conditions=(), params=(), order=(('roe', True),),
+               limit=50, directory_db=None, listed_only=False):
+        """재무비율 조건/정렬로 상위 limit개 보고서 조회
+
+        conditions, params, order는 ratio_table.parse_filter / parse_sort 결과이다.
+        directory_db를 지정하면 회사명과 종목코드를 붙이고, listed_only면 상장 회사만 남긴다.
+        [{'corp_code', 'corp_name', 'stock_code', 비율 이름: 값, ...}, ...] 반환
+        """
+        conn = self._connect()
+        with_names = bool(directory_db) and self._attach_directory(conn, directory_db)
+        if listed_only and not with_names:
+            raise ValueError("회사 목록 DB가 없어 상장 회사만 조회할 수 없습니다.")
+
+        sql, values = screen_query(bsns_year, reprt_code, conditions, params, order, limit,
+                                   with_names, listed_only)
+        return [dict(row) for row in conn.execute(sql, values)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="재무제표 저장소의 재무비율 테이블 채우기 (빌드 단계)")
+    parser.add_argument('--db', default=os.getenv('FINANCIAL_STORE_DB', 'financial_statements.db'), help="재무제표 저장소 경로")
+    args = parser.parse_args()
+
+    started = time.time()
+    total = FinancialStatementStore(args.db).backfill_ratios()
+    print(f"재무비율 {total}건 계산, {time.time() - started:.1f}초")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+import gzip
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from financial_cache import ttl_for
+from financial_store import STORED_STATUSES
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# 브라우저/CDN 캐시 유효기간 (초)
+IMMUTABLE_MAX_AGE = 7 * 24 * 60 * 60  # 마감된 사업연도
+CURRENT_MAX_AGE = 10 * 60             # 진행 중인 사업연도, 회사 정보
+
+NO_CACHE = 'no-cache'
+NO_STORE = 'no-store'
+
+# 이보다 작은 응답은 압축하지 않음 (바이트)
+MIN_COMPRESS_SIZE = 1024
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+# 인코딩별 ETag 접미사 (같은 내용이라도 인코딩이 다르면 다른 표현이므로 구분)
+ETAG_SUFFIXES = {'identity': '', 'gzip': '-gz', 'br': '-br'}
+
+
+def cache_policy(periods):
+    """[(bsns_year, status), ...]에서 (Cache-Control 값, 서버 캐시 유효기간) 계산
+
+    가장 짧은 유효기간을 따른다. 유효기간 None은 만료 없음, 0은 캐시하지 않음을 뜻한다.
+    정상 응답인 마감된 사업연도만 immutable로 표시하고, 데이터 없음(013) 응답은
+    나중에 공시될 수 있으므로 매번 재검증하게 한다.
+    """
+    periods = list(periods)
+    if not periods or any(status not in STORED_STATUSES for _, status in periods):
+        return NO_STORE, 0
+
+    ttls = [ttl_for(year, status) for year, status in periods]
+    finite = [ttl for ttl in ttls if ttl is not None]
+    ttl = min(finite) if finite else None
+
+    if any(status != '000' for _, status in periods):
+        return NO_CACHE, ttl
+    if ttl is None:
+        return f'public, max-age={IMMUTABLE_MAX_AGE}, immutable', None
+    return f'public, max-age={min(ttl, CURRENT_MAX_AGE)}', ttl
+
+
+def choose_encoding(accept_encoding):
+    """Accept-Encoding 헤더에서 사용할 인코딩 선택 (br > gzip > identity)"""
+    if not accept_encoding:
+        return 'identity'
+
+    qualities = {}
+    for part in accept_encoding.split(','):
+        name, _, params = part.strip().partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        qualities[name.strip().lower()] = quality
+
+    def accepts(name):
+        return qualities.get(name, qualities.get('*', 0.0)) > 0
+
+    if brotli is not None and accepts('br'):
+        return 'br'
+    if accepts('gzip'):
+        return 'gzip'
+    return 'identity'
+
+
+def etag_matches(if_none_match, digest):
+    """If-None-Match 헤더가 digest의 어떤 인코딩 표현과 일치하는지 확인 (약한 비교)"""
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(','):
+        tag = tag.strip()
+        if tag == '*':
+            return True
+        if tag.startswith('W/'):
+            tag = tag[2:]
+        tag = tag.strip('"')
+        if tag == digest or any(suffix and tag == digest + suffix for suffix in ETAG_SUFFIXES.values()):
+            return True
+    return False
+
+
+def compress(body, encoding):
+    if encoding == 'gzip':
+        return gzip.compress(body, GZIP_LEVEL)
+    if encoding == 'br':
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return body
+
+
+class CachedResponse:
+    """직렬화된 JSON 응답과 인코딩별 압축 본문"""
+
+    def __init__(self, payload, cache_control=NO_CACHE, expires_at=None, tags=()):
+        body = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        self.digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+        self.bodies = {'identity': body}
+        self.cache_control = cache_control
+        self.expires_at = expires_at
+        self.tags = frozenset(tags)
+        # ResponseCache가 사용량 계산에 반영한 크기
+        self.cached_size = 0
+        self._lock = threading.Lock()
+
+    @property
+    def size(self):
+        with self._lock:
+            return sum(len(body) for body in self.bodies.values())
+
+    def body_for(self, encoding):
+        """인코딩된 본문 (처음 요청된 인코딩만 압축하고 이후에는 재사용)"""
+        body = self.bodies.get(encoding)
+        if body is None:
+            with self._lock:
+                body = self.bodies.get(encoding)
+                if body is None:
+                    body = self.bodies[encoding] = compress(self.bodies['identity'], encoding)
+        return body
+
+    def render(self, if_none_match=None, accept_encoding=None):
+        """(상태 코드, 헤더 목록, 본문) 반환 (If-None-Match가 일치하면 304)"""
+        encoding = choose_encoding(accept_encoding)
+        if len(self.bodies['identity']) < MIN_COMPRESS_SIZE:
+            encoding = 'identity'
+
+        headers = [
+            ('ETag', f'"{self.digest}{ETAG_SUFFIXES[encoding]}"'),
+            ('Cache-Control', self.cache_control),
+            ('Vary', 'Accept-Encoding')
+        ]
+        if etag_matches(if_none_match, self.digest):
+            return 304, headers, b''
+
+        headers.append(('Content-Type', 'application/json; charset=utf-8'))
+        if encoding != 'identity':
+            headers.append(('Content-Encoding', encoding))
+        return 200, headers, self.body_for(encoding)
+
+
+class ResponseCache:
+    """직렬화/압축된 응답의 프로세스별 LRU 캐시 (전체 본문 크기 기준으로 제한)
+
+    키는 요청을 식별하는 튜플이고, tags에는 응답에 포함된 corp_code를 넣어
+    재무제표 캐시가 무효화될 때 관련 응답도 함께 제거한다.
+    """
+
+    def __init__(self, max_bytes=32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'stores': 0,
+            'evictions': 0
+        }
+
+    def _resize(self, entry):
+        """항목 크기 변화를 반영하고 한도를 넘으면 오래된 항목 제거 (잠금 보유 상태에서 호출)"""
+        size = entry.size
+        self._bytes += size - entry.cached_size
+        entry.cached_size = size
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.cached_size
+            self.stats['evictions'] += 1
+
+    def get(self, key):
+        """캐시된 응답 반환 (없거나 만료되었으면 None)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (entry.expires_at is None or entry.expires_at > time.time()):
+                self._entries.move_to_end(key)
+                self.stats['hits'] += 1
+                return entry
+            if entry is not None:
+                del self._entries[key]
+                self._bytes -= entry.cached_size
+            self.stats['misses'] += 1
+            return None
+
+    def put(self, key, payload, cache_control, ttl, tags=()):
+        """응답을 직렬화하여 저장하고 반환 (ttl이 0이면 저장하지 않음)"""
+        expires_at = None if ttl is None else time.time() + ttl
+        entry = CachedResponse(payload, cache_control, expires_at, tags)
+        if ttl == 0 or key is None:
+            return entry
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.cached_size
+            self._entries[key] = entry
+            self._resize(entry)
+            self.stats['stores'] += 1
+        return entry
+
+    def render(self, key, entry, if_none_match=None, accept_encoding=None):
+        """entry.render()를 호출하고 새로 압축된 본문 크기를 캐시 사용량에 반영"""
+        result = entry.render(if_none_match, accept_encoding)
+        with self._lock:
+            if self._entries.get(key) is entry and entry.size != entry.cached_size:
+                self._resize(entry)
+        return result
+
+    def invalidate(self, corp_codes):
+        """corp_codes 중 하나라도 포함한 응답 제거"""
+        corp_codes = set(corp_codes)
+        with self._lock:
+            for key in [k for k, entry in self._entries.items() if entry.tags & corp_codes]:
+                self._bytes -= self._entries.pop(key).cached_size
+
+    def get_stats(self):
+        """적중/미스 카운터와 사용량"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['entries'] = len(self._entries)
+            stats['bytes'] = self._bytes
+        return stats
@@ -0,0 +1,275 @@
+"""요청 처리 단계별 지연 시간 히스토그램 (Prometheus 텍스트 형식으로 노출)
+
+각 워커는 메모리에서 히스토그램을 갱신하고, 백그라운드 스레드가 주기적으로
+METRICS_DIR/<pid>-<시작 시각>.json 파일에 기록한다. /metrics는 디렉터리의 모든
+워커 파일을 합쳐서 응답하므로 어느 워커가 요청을 받아도 전체 값을 볼 수 있다.
+한동안 갱신되지 않은(종료된) 워커 파일은 살아 있는 워커가 aggregate.json에 더한 뒤
+지우므로, 워커가 재시작되어도 누적값은 유지되고 파일 수는 늘어나지 않는다.
+"""
+import atexit
+import contextvars
+import fcntl
+import json
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# 히스토그램 버킷 상한 (초)
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# 워커 파일 기록 주기 (초)
+FLUSH_INTERVAL = 1.0
+
+# 이 시간(초) 동안 갱신되지 않은 워커 파일은 종료된 워커로 보고 합산 파일로 옮김
+STALE_AFTER = 60.0
+COMPACT_INTERVAL = 60.0
+
+# 종료된 워커의 누적값을 모아 두는 파일
+AGGREGATE_FILE = 'aggregate.json'
+
+REQUEST_SECONDS = 'fsapp_request_seconds'
+STAGE_SECONDS = 'fsapp_stage_seconds'
+UPSTREAM_SECONDS = 'fsapp_upstream_seconds'
+
+METRIC_HELP = {
+    REQUEST_SECONDS: '엔드포인트별 요청 처리 시간 (초)',
+    STAGE_SECONDS: '요청 처리 단계별 소요 시간 (초)',
+    UPSTREAM_SECONDS: 'OpenDART 호출 시간 (API, 응답 상태별, 재시도 포함) (초)'
+}
+
+# 현재 처리 중인 요청의 엔드포인트 (하위 계층에서 측정한 값의 레이블로 사용)
+current_endpoint = contextvars.ContextVar('current_endpoint', default='none')
+
+
+def default_metrics_dir():
+    """워커 간 지표 공유 디렉터리"""
+    return os.getenv('METRICS_DIR') or os.path.join(tempfile.gettempdir(), 'fs-app-metrics')
+
+
+def _merge(merged, histograms):
+    """[(이름, 레이블, 버킷별 개수와 합계)]를 {(이름, 레이블): 값}에 더함"""
+    for name, labels, values in histograms:
+        key = (name, tuple(tuple(label) for label in labels))
+        current = merged.get(key)
+        if current is None:
+            merged[key] = list(values)
+        else:
+            for i, value in enumerate(values):
+                current[i] += value
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels) + '}'
+
+
+class MetricsRegistry:
+    """프로세스별 히스토그램 저장소
+
+    observe()는 잠금 하나와 버킷 위치 계산만 하므로 요청 처리 경로에서 써도 된다.
+    파일 기록은 fork 이후 처음 관측할 때 시작되는 백그라운드 스레드가 맡는다.
+    """
+
+    def __init__(self, metrics_dir=None, buckets=LATENCY_BUCKETS, flush_interval=FLUSH_INTERVAL):
+        self.metrics_dir = metrics_dir
+        self.buckets = tuple(buckets)
+        self.flush_interval = flush_interval
+        self._histograms = {}
+        self._lock = threading.Lock()
+        self._pid = None
+        self._path = None
+
+    def observe(self, name, value, **labels):
+        """히스토그램에 값 하나 기록"""
+        key = (name, tuple(sorted(labels.items())))
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            if self._pid != os.getpid():
+                self._start_flusher()
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                # 버킷별 개수 (+Inf 포함) + 합계
+                histogram = self._histograms[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            histogram[index] += 1
+            histogram[-1] += value
+
+    @contextmanager
+    def time(self, name, **labels):
+        """블록 실행 시간을 기록"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def stage(self, stage):
+        """현재 요청의 처리 단계 시간 기록"""
+        return self.time(STAGE_SECONDS, endpoint=current_endpoint.get(), stage=stage)
+
+    def _start_flusher(self):
+        """(fork 이후 처음 호출 시) 이 프로세스의 값을 초기화하고 기록 스레드 시작"""
+        self._pid = os.getpid()
+        self._histograms = {}
+        if not self.metrics_dir:
+            return
+        os.makedirs(self.metrics_dir, exist_ok=True)
+        self._path = os.path.join(self.metrics_dir, f'{self._pid}-{time.time_ns()}.json')
+        thread = threading.Thread(target=self._flush_loop, name='metrics-flush', daemon=True)
+        thread.start()
+        atexit.register(self.flush)
+
+    def _flush_loop(self):
+        pid = os.getpid()
+        compacted_at = time.monotonic()
+        while self._pid == pid:
+            time.sleep(self.flush_interval)
+            self.flush()
+            if time.monotonic() - compacted_at >= COMPACT_INTERVAL:
+                compacted_at = time.monotonic()
+                self.compact()
+
+    def snapshot(self):
+        """[(이름, 레이블, 버킷별 개수와 합계)] 형태의 현재 값 복사본"""
+        with self._lock:
+            return [(name, labels, list(values)) for (name, labels), values in self._histograms.items()]
+
+    def flush(self):
+        """이 프로세스의 값을 워커 파일에 기록"""
+        if not self._path:
+            return
+        data = {'buckets': self.buckets, 'histograms': self.snapshot()}
+        tmp_path = f'{self._path}.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self._path)
+        except OSError:
+            pass
+
+    def _read(self, path):
+        """지표 파일의 히스토그램 목록 (읽을 수 없거나 버킷이 다르면 None)"""
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if tuple(data.get('buckets', ())) != self.buckets:
+            return None
+        return data['histograms']
+
+    def compact(self, now=None):
+        """갱신이 멈춘 워커 파일을 합산 파일에 더하고 지움 (지운 파일 수 반환)
+
+        여러 워커가 동시에 호출해도 잠금을 얻은 워커 하나만 처리한다.
+        """
+        if not self.metrics_dir or not os.path.isdir(self.metrics_dir):
+            return 0
+        now = now or time.time()
+        aggregate_path = os.path.join(self.metrics_dir, AGGREGATE_FILE)
+
+        with open(os.path.join(self.metrics_dir, 'aggregate.lock'), 'a') as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                return 0
+
+            stale = []
+            for filename in os.listdir(self.metrics_dir):
+                path = os.path.join(self.metrics_dir, filename)
+                if filename == AGGREGATE_FILE or path == self._path or not filename.endswith(('.json', '.tmp')):
+                    continue
+                try:
+                    if now - os.path.getmtime(path) >= STALE_AFTER:
+                        stale.append(path)
+                except OSError:
+                    continue
+            if not stale:
+                return 0
+
+            merged = {}
+            for path in [aggregate_path] + [path for path in stale if path.endswith('.json')]:
+                histograms = self._read(path)
+                if histograms is not None:
+                    _merge(merged, histograms)
+
+            data = {
+                'buckets': self.buckets,
+                'histograms': [(name, labels, values) for (name, labels), values in sorted(merged.items())]
+            }
+            tmp_path = f'{aggregate_path}.{os.getpid()}.tmp'
+            try:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False)
+                os.replace(tmp_path, aggregate_path)
+            except OSError:
+                return 0
+
+            for path in stale:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            return len(stale)
+
+    def collect(self):
+        """모든 워커 파일(합산 파일 포함)과 이 프로세스의 최신 값을 합산"""
+        merged = {}
+        if self.metrics_dir and os.path.isdir(self.metrics_dir):
+            for filename in os.listdir(self.metrics_dir):
+                path = os.path.join(self.metrics_dir, filename)
+                if not filename.endswith('.json') or path == self._path:
+                    continue
+                histograms = self._read(path)
+                if histograms is not None:
+                    _merge(merged, histograms)
+        _merge(merged, self.snapshot())
+        return merged
+
+    def render(self):
+        """Prometheus 텍스트 형식 (version 0.0.4)"""
+        lines = []
+        merged = self.collect()
+        for name in sorted({name for name, _ in merged}):
+            lines.append(f'# HELP {name} {METRIC_HELP.get(name, name)}')
+            lines.append(f'# TYPE {name} histogram')
+            for (metric, labels), values in sorted(merged.items()):
+                if metric != name:
+                    continue
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float('inf'),), values[:-1]):
+                    cumulative += count
+                    bucket_labels = _format_labels(labels + (('le', _format_value(bound)),))
+                    lines.append(f'{name}_bucket{bucket_labels} {cumulative}')
+                lines.append(f'{name}_sum{_format_labels(labels)} {_format_value(values[-1])}')
+                lines.append(f'{name}_count{_format_labels(labels)} {cumulative}')
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry(default_metrics_dir())
+
+
+def stage(name):
+    """현재 요청의 처리 단계 시간 기록 (with metrics.stage('ratios'): ...)"""
+    return registry.stage(name)
+
+
+def observe_request(endpoint, status, seconds):
+    registry.observe(REQUEST_SECONDS, seconds, endpoint=endpoint, status=str(status))
+
+
+def observe_upstream(api, status, seconds):
+    registry.observe(UPSTREAM_SECONDS, seconds, endpoint=current_endpoint.get(), api=api, status=str(status))
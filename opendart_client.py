@@ -1,34 +1,122 @@
 import os
-import requests
-import zipfile
-import io
+from datetime import date
 from dotenv import load_dotenv
+from dart_transport import get_transport, get_json_many
+from corp_code_stream import download_corp_code_zip, iter_corp_codes, CORP_CODE_FIELDS
 
 # Load environment variables from .env file
 load_dotenv()
 
+# fnlttMultiAcnt 한 번에 조회할 수 있는 최대 회사 수
+MAX_MULTI_CORP_CODES = 100
+
+# 조회된 데이터가 없음
+NO_DATA_STATUS = '013'
+
+# 조회할 수 있는 가장 이른 사업연도 (DART 전자공시 시작, 가장 늦은 연도는 올해)
+MIN_BSNS_YEAR = 1999
+
+def chunk_corp_codes(corp_codes, size=MAX_MULTI_CORP_CODES):
+    """회사 코드 목록을 다중회사 API 요청 단위로 분할"""
+    corp_codes = list(dict.fromkeys(corp_codes))
+    return [corp_codes[i:i + size] for i in range(0, len(corp_codes), size)]
+
+def split_multi_response(corp_codes, data):
+    """다중회사 응답을 회사별 단일회사 응답 형식으로 분리
+
+    응답에 없는 회사는 '조회된 데이터 없음'(013) 상태로 채우되 'inferred': True를 붙인다.
+    다중회사 API에 빠졌다는 뜻일 뿐이므로 단일회사 응답으로 쓰지 말고 fnlttSinglAcnt로 다시 확인한다.
+    """
+    status = data.get('status')
+    if status not in ('000', NO_DATA_STATUS):
+        return {corp_code: {'status': status, 'message': data.get('message')} for corp_code in corp_codes}
+    
+    grouped = {corp_code: [] for corp_code in corp_codes}
+    for row in data.get('list') or []:
+        grouped.setdefault(row.get('corp_code'), []).append(row)
+    
+    results = {}
+    for corp_code, rows in grouped.items():
+        if rows:
+            results[corp_code] = {'status': '000', 'message': '정상', 'list': rows}
+        else:
+            results[corp_code] = {'status': NO_DATA_STATUS, 'message': '조회된 데이타가 없습니다.', 'inferred': True}
+    return results
+
+def fetch_multi_financial_info(api_key, corp_codes, year, report_code):
+    """여러 회사의 재무정보를 100개 단위 다중회사 요청(fnlttMultiAcnt)으로 나누어 동시에 조회
+
+    공용 전송 계층의 요청 스레드 풀을 쓰며 {corp_code: 단일회사 응답 형식 또는 예외}를
+    반환한다 (요청이 실패한 묶음의 회사는 그 예외).
+    """
+    chunks = chunk_corp_codes(corp_codes)
+    responses = get_json_many(
+        (i, 'fnlttMultiAcnt.json', {
+            'crtfc_key': api_key,
+            'corp_code': ','.join(chunk),
+            'bsns_year': year,
+            'reprt_code': report_code
+        })
+        for i, chunk in enumerate(chunks)
+    )
+
+    results = {}
+    for i, chunk in enumerate(chunks):
+        data = responses[i]
+        if isinstance(data, Exception):
+            results.update((corp_code, data) for corp_code in chunk)
+        else:
+            results.update(split_multi_response(chunk, data))
+    return results
+
+def parse_years(value, max_years=None):
+    """'2019-2024' 또는 '2019,2021' 형식의 사업연도 목록 파싱
+
+    범위는 목록을 만들기 전에 MIN_BSNS_YEAR~올해 안인지 확인하고,
+    max_years를 주면 사업연도 수도 제한한다 (벗어나면 ValueError).
+    """
+    last_year = date.today().year
+    years = {}
+    for part in value.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            if '-' in part:
+                start, end = (int(v) for v in part.split('-', 1))
+            else:
+                start = end = int(part)
+        except ValueError:
+            raise ValueError("사업연도 형식이 올바르지 않습니다. (예: 2019-2024)")
+        if not MIN_BSNS_YEAR <= start <= end <= last_year:
+            raise ValueError(f"사업연도는 {MIN_BSNS_YEAR}~{last_year} 범위로 지정해야 합니다.")
+        years.update((str(year), None) for year in range(start, end + 1))
+        if max_years is not None and len(years) > max_years:
+            raise ValueError(f"사업연도는 최대 {max_years}개까지 지정할 수 있습니다.")
+    return list(years)
+
 class OpenDartClient:
     def __init__(self):
         self.api_key = os.getenv('OPENDART_API_KEY')
         if not self.api_key:
             raise ValueError("OPENDART_API_KEY not found in environment variables")
         
-        self.base_url = "https://opendart.fss.or.kr/api"
+        # 공용 전송 계층 (커넥션 풀, 재시도, 속도 제한)
+        self.transport = get_transport()
     
     def get_company_info(self, corp_code):
         """기업 정보 조회"""
-        url = f"{self.base_url}/company.json"
+        url = "company.json"
         params = {
             'crtfc_key': self.api_key,
             'corp_code': corp_code
         }
         
-        response = requests.get(url, params=params)
-        return response.json()
+        return self.transport.get_json(url, params)
     
     def get_financial_info(self, corp_code, year, report_code):
         """재무정보 조회"""
-        url = f"{self.base_url}/fnlttSinglAcnt.json"
+        url = "fnlttSinglAcnt.json"
         params = {
             'crtfc_key': self.api_key,
             'corp_code': corp_code,
@@ -36,69 +124,40 @@ class OpenDartClient:
             'reprt_code': report_code
         }
         
-        response = requests.get(url, params=params)
-        return response.json()
+        return self.transport.get_json(url, params)
+    
+    def get_multi_financial_info(self, corp_codes, year, report_code):
+        """여러 회사의 재무정보 조회 (fnlttMultiAcnt, 100개 단위로 나누어 동시에 요청)
+
+        {corp_code: 단일회사 응답 형식 또는 예외} 형태로 반환한다.
+        """
+        return fetch_multi_financial_info(self.api_key, corp_codes, year, report_code)
+    
+    def iter_corp_codes(self):
+        """회사코드(고유번호)를 스트리밍으로 다운로드하며 한 건씩 생성"""
+        with download_corp_code_zip(self.transport, self.api_key) as zip_file:
+            for values in iter_corp_codes(zip_file):
+                yield dict(zip(CORP_CODE_FIELDS, values))
     
     def download_corp_codes(self):
         """회사코드(고유번호) 다운로드"""
-        url = f"{self.base_url}/corpCode.xml"
-        params = {
-            'crtfc_key': self.api_key
-        }
-        
-        response = requests.get(url, params=params)
-        if response.status_code == 200:
-            # ZIP 파일로 응답이 오므로 압축 해제
-            try:
-                with zipfile.ZipFile(io.BytesIO(response.content)) as zip_file:
-                    # ZIP 파일 내의 XML 파일 읽기
-                    xml_filename = None
-                    for filename in zip_file.namelist():
-                        if filename.endswith('.xml'):
-                            xml_filename = filename
-                            break
-                    
-                    if xml_filename:
-                        with zip_file.open(xml_filename) as xml_file:
-                            xml_content = xml_file.read().decode('utf-8')
-                        
-                        # XML 파싱
-                        import xml.etree.ElementTree as ET
-                        root = ET.fromstring(xml_content)
-                        
-                        companies = []
-                        for corp in root.findall('.//list'):
-                            company_info = {
-                                'corp_code': corp.find('corp_code').text if corp.find('corp_code') is not None else '',
-                                'corp_name': corp.find('corp_name').text if corp.find('corp_name') is not None else '',
-                                'stock_code': corp.find('stock_code').text if corp.find('stock_code') is not None else '',
-                                'modify_date': corp.find('modify_date').text if corp.find('modify_date') is not None else ''
-                            }
-                            companies.append(company_info)
-                        
-                        return companies
-                    else:
-                        raise Exception("ZIP 파일에서 XML 파일을 찾을 수 없습니다.")
-            except zipfile.BadZipFile:
-                raise Exception("응답이 유효한 ZIP 파일이 아닙니다.")
-        else:
-            raise Exception(f"Failed to download corp codes: {response.status_code}")
+        return list(self.iter_corp_codes())
     
     def save_corp_codes_to_csv(self, filename='corp_codes.csv'):
         """회사코드를 CSV 파일로 저장"""
         import csv
         
-        companies = self.download_corp_codes()
-        
+        count = 0
         with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
             fieldnames = ['corp_code', 'corp_name', 'stock_code', 'modify_date']
             writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
             
             writer.writeheader()
-            for company in companies:
+            for company in self.iter_corp_codes():
                 writer.writerow(company)
+                count += 1
         
-        print(f"회사코드가 {filename}에 저장되었습니다. (총 {len(companies)}개 회사)")
+        print(f"회사코드가 {filename}에 저장되었습니다. (총 {count}개 회사)")
         return filename
 
 def main():
@@ -0,0 +1,140 @@
+import argparse
+import fcntl
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import date
+from dotenv import load_dotenv
+from opendart_client import OpenDartClient, chunk_corp_codes, parse_years
+from financial_store import FinancialStatementStore
+from dart_transport import FANOUT_THREADS, TRANSIENT_STATUSES
+
+logger = logging.getLogger(__name__)
+
+# 환경변수 로드
+load_dotenv()
+
+# 기본 수집 범위: 최근 3개 사업연도의 사업보고서
+DEFAULT_REPRT_CODES = ('11011',)
+DEFAULT_YEAR_COUNT = 3
+
+# 한 번 실행할 때 사용할 최대 OpenDART 요청 수 (다중회사 요청 1건 = 최대 100개 회사)
+DEFAULT_REQUEST_BUDGET = int(os.getenv('PREFETCH_REQUEST_BUDGET', '500'))
+
+# 백그라운드 수집 주기 (초)
+DEFAULT_INTERVAL = int(os.getenv('PREFETCH_INTERVAL', str(6 * 60 * 60)))
+
+def listed_corp_codes(db_path='corp_codes.db'):
+    """종목코드가 있는(상장) 회사 코드 목록"""
+    conn = sqlite3.connect(db_path)
+    try:
+        return [
+            row[0] for row in conn.execute(
+                "SELECT corp_code FROM companies WHERE TRIM(COALESCE(stock_code, '')) != '' ORDER BY corp_code"
+            )
+        ]
+    finally:
+        conn.close()
+
+def default_years():
+    """마감된 최근 사업연도 목록 (최신순)"""
+    last_year = date.today().year - 1
+    return [str(year) for year in range(last_year, last_year - DEFAULT_YEAR_COUNT, -1)]
+
+def prefetch(store, client=None, years=None, reprt_codes=DEFAULT_REPRT_CODES,
+             budget=DEFAULT_REQUEST_BUDGET, db_path='corp_codes.db', stop_event=None):
+    """상장 회사의 재무제표를 요청 예산 안에서 저장소로 수집
+
+    이미 저장된 (회사, 사업연도, 보고서)는 건너뛰고, 남은 회사는 다중회사 API로
+    100개씩 묶어 여러 묶음을 동시에 요청한다. 다중회사 응답에 없던 회사도 유효기간 동안은 다시 요청하지 않는다. 사용한 요청 수와 저장한 보고서 수를 반환한다.
+    """
+    client = client or OpenDartClient()
+    years = years or default_years()
+    corp_codes = listed_corp_codes(db_path)
+    
+    requests_used = 0
+    stored = 0
+    for bsns_year in years:
+        for reprt_code in reprt_codes:
+            missing = store.missing_corp_codes(corp_codes, bsns_year, reprt_code)
+            chunks = chunk_corp_codes(missing)
+            while chunks:
+                if requests_used >= budget or (stop_event is not None and stop_event.is_set()):
+                    return {'requests': requests_used, 'stored': stored, 'exhausted': True}
+                
+                # 남은 예산 안에서 전송 계층 스레드 수만큼 묶음을 동시에 요청
+                batch = chunks[:min(FANOUT_THREADS, budget - requests_used)]
+                chunks = chunks[len(batch):]
+                results = client.get_multi_financial_info(
+                    [corp_code for chunk in batch for corp_code in chunk], bsns_year, reprt_code
+                )
+                requests_used += len(batch)
+                
+                error = None
+                transient = False
+                for corp_code, payload in results.items():
+                    if isinstance(payload, Exception):
+                        error = payload
+                    elif payload.get('status') in TRANSIENT_STATUSES:
+                        transient = True
+                    elif store.put_report(corp_code, bsns_year, reprt_code, payload):
+                        stored += 1
+                if transient:
+                    # 요청 제한 초과 등은 다음 실행에서 다시 시도
+                    return {'requests': requests_used, 'stored': stored, 'exhausted': True}
+                if error is not None:
+                    logger.error("재무제표 수집 중 오류 발생: %s", error)
+                    return {'requests': requests_used, 'stored': stored, 'exhausted': False}
+    
+    return {'requests': requests_used, 'stored': stored, 'exhausted': False}
+
+def start_background_prefetch(store, lock_path='prefetch.lock', interval=DEFAULT_INTERVAL, **kwargs):
+    """백그라운드 수집 스레드 시작
+
+    여러 gunicorn 워커에서 호출해도 파일 잠금을 얻은 워커 하나만 수집한다.
+    잠금을 얻지 못하면 None을 반환한다.
+    """
+    lock_file = open(lock_path, 'w')
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return None
+    
+    stop_event = threading.Event()
+    
+    def run():
+        while not stop_event.is_set():
+            try:
+                result = prefetch(store, stop_event=stop_event, **kwargs)
+                logger.info("재무제표 수집 완료: 요청 %d건, 저장 %d건", result['requests'], result['stored'])
+            except Exception:
+                logger.exception("재무제표 수집 중 오류 발생")
+            stop_event.wait(interval)
+    
+    thread = threading.Thread(target=run, name='financial-prefetch', daemon=True)
+    thread.lock_file = lock_file
+    thread.stop_event = stop_event
+    thread.start()
+    return thread
+
+def main():
+    parser = argparse.ArgumentParser(description="상장 회사 재무제표를 로컬 저장소로 수집")
+    parser.add_argument('--years', help="사업연도 목록 (예: 2021-2023, 기본: 최근 3개 마감 연도)")
+    parser.add_argument('--reprt-codes', default=','.join(DEFAULT_REPRT_CODES), help="보고서 코드 목록 (예: 11011,11012)")
+    parser.add_argument('--budget', type=int, default=DEFAULT_REQUEST_BUDGET, help="최대 OpenDART 요청 수")
+    parser.add_argument('--db', default=os.getenv('FINANCIAL_STORE_DB', 'financial_statements.db'), help="재무제표 저장소 경로")
+    args = parser.parse_args()
+    
+    years = parse_years(args.years) if args.years else None
+    reprt_codes = [code.strip() for code in args.reprt_codes.split(',') if code.strip()]
+    
+    started = time.time()
+    result = prefetch(FinancialStatementStore(args.db), years=years, reprt_codes=reprt_codes, budget=args.budget)
+    print(f"요청 {result['requests']}건, 저장 {result['stored']}건, {time.time() - started:.1f}초"
+          + (" (예산 소진, 다음 실행에서 이어서 수집)" if result['exhausted'] else ""))
+
+if __name__ == "__main__":
+    main()
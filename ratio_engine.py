@@ -0,0 +1,180 @@
+import numpy as np
+
+# 주요 계정 (fnlttSinglAcnt / fnlttMultiAcnt 응답의 account_nm 기준)
+ACCOUNTS = (
+    '유동자산', '비유동자산', '자산총계',
+    '유동부채', '비유동부채', '부채총계',
+    '자본금', '이익잉여금', '자본총계',
+    '매출액', '영업이익', '법인세차감전순이익', '당기순이익'
+)
+ACCOUNT_INDEX = {name: i for i, name in enumerate(ACCOUNTS)}
+
+# 당기, 전기, 전전기
+TERMS = ('thstrm_amount', 'frmtrm_amount', 'bfefrmtrm_amount')
+
+# 연결재무제표, 별도재무제표
+FS_DIVS = ('CFS', 'OFS')
+FS_DIV_INDEX = {name: i for i, name in enumerate(FS_DIVS)}
+
+
+def normalize_account_name(account_nm):
+    """계정명 표기 차이 제거 (공백, '(손실)' 등)"""
+    return ''.join(account_nm.split()).replace('(손실)', '')
+
+
+def parse_amount(text):
+    """'1,234,567' 형식의 금액 문자열을 float로 변환 (빈 값이나 '-'는 NaN)"""
+    try:
+        return float(text.replace(',', ''))
+    except (AttributeError, ValueError):
+        return np.nan
+
+
+def safe_divide(numerator, denominator, positive_only=False):
+    """0 또는 NaN 분모는 NaN으로 처리하는 나눗셈 (positive_only면 분모가 양수일 때만 계산)"""
+    numerator = np.asarray(numerator, dtype=np.float64)
+    denominator = np.asarray(denominator, dtype=np.float64)
+    valid = denominator > 0 if positive_only else denominator != 0
+    valid &= ~np.isnan(numerator) & ~np.isnan(denominator)
+    result = np.full(np.broadcast(numerator, denominator).shape, np.nan)
+    np.divide(numerator, denominator, out=result, where=valid)
+    return result
+
+
+class FinancialPanel:
+    """N개 (회사, 사업연도, 보고서) x 계정 x 기간(당기/전기/전전기) x 연결/별도 금액 배열"""
+
+    def __init__(self, keys, values):
+        self.keys = keys
+        self.values = values
+        self.key_index = {key: i for i, key in enumerate(keys)}
+
+    @classmethod
+    def from_payloads(cls, payloads):
+        """[(키, OpenDART list 행 목록), ...]에서 패널 생성
+
+        키는 보통 (corp_code, bsns_year, reprt_code)이다. 각 금액 문자열은
+        한 번만 파싱하고, 평탄화된 배열에는 마지막에 한 번에 기록한다.
+        """
+        payloads = list(payloads)
+        keys = [key for key, _ in payloads]
+        values = np.full((len(keys), len(ACCOUNTS), len(TERMS), len(FS_DIVS)), np.nan)
+        flat = values.reshape(-1)
+
+        # flat 인덱스 = ((entity * 계정 수 + account) * 기간 수 + term) * 구분 수 + fs_div
+        term_stride = len(FS_DIVS)
+        account_stride = len(TERMS) * term_stride
+        entity_stride = len(ACCOUNTS) * account_stride
+        account_cache = {}
+        positions = []
+        amounts = []
+
+        for entity, (_, rows) in enumerate(payloads):
+            base = entity * entity_stride
+            for row in rows or ():
+                account_nm = row.get('account_nm', '')
+                account = account_cache.get(account_nm)
+                if account is None:
+                    account = account_cache[account_nm] = ACCOUNT_INDEX.get(
+                        normalize_account_name(account_nm), -1)
+                fs_div = FS_DIV_INDEX.get(row.get('fs_div'))
+                if account < 0 or fs_div is None:
+                    continue
+                offset = base + account * account_stride + fs_div
+                for term, field in enumerate(TERMS):
+                    amount = row.get(field)
+                    if amount:
+                        positions.append(offset + term * term_stride)
+                        amounts.append(parse_amount(amount))
+
+        if positions:
+            flat[np.array(positions, dtype=np.intp)] = np.array(amounts, dtype=np.float64)
+        return cls(keys, values)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def statements(self, fs_div='CFS', fallback=True):
+        """N x 계정 x 기간 배열
+
+        fallback이면 (회사, 보고서)마다 구분을 한 번만 고른다. fs_div 금액이 하나라도 있으면
+        fs_div를, 없으면 다른 구분(별도/연결)을 통째로 쓰므로 한 비율 안에 연결과 별도 값이
+        섞이지 않는다.
+        """
+        primary = self.values[..., FS_DIV_INDEX[fs_div]]
+        if not fallback:
+            return primary
+        other = self.values[..., 1 - FS_DIV_INDEX[fs_div]]
+        has_primary = ~np.isnan(primary).all(axis=(1, 2))
+        return np.where(has_primary[:, None, None], primary, other)
+
+
+def _level(numerator, denominator, scale=100.0, positive_only=True):
+    """당기/전기/전전기 각각의 비율 (N x 3)"""
+    def compute(data):
+        return safe_divide(data[:, ACCOUNT_INDEX[numerator]], data[:, ACCOUNT_INDEX[denominator]],
+                           positive_only) * scale
+    return compute
+
+
+def _growth(account):
+    """전년 대비 증가율 (N x 2: 당기/전기, 전기/전전기)"""
+    def compute(data):
+        series = data[:, ACCOUNT_INDEX[account]]
+        return (safe_divide(series[:, :-1], series[:, 1:], positive_only=True) - 1.0) * 100.0
+    return compute
+
+
+# 재무비율 목록: 이름 -> (표시명, 단위, 분류, 계산 함수)
+RATIO_CATALOG = {
+    # 안정성 (유동성)
+    'current_ratio': ('유동비율', '%', 'liquidity', _level('유동자산', '유동부채')),
+    # 안정성 (레버리지)
+    'debt_ratio': ('부채비율', '%', 'leverage', _level('부채총계', '자본총계')),
+    'equity_ratio': ('자기자본비율', '%', 'leverage', _level('자본총계', '자산총계')),
+    'debt_to_assets': ('부채총계/자산총계', '%', 'leverage', _level('부채총계', '자산총계')),
+    'non_current_ratio': ('비유동비율', '%', 'leverage', _level('비유동자산', '자본총계')),
+    'retained_earnings_ratio': ('유보율', '%', 'leverage', _level('이익잉여금', '자본금')),
+    # 수익성
+    'profit_margin': ('매출액이익률', '%', 'profitability', _level('당기순이익', '매출액')),
+    'operating_margin': ('영업이익률', '%', 'profitability', _level('영업이익', '매출액')),
+    'pretax_margin': ('법인세차감전순이익률', '%', 'profitability', _level('법인세차감전순이익', '매출액')),
+    'roe': ('자기자본이익률(ROE)', '%', 'profitability', _level('당기순이익', '자본총계')),
+    'roa': ('총자산이익률(ROA)', '%', 'profitability', _level('당기순이익', '자산총계')),
+    # 활동성
+    'asset_turnover': ('총자산회전율', '회', 'activity', _level('매출액', '자산총계', scale=1.0)),
+    # 성장성 (전년 대비)
+    'revenue_growth': ('매출액증가율', '%', 'growth', _growth('매출액')),
+    'operating_income_growth': ('영업이익증가율', '%', 'growth', _growth('영업이익')),
+    'net_income_growth': ('당기순이익증가율', '%', 'growth', _growth('당기순이익')),
+    'asset_growth': ('총자산증가율', '%', 'growth', _growth('자산총계')),
+    'equity_growth': ('자기자본증가율', '%', 'growth', _growth('자본총계')),
+}
+
+
+def compute_ratios(panel, names=None, fs_div='CFS', fallback=True):
+    """패널 전체에 대해 재무비율을 한 번에 계산
+
+    {비율 이름: 배열}을 반환한다. 수준 비율은 N x 3(당기/전기/전전기),
+    증가율은 N x 2(당기/전기 기준) 배열이며 계산할 수 없는 값은 NaN이다.
+    """
+    data = panel.statements(fs_div, fallback)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return {name: RATIO_CATALOG[name][3](data) for name in (names or RATIO_CATALOG)}
+
+
+def ratio_records(panel, ratios, term=0, decimals=2):
+    """계산된 비율을 회사별 dict 목록으로 변환 (calculate_financial_ratios와 같은 형식)"""
+    records = []
+    for i in range(len(panel)):
+        entry = {}
+        for name, values in ratios.items():
+            if term >= values.shape[1]:
+                continue
+            value = values[i, term]
+            if np.isnan(value):
+                continue
+            label, unit, _, _ = RATIO_CATALOG[name]
+            entry[name] = {'name': label, 'value': round(float(value), decimals), 'unit': unit}
+        records.append(entry)
+    return records
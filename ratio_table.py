@@ -0,0 +1,179 @@
+"""재무비율 구체화 테이블과 스크리너 조건식 파서
+
+financial_statements.db의 financial_ratios 테이블에 (corp_code, bsns_year, reprt_code)별
+당기 재무비율을 열 하나씩 저장한다. 보고서를 저장할 때 같은 트랜잭션에서 갱신하며,
+비율마다 (bsns_year, reprt_code, 비율) 인덱스가 있어 상위 k개 조회는 인덱스 순서로
+읽다가 k개를 채우면 멈춘다.
+
+조건식은 "debt_ratio < 100 and roe > 0", "부채비율<100%, ROE>=10"처럼 비율 이름(또는 표시명)
+비교를 and/쉼표로 이어 쓰고, 정렬식은 "-roe,debt_ratio"처럼 쓴다 (-는 내림차순).
+열 이름은 RATIO_CATALOG에 있는 것만 허용하고 값은 바인딩 파라미터로 넘긴다.
+"""
+import math
+import re
+
+from ratio_engine import FinancialPanel, RATIO_CATALOG, compute_ratios
+
+RATIO_COLUMNS = tuple(RATIO_CATALOG)
+
+KEY_COLUMNS = ('corp_code', 'bsns_year', 'reprt_code')
+
+# 조건식: <비율 이름> <비교 연산자> <숫자>[%]
+CONDITION_PATTERN = re.compile(
+    r'^\s*(?P<column>.+?)\s*(?P<op><=|>=|!=|<|>|=)\s*(?P<value>[-+]?\d+(?:\.\d+)?)\s*%?\s*$'
+)
+CONDITION_SEPARATOR = re.compile(r'\s+and\s+|\s*,\s*|\s*&&\s*', re.IGNORECASE)
+
+# 한 번에 구체화할 보고서 수 (백필)
+BACKFILL_BATCH_SIZE = 500
+
+# 비율 계산 규칙 버전 (PRAGMA user_version에 기록, 올리면 백필할 때 전체를 다시 계산)
+RATIO_VERSION = 2
+
+
+def _aliases():
+    """조건식에서 쓸 수 있는 이름 -> 열 이름 ('roe', '자기자본이익률(ROE)', '자기자본이익률', 'ROE')"""
+    aliases = {}
+    for column, (label, _, _, _) in RATIO_CATALOG.items():
+        names = {column, label, label.split('(')[0]}
+        inner = re.search(r'\((.+)\)', label)
+        if inner:
+            names.add(inner.group(1))
+        for name in names:
+            aliases[normalize_name(name)] = column
+    return aliases
+
+
+def normalize_name(name):
+    return ''.join(name.split()).lower()
+
+
+RATIO_ALIASES = None
+
+
+def resolve_column(name):
+    """비율 이름/표시명을 열 이름으로 변환 (없으면 ValueError)"""
+    global RATIO_ALIASES
+    if RATIO_ALIASES is None:
+        RATIO_ALIASES = _aliases()
+    column = RATIO_ALIASES.get(normalize_name(name))
+    if column is None:
+        raise ValueError(f"알 수 없는 재무비율입니다: {name}")
+    return column
+
+
+def parse_filter(text):
+    """조건식을 (SQL 조건 목록, 파라미터 목록)으로 변환"""
+    conditions = []
+    params = []
+    if not text or not text.strip():
+        return conditions, params
+
+    for part in CONDITION_SEPARATOR.split(text.strip()):
+        if not part:
+            continue
+        match = CONDITION_PATTERN.match(part)
+        if match is None:
+            raise ValueError(f"조건식 형식이 올바르지 않습니다: {part} (예: debt_ratio < 100)")
+        column = resolve_column(match.group('column'))
+        conditions.append(f"{column} {match.group('op')} ?")
+        params.append(float(match.group('value')))
+    return conditions, params
+
+
+def parse_sort(text, default='-roe'):
+    """정렬식을 [(열 이름, 내림차순 여부)] 목록으로 변환"""
+    order = []
+    for part in (text or default).split(','):
+        part = part.strip()
+        if not part:
+            continue
+        descending = part.startswith('-')
+        column = resolve_column(part.lstrip('+-'))
+        order.append((column, descending))
+    if not order:
+        raise ValueError("정렬할 재무비율이 필요합니다.")
+    return order
+
+
+def create_ratio_table(conn):
+    """financial_ratios 테이블과 비율별 인덱스 생성"""
+    conn.execute(f'''
+    CREATE TABLE IF NOT EXISTS financial_ratios (
+        corp_code TEXT NOT NULL,
+        bsns_year TEXT NOT NULL,
+        reprt_code TEXT NOT NULL,
+        {', '.join(f'{column} REAL' for column in RATIO_COLUMNS)},
+        PRIMARY KEY (corp_code, bsns_year, reprt_code)
+    ) WITHOUT ROWID
+    ''')
+    for column in RATIO_COLUMNS:
+        conn.execute(f'''
+        CREATE INDEX IF NOT EXISTS idx_ratios_{column}
+        ON financial_ratios (bsns_year, reprt_code, {column})
+        ''')
+
+
+def ratio_rows(reports):
+    """[((corp_code, bsns_year, reprt_code), OpenDART list 행), ...]의 당기 비율 행 목록"""
+    reports = list(reports)
+    if not reports:
+        return []
+    panel = FinancialPanel.from_payloads(reports)
+    ratios = compute_ratios(panel)
+    rows = []
+    for i, key in enumerate(panel.keys):
+        values = []
+        for column in RATIO_COLUMNS:
+            value = float(ratios[column][i, 0])
+            values.append(None if math.isnan(value) else value)
+        rows.append(tuple(key) + tuple(values))
+    return rows
+
+
+def materialize(conn, reports):
+    """보고서들의 재무비율을 financial_ratios에 저장 (트랜잭션은 호출 측에서 관리)"""
+    rows = ratio_rows(reports)
+    columns = KEY_COLUMNS + RATIO_COLUMNS
+    conn.executemany(
+        f'INSERT OR REPLACE INTO financial_ratios ({", ".join(columns)}) '
+        f'VALUES ({", ".join("?" for _ in columns)})',
+        rows
+    )
+    return len(rows)
+
+
+def screen_query(bsns_year, reprt_code, conditions, params, order, limit,
+                 with_names=False, listed_only=False):
+    """스크리너 SQL과 파라미터 생성
+
+    첫 번째 정렬 열이 NULL인 행은 제외하므로 SQLite가 (bsns_year, reprt_code, 정렬 열)
+    인덱스를 순서대로 읽으며 조건을 검사하고 limit개를 채우면 멈춘다. 회사명은
+    directory 스키마로 연결한 corp_codes.db의 companies에서 붙인다.
+    """
+    first, descending = order[0]
+    direction = 'DESC' if descending else 'ASC'
+    columns = ['r.corp_code'] + [f'r.{column}' for column in RATIO_COLUMNS]
+    sql = []
+
+    if with_names:
+        columns[1:1] = ['c.corp_name', 'c.stock_code']
+        join = 'JOIN' if listed_only else 'LEFT JOIN'
+        sql.append(f'SELECT {", ".join(columns)} FROM financial_ratios r '
+                   f'{join} directory.companies c ON c.corp_code = r.corp_code')
+    else:
+        sql.append(f'SELECT {", ".join(columns)} FROM financial_ratios r')
+
+    where = ['r.bsns_year = ?', 'r.reprt_code = ?', f'r.{first} IS NOT NULL']
+    where.extend(f'r.{condition}' for condition in conditions)
+    if listed_only:
+        where.append("TRIM(c.stock_code) != ''")
+    sql.append('WHERE ' + ' AND '.join(where))
+
+    # 동률은 인덱스에 함께 저장된 corp_code로 (첫 정렬 방향과 같게) 정렬
+    terms = [f'r.{column} {"DESC" if desc else "ASC"}' for column, desc in order]
+    terms.append(f'r.corp_code {direction}')
+    sql.append('ORDER BY ' + ', '.join(terms))
+    sql.append('LIMIT ?')
+
+    return ' '.join(sql), [str(bsns_year), str(reprt_code)] + list(params) + [int(limit)]
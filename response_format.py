@@ -0,0 +1,77 @@
+from financial_store import parse_amount
+
+# 응답 형식 (?format=...)
+FORMAT_FULL = 'full'
+FORMAT_COMPACT = 'compact'
+FORMATS = (FORMAT_FULL, FORMAT_COMPACT)
+
+# 모든 행에서 값이 같으면 header로 한 번만 보내는 필드
+HEADER_FIELDS = ('corp_code', 'bsns_year', 'reprt_code', 'rcept_no', 'stock_code', 'currency')
+
+# 재무제표(fs_div x sj_div)마다 한 번만 보내는 필드
+STATEMENT_FIELDS = ('fs_div', 'fs_nm', 'sj_div', 'sj_nm')
+
+# 계정별 열 (화면에서 사용하는 필드만)
+AMOUNT_COLUMNS = ('thstrm_amount', 'frmtrm_amount', 'bfefrmtrm_amount')
+
+
+def parse_format(value):
+    """format 쿼리 파라미터 확인 (잘못된 값이면 ValueError)"""
+    value = (value or FORMAT_FULL).strip().lower()
+    if value not in FORMATS:
+        raise ValueError(value)
+    return value
+
+
+def _ord(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def compact_financial_data(data):
+    """재무제표 응답을 compact 형식으로 변환
+
+    행마다 반복되는 회사/보고서 필드는 header로 한 번만 보내고, 계정은 재무제표별
+    열 배열(account_nm, ord, 금액)로 묶는다. 금액은 정수(값이 없으면 null)이다.
+    header 필드 값이 행마다 다르면 header 대신 해당 재무제표의 열로 보낸다.
+
+        {"status": "000", "format": "compact", "header": {...},
+         "statements": [{"fs_div": "CFS", "sj_div": "BS", ..., "account_nm": [...],
+                         "ord": [...], "thstrm_amount": [...], ...}],
+         "financial_ratios": {...}}
+    """
+    rows = data.get('list') or []
+    result = {key: value for key, value in data.items() if key != 'list'}
+    result['format'] = FORMAT_COMPACT
+
+    header = {}
+    varying = []
+    for field in HEADER_FIELDS:
+        values = {row.get(field) for row in rows}
+        if len(values) == 1:
+            value = values.pop()
+            if value is not None:
+                header[field] = value
+        elif values:
+            varying.append(field)
+
+    statements = {}
+    for row in rows:
+        key = tuple(row.get(field) for field in STATEMENT_FIELDS)
+        statement = statements.get(key)
+        if statement is None:
+            statement = statements[key] = dict(zip(STATEMENT_FIELDS, key))
+            for column in ('account_nm', 'ord') + AMOUNT_COLUMNS + tuple(varying):
+                statement[column] = []
+        statement['account_nm'].append(row.get('account_nm'))
+        statement['ord'].append(_ord(row.get('ord')))
+        for column in AMOUNT_COLUMNS:
+            statement[column].append(parse_amount(row.get(column)))
+        for field in varying:
+            statement[field].append(row.get(field))
+
+    result['header'] = header
+    result['statements'] = list(statements.values())
+    return result
@@ -0,0 +1,362 @@
+import logging
+import os
+import threading
+import time
+import heapq
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+
+from db_pool import get_pool
+
+logger = logging.getLogger(__name__)
+
+# 한글 초성 (유니코드 음절 순서)
+CHOSUNG = [
+    'ㄱ', 'ㄲ', 'ㄴ', 'ㄷ', 'ㄸ', 'ㄹ', 'ㅁ', 'ㅂ', 'ㅃ', 'ㅅ',
+    'ㅆ', 'ㅇ', 'ㅈ', 'ㅉ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ'
+]
+CHOSUNG_SET = frozenset(CHOSUNG)
+
+HANGUL_BEGIN = 0xAC00
+HANGUL_END = 0xD7A3
+JUNGSUNG_JONGSUNG_COUNT = 21 * 28
+
+# 결과 정렬 순위: 정확히 일치 > 접두어 일치 > 부분 일치
+RANK_EXACT = 0
+RANK_PREFIX = 1
+RANK_SUBSTRING = 2
+
+# 접두어 범위 끝을 표시하기 위한 최대 문자
+PREFIX_SENTINEL = '\U0010ffff'
+
+# DB 파일 변경 확인 주기 (초)
+RELOAD_CHECK_INTERVAL = 5.0
+
+# 타이핑 중 검색어 후보 캐시 크기 (저장하는 레코드 id 총 개수, 워커별)
+TYPEAHEAD_MAX_IDS = 1000000
+
+# 후보가 이보다 많을 수 있는 검색어(짧은 1글자 등)는 캐시하지 않고 인덱스로 바로 검색
+TYPEAHEAD_MAX_CANDIDATES = 20000
+
+
+def normalize(text):
+    """검색용 정규화 (소문자 변환, 공백 제거)"""
+    return ''.join(text.lower().split())
+
+
+def to_chosung(text):
+    """문자열을 초성 문자열로 변환 (한글 음절 이외의 문자는 그대로 유지)"""
+    chars = []
+    for ch in text:
+        code = ord(ch)
+        if HANGUL_BEGIN <= code <= HANGUL_END:
+            chars.append(CHOSUNG[(code - HANGUL_BEGIN) // JUNGSUNG_JONGSUNG_COUNT])
+        else:
+            chars.append(ch)
+    return ''.join(chars)
+
+
+def is_chosung_query(query):
+    """검색어가 초성으로만 이루어졌는지 확인"""
+    return bool(query) and all(ch in CHOSUNG_SET for ch in query)
+
+
+def grams(text):
+    """문자 단위 1-gram과 2-gram 추출"""
+    result = set(text)
+    for i in range(len(text) - 1):
+        result.add(text[i:i + 2])
+    return result
+
+
+def db_signature(db_path):
+    """DB 파일(및 WAL 파일)의 변경 여부 확인용 시그니처"""
+    signature = []
+    for path in (db_path, db_path + '-wal'):
+        try:
+            stat = os.stat(path)
+            signature.append((stat.st_ino, stat.st_mtime_ns, stat.st_size))
+        except FileNotFoundError:
+            signature.append(None)
+    return tuple(signature)
+
+
+class _KeyIndex:
+    """정규화된 키 목록에 대한 n-gram 역색인과 접두어 검색 구조
+
+    레코드 id는 정적 순위(상장사 우선, 짧은 이름 우선) 순서로 부여되므로
+    각 posting 리스트를 앞에서부터 순회하면 순위가 높은 결과부터 얻는다.
+    접두어 검색은 정렬된 키 배열에 대한 이진 탐색으로 처리한다
+    (노드 단위 트라이를 평탄화한 형태로, 메모리 사용량이 훨씬 작다).
+    """
+
+    def __init__(self, keys):
+        self.keys = keys
+        self.postings = {}
+        self.exact = {}
+
+        for record_id, key in enumerate(keys):
+            self.exact.setdefault(key, []).append(record_id)
+            for gram in grams(key):
+                posting = self.postings.get(gram)
+                if posting is None:
+                    self.postings[gram] = [record_id]
+                else:
+                    posting.append(record_id)
+
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        self.sorted_keys = [keys[i] for i in order]
+        self.sorted_ids = order
+
+    def candidates(self, query):
+        """검색어의 n-gram 중 posting이 가장 짧은 것을 반환"""
+        query_grams = grams(query) if len(query) < 2 else {
+            query[i:i + 2] for i in range(len(query) - 1)
+        }
+        best = None
+        for gram in query_grams:
+            posting = self.postings.get(gram)
+            if posting is None:
+                return []
+            if best is None or len(posting) < len(best):
+                best = posting
+        return best or []
+
+    def matching_ids(self, query, max_candidates=None):
+        """검색어를 포함하는 모든 레코드 id (오름차순)
+
+        검토할 posting이 max_candidates보다 길면 None을 반환한다.
+        """
+        candidates = self.candidates(query)
+        if max_candidates is not None and len(candidates) > max_candidates:
+            return None
+        keys = self.keys
+        return array('I', [record_id for record_id in candidates if query in keys[record_id]])
+
+    def prefix_ids(self, query, limit):
+        """접두어가 일치하는 레코드 중 순위가 높은 것부터 limit개"""
+        start = bisect_left(self.sorted_keys, query)
+        end = bisect_left(self.sorted_keys, query + PREFIX_SENTINEL, start)
+        if end - start <= limit:
+            return sorted(self.sorted_ids[start:end])
+        return heapq.nsmallest(limit, self.sorted_ids[start:end])
+
+    def search(self, query, limit):
+        """(순위, 레코드 id) 목록을 순위 순으로 반환"""
+        results = []
+        seen = set()
+
+        for record_id in self.exact.get(query, ())[:limit]:
+            results.append((RANK_EXACT, record_id))
+            seen.add(record_id)
+
+        if len(results) < limit:
+            for record_id in self.prefix_ids(query, limit):
+                if record_id not in seen:
+                    results.append((RANK_PREFIX, record_id))
+                    seen.add(record_id)
+                    if len(results) >= limit:
+                        break
+
+        if len(results) < limit:
+            keys = self.keys
+            for record_id in self.candidates(query):
+                if record_id in seen:
+                    continue
+                if query in keys[record_id]:
+                    results.append((RANK_SUBSTRING, record_id))
+                    if len(results) >= limit:
+                        break
+
+        return results
+
+
+def rank(key, query):
+    """검색어를 포함하는 키의 순위"""
+    if key == query:
+        return RANK_EXACT
+    if key.startswith(query):
+        return RANK_PREFIX
+    return RANK_SUBSTRING
+
+
+def ranked_ids(keys, query, ids):
+    """검색어를 포함하는 레코드 id를 _KeyIndex.search()와 같은 (순위, id) 순서로 정렬"""
+    return array('I', sorted(ids, key=lambda record_id: (rank(keys[record_id], query), record_id)))
+
+
+class TypeaheadCache:
+    """최근 검색어별 전체 후보 집합(LIMIT 없이 검색어를 포함하는 모든 레코드 id) LRU
+
+    후보는 결과 순서대로 정렬해 두므로 같은 검색어는 앞의 limit개만 읽으면 된다.
+
+    타이핑 중에는 "삼성" -> "삼성전" -> "삼성전자"처럼 앞 검색어를 늘려 가며
+    요청하므로, 캐시된 가장 긴 접두어의 후보 집합을 걸러서 다음 검색어에 답한다.
+    검색어를 포함하는 회사는 반드시 그 접두어도 포함하므로 결과는 인덱스 검색과 같다.
+    검색어의 가장 짧은 posting이 접두어 후보 집합보다 작으면 그 posting을 대신 거른다.
+    인덱스마다 하나씩 두므로 DB/스냅샷이 바뀌어 인덱스를 다시 로드하면 함께 비워진다.
+    """
+
+    def __init__(self, max_ids=TYPEAHEAD_MAX_IDS, max_candidates=TYPEAHEAD_MAX_CANDIDATES):
+        self.max_ids = max_ids
+        self.max_candidates = max_candidates
+        self._entries = OrderedDict()
+        self._ids = 0
+        self._lock = threading.Lock()
+        self.stats = {
+            'hits': 0,
+            'refinements': 0,
+            'misses': 0,
+            'bypasses': 0,
+            'evictions': 0
+        }
+
+    def _longest_prefix(self, name, query):
+        """(캐시된 가장 긴 접두어, 후보 id 배열) 또는 (None, None)"""
+        with self._lock:
+            for end in range(len(query), 0, -1):
+                key = (name, query[:end])
+                ids = self._entries.get(key)
+                if ids is not None:
+                    self._entries.move_to_end(key)
+                    return key[1], ids
+        return None, None
+
+    def _store(self, name, query, ids):
+        # 빈 후보 집합도 항목 수가 무한히 늘지 않도록 1로 계산
+        size = len(ids) + 1
+        with self._lock:
+            previous = self._entries.pop((name, query), None)
+            if previous is not None:
+                self._ids -= len(previous) + 1
+            self._entries[(name, query)] = ids
+            self._ids += size
+            while self._ids > self.max_ids and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._ids -= len(evicted) + 1
+                self.stats['evictions'] += 1
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def search(self, name, key_index, query, limit):
+        """key_index.search()와 같은 (순위, 레코드 id) 목록 반환"""
+        prefix, ids = self._longest_prefix(name, query)
+        if ids is None:
+            ids = key_index.matching_ids(query, self.max_candidates)
+            if ids is None:
+                self._count('bypasses')
+                return key_index.search(query, limit)
+            ids = ranked_ids(key_index.keys, query, ids)
+            self._count('misses')
+            self._store(name, query, ids)
+        elif prefix != query:
+            keys = key_index.keys
+            # 접두어 후보와 검색어 posting 중 작은 쪽만 확인 ("삼" -> "삼성"처럼 접두어가 짧을 때)
+            candidates = key_index.candidates(query)
+            if len(candidates) < len(ids):
+                ids = candidates
+            ids = ranked_ids(keys, query, [record_id for record_id in ids if query in keys[record_id]])
+            self._count('refinements')
+            self._store(name, query, ids)
+        else:
+            self._count('hits')
+        keys = key_index.keys
+        return [(rank(keys[record_id], query), record_id) for record_id in ids[:limit]]
+
+    def get_stats(self):
+        """적중/접두어 재사용/미스 카운터와 사용량"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['entries'] = len(self._entries)
+            stats['ids'] = self._ids
+        return stats
+
+
+class CompanySearchIndex:
+    """회사명 검색 엔진 (부분 일치, 접두어 일치, 초성 검색)"""
+
+    def __init__(self, records):
+        # 상장사 우선, 짧은 이름 우선, 이름 순으로 정렬하여 id 부여
+        self.records = sorted(
+            records,
+            key=lambda r: (not (r[2] or '').strip(), len(r[1]), r[1])
+        )
+        names = [normalize(r[1]) for r in self.records]
+        self.name_index = _KeyIndex(names)
+        self.chosung_index = _KeyIndex([to_chosung(name) for name in names])
+        self.typeahead = TypeaheadCache()
+
+    @classmethod
+    def from_db(cls, db_path='corp_codes.db'):
+        """회사 코드 데이터베이스에서 검색 인덱스 생성"""
+        rows = get_pool(db_path).execute(
+            "SELECT corp_code, corp_name, stock_code, modify_date FROM companies"
+        ).fetchall()
+        return cls([tuple(row) for row in rows])
+
+    def __len__(self):
+        return len(self.records)
+
+    def search(self, query, limit=10):
+        """회사명 검색 결과를 순위 순으로 반환"""
+        query = normalize(query)
+        if not query:
+            return []
+
+        index_name = 'chosung_index' if is_chosung_query(query) else 'name_index'
+        hits = self.typeahead.search(index_name, getattr(self, index_name), query, limit)
+
+        results = []
+        for _, record_id in hits:
+            corp_code, corp_name, stock_code, modify_date = self.records[record_id]
+            results.append({
+                'corp_code': corp_code,
+                'corp_name': corp_name,
+                'stock_code': stock_code,
+                'modify_date': modify_date
+            })
+        return results
+
+
+_index = None
+_index_signature = None
+_index_checked_at = 0.0
+_index_lock = threading.Lock()
+
+
+def load_index(db_path, snapshot_path):
+    """스냅샷이 있으면 mmap으로 열고, 없거나 읽을 수 없으면 DB에서 인덱스 생성"""
+    from company_snapshot import load_snapshot, SnapshotError
+
+    if os.path.exists(snapshot_path):
+        try:
+            return load_snapshot(snapshot_path)
+        except SnapshotError as e:
+            logger.warning("스냅샷 대신 DB에서 검색 인덱스를 생성합니다: %s", e)
+    return CompanySearchIndex.from_db(db_path)
+
+
+def get_search_index(db_path='corp_codes.db', snapshot_path=None):
+    """워커별 검색 인덱스 반환 (스냅샷 또는 DB 파일이 바뀌면 다시 로드)"""
+    global _index, _index_signature, _index_checked_at
+
+    now = time.monotonic()
+    if _index is not None and now - _index_checked_at < RELOAD_CHECK_INTERVAL:
+        return _index
+
+    with _index_lock:
+        if _index is not None and now - _index_checked_at < RELOAD_CHECK_INTERVAL:
+            return _index
+
+        if snapshot_path is None:
+            from company_snapshot import default_snapshot_path
+            snapshot_path = default_snapshot_path(db_path)
+        signature = (db_signature(snapshot_path), db_signature(db_path))
+        if _index is None or signature != _index_signature:
+            _index = load_index(db_path, snapshot_path)
+            _index_signature = signature
+        _index_checked_at = now
+        return _index
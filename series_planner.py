@@ -0,0 +1,146 @@
+"""사업보고서 시계열 조회 계획
+
+사업보고서(11011) 응답 하나에는 당기, 전기, 전전기 세 사업연도 금액이 들어 있으므로
+2015-2023년 시계열은 2023, 2020, 2017년 보고서 세 건이면 된다. 각 사업연도 값은
+그 연도를 포함하는 보고서 중 가장 최근 보고서에서 가져온다 (재작성된 수치 우선).
+
+분/반기 보고서의 전기 재무상태표 금액은 같은 분기가 아니라 직전 사업연도 말 금액이므로
+사업보고서에만 적용한다.
+"""
+ANNUAL_REPORT = '11011'
+
+# 기간 열 (당기, 전기, 전전기): (기수, 일자, 금액)
+TERM_COLUMNS = (
+    ('thstrm_nm', 'thstrm_dt', 'thstrm_amount'),
+    ('frmtrm_nm', 'frmtrm_dt', 'frmtrm_amount'),
+    ('bfefrmtrm_nm', 'bfefrmtrm_dt', 'bfefrmtrm_amount'),
+)
+
+# 누적 금액 열 (당기, 전기)
+ADD_AMOUNT_COLUMNS = ('thstrm_add_amount', 'frmtrm_add_amount')
+
+# 사업보고서 한 건이 담는 사업연도 수
+TERMS_PER_FILING = len(TERM_COLUMNS)
+
+# 기간 열을 제외한 계정 행 필드 (그대로 복사)
+ROW_FIELDS = (
+    'rcept_no', 'reprt_code', 'corp_code', 'stock_code',
+    'fs_div', 'fs_nm', 'sj_div', 'sj_nm', 'account_nm', 'ord', 'currency'
+)
+
+
+def filing_years(filing):
+    """보고서 사업연도가 금액을 담고 있는 사업연도 목록 (당기, 전기, 전전기 순)"""
+    return [filing - term for term in range(TERMS_PER_FILING)]
+
+
+def available_terms(payload):
+    """응답에서 금액이 하나라도 있는 기간 열 번호 집합 (0: 당기, 1: 전기, 2: 전전기)"""
+    if not payload or payload.get('status') != '000':
+        return set()
+    terms = set()
+    for row in payload.get('list') or ():
+        for term, (_, _, amount_field) in enumerate(TERM_COLUMNS):
+            if row.get(amount_field):
+                terms.add(term)
+        if len(terms) == TERMS_PER_FILING:
+            break
+    return terms
+
+
+def plan_filings(years, filings, attempted=()):
+    """아직 값이 없는 사업연도를 모두 덮는 최소한의 조회할 보고서 사업연도 목록
+
+    filings는 {보고서 사업연도: 응답}(이미 가진 보고서), attempted는 이미 조회한
+    보고서 사업연도이다. 가장 늦은 미확보 연도부터 그 연도 보고서를 조회하면 아래
+    두 해도 함께 채워지므로, 위에서부터 차례로 고르는 것이 최소 조회 수가 된다.
+    """
+    covered = set()
+    for filing, payload in filings.items():
+        for term in available_terms(payload):
+            covered.add(filing - term)
+
+    plan = []
+    for year in sorted(set(years) - covered, reverse=True):
+        if year in covered or year in attempted or year in filings:
+            continue
+        plan.append(year)
+        covered.update(filing_years(year))
+    return plan
+
+
+def shift_payload(payload, filing, year):
+    """filing 보고서의 기간 열을 옮겨 year 사업연도 보고서 형식으로 변환
+
+    year에 해당하는 열이 당기가 되고, 그보다 오래된 열이 전기/전전기가 된다.
+    보고서에 없는 오래된 열은 ''로 채우고, 당기 금액이 없는 계정 행은 제외한다.
+    """
+    offset = filing - year
+    if offset == 0:
+        return dict(payload)
+
+    rows = []
+    for row in payload.get('list') or ():
+        if not row.get(TERM_COLUMNS[offset][2]):
+            continue
+        item = {field: row[field] for field in ROW_FIELDS if field in row}
+        item['bsns_year'] = str(year)
+        for term, target in enumerate(TERM_COLUMNS):
+            source = TERM_COLUMNS[offset + term] if offset + term < TERMS_PER_FILING else ('', '', '')
+            for source_field, target_field in zip(source, target):
+                item[target_field] = row.get(source_field) or ''
+        for term, target_field in enumerate(ADD_AMOUNT_COLUMNS):
+            source = ADD_AMOUNT_COLUMNS[offset + term] if offset + term < len(ADD_AMOUNT_COLUMNS) else ''
+            item[target_field] = row.get(source) or ''
+        rows.append(item)
+
+    return {'status': '000', 'message': payload.get('message') or '정상', 'list': rows}
+
+
+def stitch_series(years, filings):
+    """사업연도별로 그 연도를 담은 가장 최근 보고서를 골라 {사업연도: (응답, 보고서 사업연도)} 반환
+
+    어느 보고서에도 값이 없는 사업연도는 그 연도 보고서 응답(오류/데이터 없음)을
+    그대로 쓰고, 그마저 없으면 결과에서 제외한다.
+    """
+    terms = {filing: available_terms(payload) for filing, payload in filings.items()}
+    series = {}
+    for year in years:
+        sources = [filing for filing in filings if filing - year in terms[filing]]
+        if sources:
+            filing = max(sources)
+            series[year] = (shift_payload(filings[filing], filing, year), filing)
+        elif year in filings:
+            series[year] = (dict(filings[year]), year)
+    return series
+
+
+def collect_annual_series(years, load, fetch):
+    """사업보고서 시계열을 최소한의 OpenDART 호출로 수집
+
+    load(year)는 저장소/캐시에 있는 보고서(없으면 None)를, fetch(years)는
+    {year: 응답 또는 예외}를 반환한다. 조회한 보고서에 기대한 기간 열이 없으면
+    (상장 전 연도, 아직 공시되지 않은 연도 등) 남은 연도로 다시 계획한다.
+
+    ({사업연도: (응답, 보고서 사업연도)}, {보고서 사업연도: 새로 조회한 응답}) 반환
+    """
+    years = sorted({int(year) for year in years}, reverse=True)
+    filings = {}
+    for year in years:
+        payload = load(year)
+        if payload is not None:
+            filings[year] = payload
+
+    fetched = {}
+    attempted = set(filings)
+    while True:
+        plan = plan_filings(years, filings, attempted)
+        if not plan:
+            break
+        attempted.update(plan)
+        for filing, payload in fetch(plan).items():
+            fetched[filing] = payload
+            if not isinstance(payload, Exception):
+                filings[filing] = payload
+
+    return stitch_series(years, filings), fetched
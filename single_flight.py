@@ -0,0 +1,294 @@
+import asyncio
+import fcntl
+import functools
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+# 다른 워커가 남긴 결과를 재사용할 수 있는 시간 (초)
+SHARED_RESULT_TTL = 5.0
+
+# 다른 워커의 진행 중인 호출을 기다리는 최대 시간 (초)
+LOCK_WAIT_TIMEOUT = 30.0
+LOCK_POLL_INTERVAL = 0.01
+
+# AsyncSingleFlight가 잠금/결과 파일 입출력에만 쓰는 스레드 수
+LOCK_IO_THREADS = 2
+
+
+class _Call:
+    """진행 중인 호출 하나 (대기자들이 결과를 공유)"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """동일한 키의 동시 호출을 하나로 합치는 single-flight 계층
+
+    같은 프로세스 안에서는 먼저 들어온 호출(leader)만 실행하고 나머지는 그 결과를
+    기다린다. lock_dir를 지정하면 키별 파일 잠금으로 다른 gunicorn 워커와도
+    조정한다. 잠금을 가진 워커는 잠금 파일에 호출별 토큰을 쓰고 결과를 같은 토큰과
+    함께 JSON 파일로 남긴다. 잠금을 기다리던 워커는 토큰이 일치할 때만 직접 호출하지
+    않고 그 결과를 사용하므로, 호출이 실패했을 때 이전 호출의 결과를 쓰지 않는다.
+    결과는 JSON으로 직렬화할 수 있어야 하며, 반환값은 여러 호출자가 공유하므로
+    수정하려면 복사해서 쓴다.
+    """
+
+    def __init__(self, lock_dir=None, shared_ttl=SHARED_RESULT_TTL, lock_timeout=LOCK_WAIT_TIMEOUT):
+        self.lock_dir = lock_dir
+        self.shared_ttl = shared_ttl
+        self.lock_timeout = lock_timeout
+        if lock_dir:
+            os.makedirs(lock_dir, exist_ok=True)
+
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.stats = {
+            'calls': 0,
+            'executed': 0,
+            'collapsed_in_process': 0,
+            'collapsed_cross_process': 0
+        }
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def do(self, key, fn):
+        """key에 대해 fn()을 한 번만 실행하고 결과를 공유"""
+        with self._lock:
+            self.stats['calls'] += 1
+            call = self._calls.get(key)
+            if call is not None:
+                self.stats['collapsed_in_process'] += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = self._run(key, fn)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def _paths(self, key):
+        digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+        base = os.path.join(self.lock_dir, digest)
+        return base + '.lock', base + '.json'
+
+    def _read_token(self, lock_file):
+        """마지막으로 잠금을 잡고 호출한 워커의 토큰"""
+        try:
+            lock_file.seek(0)
+            return lock_file.read().strip()
+        except OSError:
+            return ''
+
+    def _write_token(self, lock_file, token):
+        lock_file.seek(0)
+        lock_file.truncate()
+        lock_file.write(token)
+        lock_file.flush()
+
+    def _read_shared(self, result_path, since, token):
+        """token 호출이 since 이후에 남긴 결과 (없으면 None)"""
+        if not token:
+            return None
+        try:
+            if os.path.getmtime(result_path) < since - self.shared_ttl:
+                return None
+            with open(result_path, encoding='utf-8') as f:
+                shared = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(shared, dict) or shared.get('token') != token:
+            return None
+        return shared.get('result')
+
+    def _write_shared(self, result_path, token, result):
+        try:
+            tmp_path = f'{result_path}.{os.getpid()}.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'token': token, 'result': result}, f, ensure_ascii=False)
+            os.replace(tmp_path, result_path)
+        except (OSError, TypeError, ValueError):
+            pass
+
+    def _open_lock(self, key):
+        """키의 잠금 파일(열린 파일)과 결과 파일 경로"""
+        lock_path, result_path = self._paths(key)
+        return open(lock_path, 'a+'), result_path
+
+    def _try_lock(self, lock_file):
+        """잠금을 기다리지 않고 시도 (얻으면 True)"""
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except OSError:
+            return False
+
+    def _unlock(self, lock_file):
+        fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _claim(self, lock_file):
+        """잠금을 가진 상태에서 새 호출 토큰을 기록하고 반환"""
+        token = uuid.uuid4().hex
+        self._write_token(lock_file, token)
+        return token
+
+    def _take_shared(self, lock_file, result_path, since):
+        """잠금을 놓은 워커의 토큰과 같은 결과 (그 호출이 실패했으면 None)"""
+        return self._read_shared(result_path, since, self._read_token(lock_file))
+
+    def _run(self, key, fn):
+        if not self.lock_dir:
+            self._count('executed')
+            return fn()
+
+        started = time.time()
+        lock_file, result_path = self._open_lock(key)
+        with lock_file:
+            locked = self._try_lock(lock_file)
+            if not locked:
+                # 다른 워커가 같은 키를 호출 중이면 끝날 때까지 기다린 뒤 결과를 재사용
+                deadline = time.monotonic() + self.lock_timeout
+                while not locked and time.monotonic() < deadline:
+                    time.sleep(LOCK_POLL_INTERVAL)
+                    locked = self._try_lock(lock_file)
+
+                if locked:
+                    shared = self._take_shared(lock_file, result_path, started)
+                    if shared is not None:
+                        self._unlock(lock_file)
+                        self._count('collapsed_cross_process')
+                        return shared
+
+            try:
+                self._count('executed')
+                if not locked:
+                    return fn()
+
+                token = self._claim(lock_file)
+                result = fn()
+                self._write_shared(result_path, token, result)
+                return result
+            finally:
+                if locked:
+                    self._unlock(lock_file)
+
+    def get_stats(self):
+        """호출 수와 합쳐진 요청 수"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['in_flight'] = len(self._calls)
+        return stats
+
+
+def default_lock_dir():
+    """워커 간 조정에 쓰는 기본 디렉터리"""
+    return os.getenv('SINGLE_FLIGHT_DIR') or os.path.join(tempfile.gettempdir(), 'fs-app-single-flight')
+
+
+class AsyncSingleFlight:
+    """asyncio용 single-flight (같은 이벤트 루프 안의 동일한 호출을 하나로 합침)
+
+    호출은 별도 태스크에서 실행하므로 먼저 들어온 요청이 취소되어도 기다리던 요청은
+    결과를 받는다. shared에 lock_dir가 있는 SingleFlight를 주면 같은 파일 잠금과
+    결과 파일로 다른 워커와도 조정한다. 잠금은 이벤트 루프에서 기다리지 않는 방식으로
+    시도하고, 파일 입출력만 전용 스레드 풀에서 처리하므로 스레드가 이벤트 루프의
+    작업을 기다리며 묶이지 않는다.
+    """
+
+    def __init__(self, shared=None):
+        self.shared = shared if shared is not None and shared.lock_dir else None
+        self._executor = None
+        self._tasks = {}
+        self.stats = {
+            'calls': 0,
+            'executed': 0,
+            'collapsed_in_process': 0
+        }
+
+    async def do(self, key, fn):
+        """key에 대해 await fn()을 한 번만 실행하고 결과를 공유"""
+        self.stats['calls'] += 1
+        task = self._tasks.get(key)
+        if task is not None:
+            self.stats['collapsed_in_process'] += 1
+        else:
+            self.stats['executed'] += 1
+            task = self._tasks[key] = asyncio.ensure_future(self._run(key, fn))
+            task.add_done_callback(functools.partial(self._finish, key))
+        return await asyncio.shield(task)
+
+    async def _io(self, func, *args):
+        """잠금/결과 파일 입출력을 전용 스레드 풀에서 실행"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=LOCK_IO_THREADS, thread_name_prefix='single-flight')
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def _run(self, key, fn):
+        shared = self.shared
+        if shared is None:
+            return await fn()
+
+        started = time.time()
+        lock_file, result_path = await self._io(shared._open_lock, key)
+        try:
+            locked = shared._try_lock(lock_file)
+            if not locked:
+                # 다른 워커가 같은 키를 호출 중이면 스레드를 잡지 않고 주기적으로 다시 시도
+                deadline = time.monotonic() + shared.lock_timeout
+                while not locked and time.monotonic() < deadline:
+                    await asyncio.sleep(LOCK_POLL_INTERVAL)
+                    locked = shared._try_lock(lock_file)
+
+                if locked:
+                    result = await self._io(shared._take_shared, lock_file, result_path, started)
+                    if result is not None:
+                        shared._count('collapsed_cross_process')
+                        return result
+
+            shared._count('executed')
+            if not locked:
+                return await fn()
+
+            token = await self._io(shared._claim, lock_file)
+            result = await fn()
+            await self._io(shared._write_shared, result_path, token, result)
+            return result
+        finally:
+            # 파일을 닫으면 잠금도 풀림
+            lock_file.close()
+
+    def _finish(self, key, task):
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        if not task.cancelled():
+            # 기다리는 호출자가 없어도 경고가 남지 않도록 예외를 조회해 둠
+            task.exception()
+
+    def get_stats(self):
+        stats = dict(self.stats)
+        stats['in_flight'] = len(self._tasks)
+        return stats
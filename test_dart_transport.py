@@ -0,0 +1,105 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from dart_transport import (
+    DartTransport, DartTransportError, QuotaExceededError, SharedTokenBucket, get_json_many
+)
+
+DELAY = 0.2
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        time.sleep(DELAY)
+        if self.path.startswith('/missing'):
+            self.send_response(404)
+            self.end_headers()
+            return
+        if self.path.startswith('/html'):
+            body = b'<html>maintenance</html>'
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        body = json.dumps({'status': '000', 'path': self.path}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def base_url():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_port}'
+    server.shutdown()
+    server.server_close()
+
+
+def test_get_json_many_runs_calls_concurrently(base_url):
+    periods = [(str(year), '11011') for year in range(2018, 2024)]
+    started = time.perf_counter()
+    results = get_json_many(
+        (period, f'{base_url}/fnlttSinglAcnt.json', {'bsns_year': period[0]}) for period in periods
+    )
+    elapsed = time.perf_counter() - started
+
+    assert list(results) == periods
+    assert results[('2020', '11011')]['path'].endswith('bsns_year=2020')
+    assert elapsed < DELAY * len(periods) / 2
+
+
+def test_get_json_many_returns_exceptions_per_key(base_url):
+    results = get_json_many([
+        ('ok', f'{base_url}/company.json', None),
+        ('missing', f'{base_url}/missing.json', None)
+    ])
+
+    assert results['ok']['status'] == '000'
+    assert isinstance(results['missing'], DartTransportError)
+
+
+def test_undecodable_body_is_transport_error(base_url, tmp_path):
+    limiter = SharedTokenBucket(str(tmp_path / 'rate.json'), rate=1000, capacity=1000)
+    transport = DartTransport(base_url, max_retries=1, rate_limiter=limiter)
+
+    with pytest.raises(DartTransportError):
+        transport.get_json('html.json')
+
+
+def test_rate_limit_is_shared_between_workers(tmp_path):
+    path = str(tmp_path / 'rate.json')
+    # 워커 두 개가 같은 상태 파일을 씀
+    first = SharedTokenBucket(path, rate=1, capacity=2, daily_quota=0)
+    second = SharedTokenBucket(path, rate=1, capacity=2, daily_quota=0)
+
+    assert first.reserve() == 0.0
+    assert second.reserve() == 0.0
+    assert first.reserve() > 0.5
+
+
+def test_daily_quota_stops_requests(tmp_path):
+    path = tmp_path / 'rate.json'
+    limiter = SharedTokenBucket(str(path), rate=1000, capacity=1000, daily_quota=2)
+
+    limiter.reserve()
+    SharedTokenBucket(str(path), rate=1000, capacity=1000, daily_quota=2).reserve()
+    with pytest.raises(QuotaExceededError):
+        limiter.reserve()
+
+    # 날짜가 바뀌면 다시 요청 가능
+    state = json.loads(path.read_text())
+    state['day'] = '2000-01-01'
+    path.write_text(json.dumps(state))
+    assert limiter.reserve() == 0.0
@@ -0,0 +1,43 @@
+import datetime
+
+from financial_cache import (
+    CLOSED_YEAR_TTL, CURRENT_YEAR_TTL, ERROR_TTL, NO_DATA_TTL, FinancialStatementCache, ttl_for
+)
+
+TODAY = datetime.date(2024, 5, 1)
+
+
+def test_ttl_for_normal_responses():
+    assert ttl_for('2023', '000', TODAY) == CLOSED_YEAR_TTL
+    assert ttl_for(2024, '000', TODAY) == CURRENT_YEAR_TTL
+    assert ttl_for(None, '000', TODAY) == CURRENT_YEAR_TTL
+
+
+def test_ttl_for_no_data_responses():
+    # 직전 사업연도 보고서는 아직 제출 중일 수 있음
+    assert ttl_for('2022', '013', TODAY) == NO_DATA_TTL
+    assert ttl_for('2023', '013', TODAY) == CURRENT_YEAR_TTL
+    assert ttl_for('2024', '013', TODAY) == CURRENT_YEAR_TTL
+    assert ttl_for(None, '013', TODAY) == ERROR_TTL
+
+
+def test_ttl_for_errors():
+    for status in ('020', '100', 'error', None):
+        assert ttl_for('2020', status, TODAY) == ERROR_TTL
+
+
+def test_cache_round_trip(tmp_path):
+    cache = FinancialStatementCache(str(tmp_path / 'financial_cache.db'))
+    payload = {'status': '000', 'message': '정상', 'list': [{'account_nm': '자산총계'}]}
+
+    cache.put('00126380', 2020, '11011', payload)
+
+    assert cache.get('00126380', '2020', '11011') == payload
+    assert cache.get('00126380', '2021', '11011') is None
+
+
+def test_cache_skips_inferred_no_data(tmp_path):
+    cache = FinancialStatementCache(str(tmp_path / 'financial_cache.db'))
+    cache.put('00164779', 2020, '11011', {'status': '013', 'message': '조회된 데이타가 없습니다.', 'inferred': True})
+
+    assert cache.get('00164779', '2020', '11011') is None
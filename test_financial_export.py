@@ -0,0 +1,17 @@
+import pytest
+
+import financial_export
+from financial_export import parse_export_format
+
+
+def test_parse_export_format():
+    assert parse_export_format(None) == 'ndjson'
+    assert parse_export_format('CSV') == 'csv'
+    with pytest.raises(ValueError):
+        parse_export_format('xlsx')
+
+
+def test_parquet_requires_pyarrow(monkeypatch):
+    monkeypatch.setattr(financial_export, 'pyarrow', None)
+    with pytest.raises(ValueError, match='pyarrow'):
+        parse_export_format('parquet')
@@ -0,0 +1,92 @@
+from financial_store import AMOUNT_FIELDS, FinancialStatementStore, TEXT_FIELDS
+
+
+def account_row(fs_div, sj_div, account_nm, ord, thstrm, frmtrm='', **extra):
+    """fnlttSinglAcnt 응답의 list 행 (모든 필드 포함)"""
+    row = {
+        'rcept_no': '20240312000736', 'corp_code': '00126380', 'stock_code': '005930',
+        'bsns_year': '2023', 'reprt_code': '11011',
+        'fs_div': fs_div, 'fs_nm': '연결재무제표' if fs_div == 'CFS' else '재무제표',
+        'sj_div': sj_div, 'sj_nm': '재무상태표' if sj_div == 'BS' else '손익계산서',
+        'account_nm': account_nm,
+        'thstrm_nm': '제 55 기', 'thstrm_dt': '2023.12.31',
+        'frmtrm_nm': '제 54 기', 'frmtrm_dt': '2022.12.31',
+        'bfefrmtrm_nm': '제 53 기', 'bfefrmtrm_dt': '2021.12.31',
+        'thstrm_amount': thstrm, 'thstrm_add_amount': '',
+        'frmtrm_amount': frmtrm, 'frmtrm_add_amount': '',
+        'bfefrmtrm_amount': '', 'ord': str(ord), 'currency': 'KRW'
+    }
+    row.update(extra)
+    return row
+
+
+def test_put_report_round_trip(tmp_path):
+    store = FinancialStatementStore(str(tmp_path / 'financial_statements.db'))
+    payload = {
+        'status': '000',
+        'message': '정상',
+        'list': [
+            account_row('CFS', 'BS', '자산총계', 1, '455,905,980,000,000', '448,424,507,000,000',
+                        bfefrmtrm_amount='426,621,158,000,000'),
+            account_row('CFS', 'IS', '매출액', 2, '258,935,494,000,000', '302,231,360,000,000',
+                        thstrm_add_amount='67,780,443,000,000', frmtrm_add_amount='76,781,680,000,000'),
+            account_row('CFS', 'IS', '당기순이익(손실)', 3, '15,487,100,000,000'),
+            account_row('OFS', 'BS', '자산총계', 1, '298,037,010,000,000', bfefrmtrm_dt=''),
+        ]
+    }
+
+    assert store.put_report('00126380', 2023, '11011', payload)
+    assert store.get_report('00126380', 2023, '11011') == payload
+
+
+def test_report_rows_fill_missing_fields(tmp_path):
+    store = FinancialStatementStore(str(tmp_path / 'financial_statements.db'))
+    store.put_report('00126380', '2023', '11011', {
+        'status': '000',
+        'list': [{'fs_div': 'CFS', 'sj_div': 'BS', 'account_nm': '자산총계', 'thstrm_amount': '100'}]
+    })
+
+    row = store.get_report('00126380', '2023', '11011')['list'][0]
+    assert set(row) == {'corp_code', 'bsns_year', 'reprt_code', 'fs_div', 'sj_div', 'account_nm',
+                        *TEXT_FIELDS, *AMOUNT_FIELDS}
+    assert row['thstrm_amount'] == '100'
+    assert row['frmtrm_add_amount'] == ''
+    assert row['stock_code'] == ''
+
+
+def test_no_data_report(tmp_path):
+    store = FinancialStatementStore(str(tmp_path / 'financial_statements.db'))
+    payload = {'status': '013', 'message': '조회된 데이타가 없습니다.'}
+
+    assert store.put_report('00126380', '2020', '11011', payload)
+    assert store.get_report('00126380', '2020', '11011') == payload
+    assert not store.put_report('00126380', '2021', '11011', {'status': '020', 'message': '요청 제한'})
+    assert store.get_report('00126380', '2021', '11011') is None
+
+
+def test_inferred_no_data_is_skip_record(tmp_path):
+    store = FinancialStatementStore(str(tmp_path / 'financial_statements.db'))
+    payload = {'status': '013', 'message': '조회된 데이타가 없습니다.', 'inferred': True}
+
+    assert store.put_report('00126380', '2020', '11011', payload)
+    assert store.get_report('00126380', '2020', '11011') is None
+    assert not store.has_report('00126380', '2020', '11011')
+    assert store.missing_corp_codes(['00126380', '00164779'], '2020', '11011') == ['00164779']
+
+
+def test_backfill_ratios_rebuilds_on_version_change(tmp_path):
+    store = FinancialStatementStore(str(tmp_path / 'financial_statements.db'))
+    store.put_report('00126380', '2023', '11011', {
+        'status': '000',
+        'list': [
+            account_row('CFS', 'BS', '부채총계', 1, '100'),
+            account_row('CFS', 'BS', '자본총계', 2, '400'),
+        ]
+    })
+
+    assert store.backfill_ratios() == 1
+    assert store.backfill_ratios() == 0
+
+    conn = store._connect()
+    conn.execute('PRAGMA user_version = 0')
+    assert store.backfill_ratios() == 1
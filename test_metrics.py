@@ -0,0 +1,39 @@
+import os
+import time
+
+from metrics import AGGREGATE_FILE, REQUEST_SECONDS, STALE_AFTER, MetricsRegistry
+
+
+def worker_file(metrics_dir, name, count, age):
+    """count번 관측한 종료된(age초 전에 마지막으로 기록한) 워커 파일"""
+    worker = MetricsRegistry()
+    for _ in range(count):
+        worker.observe(REQUEST_SECONDS, 0.01, endpoint='search_company', status='200')
+    worker._path = str(metrics_dir / name)
+    worker.flush()
+    mtime = time.time() - age
+    os.utime(worker._path, (mtime, mtime))
+    return worker._path
+
+
+def request_count(registry):
+    values = registry.collect()[(REQUEST_SECONDS, (('endpoint', 'search_company'), ('status', '200')))]
+    return sum(values[:-1])
+
+
+def test_compact_folds_dead_worker_files(tmp_path):
+    dead = [worker_file(tmp_path, f'{pid}-1.json', 2, STALE_AFTER * 2) for pid in (101, 102)]
+    live = worker_file(tmp_path, '103-1.json', 3, 0)
+    registry = MetricsRegistry(str(tmp_path))
+
+    assert request_count(registry) == 7
+    assert registry.compact() == 2
+    assert not any(os.path.exists(path) for path in dead)
+    assert os.path.exists(live)
+    assert request_count(registry) == 7
+
+    # 다음 정리에서도 합산 파일은 그대로 두고 새로 종료된 워커만 더함
+    worker_file(tmp_path, '104-1.json', 1, STALE_AFTER * 2)
+    assert registry.compact() == 1
+    assert request_count(registry) == 8
+    assert sorted(os.listdir(tmp_path)) == ['103-1.json', AGGREGATE_FILE, 'aggregate.lock']
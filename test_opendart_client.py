@@ -0,0 +1,55 @@
+from datetime import date
+
+import pytest
+
+import opendart_client
+from dart_transport import DartTransportError
+from opendart_client import MIN_BSNS_YEAR, fetch_multi_financial_info, parse_years
+
+
+def test_parse_years_ranges_and_lists():
+    assert parse_years('2019-2021') == ['2019', '2020', '2021']
+    assert parse_years('2021, 2019,2021') == ['2021', '2019']
+    assert parse_years('2019-2020,2020-2021') == ['2019', '2020', '2021']
+
+
+@pytest.mark.parametrize('value', [
+    '1-100000000', f'{MIN_BSNS_YEAR - 1}', f'{date.today().year + 1}', '2021-2019', '20x1', '2019-'
+])
+def test_parse_years_rejects_invalid_years(value):
+    with pytest.raises(ValueError):
+        parse_years(value)
+
+
+def test_parse_years_limits_count():
+    assert len(parse_years('2015-2024', max_years=10)) == 10
+    with pytest.raises(ValueError):
+        parse_years('2015-2024', max_years=9)
+
+
+def test_fetch_multi_financial_info_fans_out_chunks(monkeypatch):
+    calls = []
+
+    def fake_get_json_many(requests):
+        requests = list(requests)
+        calls.append(requests)
+        results = {}
+        for key, path, params in requests:
+            corp_codes = params['corp_code'].split(',')
+            if key == 1:
+                results[key] = DartTransportError('timeout')
+            else:
+                results[key] = {'status': '000', 'list': [{'corp_code': corp_codes[0]}]}
+        return results
+
+    monkeypatch.setattr(opendart_client, 'get_json_many', fake_get_json_many)
+    corp_codes = [f'{i:08d}' for i in range(250)]
+    results = fetch_multi_financial_info('key', corp_codes, '2023', '11011')
+
+    assert len(calls) == 1
+    assert [params['corp_code'].count(',') + 1 for _, _, params in calls[0]] == [100, 100, 50]
+    assert results['00000000']['list'] == [{'corp_code': '00000000'}]
+    assert results['00000001']['inferred']
+    assert isinstance(results['00000100'], DartTransportError)
+    assert results['00000200']['status'] == '000'
+    assert len(results) == 250
@@ -0,0 +1,50 @@
+from search_engine import CompanySearchIndex, TypeaheadCache
+
+NAMES = [
+    '삼성전자', '삼성전기', '삼성SDI', '삼성물산', '삼성생명', '삼성화재해상보험', '삼성중공업',
+    '삼천리', '삼양사', '삼양식품', '에스케이하이닉스', '엘지전자', '엘지화학', '현대자동차',
+    '현대모비스', '전자랜드', '대성전기', '삼성전자서비스', '한국전력공사', '삼보판지'
+]
+
+
+def make_index():
+    records = [
+        (f'{i:08d}', name, f'{i:06d}' if i % 3 else '', '20240101')
+        for i, name in enumerate(NAMES)
+    ]
+    return CompanySearchIndex(records)
+
+
+def test_typeahead_refinement_matches_index_search():
+    index = make_index()
+    key_index = index.name_index
+    typeahead = TypeaheadCache()
+
+    for word in ('삼성전자서비스', '현대모비스', '엘지화학'):
+        for end in range(1, len(word) + 1):
+            query = word[:end]
+            assert typeahead.search('name_index', key_index, query, 10) == key_index.search(query, 10)
+
+    stats = typeahead.get_stats()
+    assert stats['refinements'] > 0
+
+
+def test_typeahead_refines_from_smaller_posting():
+    index = make_index()
+    key_index = index.name_index
+    # 접두어 "삼" 후보는 많고 "삼보" posting은 작음
+    typeahead = TypeaheadCache()
+    typeahead.search('name_index', key_index, '삼', 10)
+
+    assert typeahead.search('name_index', key_index, '삼보', 10) == key_index.search('삼보', 10)
+    assert typeahead.search('name_index', key_index, '삼보판', 10) == key_index.search('삼보판', 10)
+    assert typeahead.get_stats()['refinements'] == 2
+
+
+def test_search_returns_listed_first():
+    index = make_index()
+    results = index.search('삼성', limit=10)
+    listed = [bool(result['stock_code']) for result in results]
+
+    assert all('삼성' in result['corp_name'] for result in results)
+    assert listed == sorted(listed, reverse=True)
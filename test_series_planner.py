@@ -0,0 +1,71 @@
+from series_planner import collect_annual_series, plan_filings, shift_payload, stitch_series
+
+
+def filing(year, terms=3, account_nm='매출액'):
+    """year 사업보고서 응답 (금액은 사업연도 값을 그대로 사용, terms개 기간 열만 채움)"""
+    row = {
+        'corp_code': '00126380', 'bsns_year': str(year), 'reprt_code': '11011',
+        'fs_div': 'CFS', 'sj_div': 'IS', 'account_nm': account_nm, 'ord': '1',
+        'thstrm_add_amount': '', 'frmtrm_add_amount': ''
+    }
+    for term, prefix in enumerate(('thstrm', 'frmtrm', 'bfefrmtrm')):
+        row[f'{prefix}_nm'] = f'제 {year - term} 기'
+        row[f'{prefix}_dt'] = f'{year - term}.12.31'
+        row[f'{prefix}_amount'] = f'{year - term:,}' if term < terms else ''
+    return {'status': '000', 'message': '정상', 'list': [row]}
+
+
+def test_plan_covers_years_with_fewest_filings():
+    assert plan_filings(range(2015, 2024), {}) == [2023, 2020, 2017]
+    assert plan_filings([2023, 2022, 2021], {}) == [2023]
+    assert plan_filings([2023, 2019], {}) == [2023, 2019]
+
+
+def test_plan_skips_years_already_covered_or_attempted():
+    assert plan_filings(range(2015, 2024), {2022: filing(2022)}) == [2023, 2019, 2016]
+    assert plan_filings([2023, 2022], {2023: filing(2023, terms=1)}, attempted={2023}) == [2022]
+    assert plan_filings([2023], {2023: {'status': '013'}}, attempted={2023}) == []
+
+
+def test_shift_payload_moves_term_columns():
+    row = shift_payload(filing(2023), 2023, 2021)['list'][0]
+
+    assert row['bsns_year'] == '2021'
+    assert (row['thstrm_amount'], row['thstrm_dt']) == ('2,021', '2021.12.31')
+    assert row['frmtrm_amount'] == ''
+    assert row['bfefrmtrm_amount'] == ''
+    assert row['thstrm_add_amount'] == ''
+
+
+def test_shift_payload_drops_rows_without_term():
+    assert shift_payload(filing(2023, terms=1), 2023, 2022)['list'] == []
+
+
+def test_stitch_prefers_latest_filing():
+    series = stitch_series([2023, 2022, 2021, 2020], {2023: filing(2023), 2021: filing(2021)})
+
+    assert {year: source for year, (_, source) in series.items()} == {2023: 2023, 2022: 2023, 2021: 2023, 2020: 2021}
+    assert series[2020][0]['list'][0]['thstrm_amount'] == '2,020'
+    assert series[2020][0]['list'][0]['frmtrm_amount'] == '2,019'
+
+
+def test_stitch_keeps_no_data_response():
+    no_data = {'status': '013', 'message': '조회된 데이타가 없습니다.'}
+    series = stitch_series([2023, 2014], {2023: filing(2023), 2014: no_data})
+
+    assert series[2014] == (no_data, 2014)
+
+
+def test_collect_replans_when_filing_lacks_older_terms():
+    calls = []
+
+    def fetch(years):
+        calls.append(list(years))
+        # 2021년 상장: 2023년 보고서에는 전기까지만 있음
+        return {year: filing(year, terms=2) if year == 2023 else filing(year) for year in years}
+
+    series, fetched = collect_annual_series(['2023', '2022', '2021', '2020'], lambda year: None, fetch)
+
+    assert calls == [[2023, 2020], [2021]]
+    assert sorted(fetched) == [2020, 2021, 2023]
+    assert {year: source for year, (_, source) in series.items()} == {2023: 2023, 2022: 2023, 2021: 2021, 2020: 2021}
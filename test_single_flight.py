@@ -0,0 +1,146 @@
+import asyncio
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from single_flight import AsyncSingleFlight, SingleFlight
+
+
+def start_leader(flight, key, fn):
+    """다른 스레드에서 leader 호출을 시작하고 (스레드, 결과/예외 목록) 반환"""
+    outcome = []
+
+    def run():
+        try:
+            outcome.append(flight.do(key, fn))
+        except Exception as e:
+            outcome.append(e)
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread, outcome
+
+
+def test_followers_share_leader_error():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def fail():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        raise ValueError('upstream down')
+
+    leader, outcome = start_leader(flight, 'key', fail)
+    started.wait(5)
+    follower, follower_outcome = start_leader(flight, 'key', fail)
+    while flight.get_stats()['collapsed_in_process'] == 0:
+        time.sleep(0.001)
+    release.set()
+    leader.join()
+    follower.join()
+
+    assert len(calls) == 1
+    assert isinstance(outcome[0], ValueError)
+    assert follower_outcome[0] is outcome[0]
+    assert flight.get_stats()['in_flight'] == 0
+
+
+def test_cross_process_follower_reuses_leader_result(tmp_path):
+    leader_flight = SingleFlight(str(tmp_path))
+    follower_flight = SingleFlight(str(tmp_path))
+    started = threading.Event()
+    release = threading.Event()
+
+    def fetch():
+        started.set()
+        release.wait(5)
+        return {'status': '000'}
+
+    leader, outcome = start_leader(leader_flight, 'key', fetch)
+    started.wait(5)
+    timer = threading.Timer(0.05, release.set)
+    timer.start()
+    result = follower_flight.do('key', lambda: pytest.fail('follower should reuse the leader result'))
+    leader.join()
+
+    assert result == outcome[0] == {'status': '000'}
+    assert follower_flight.get_stats()['collapsed_cross_process'] == 1
+
+
+def test_cross_process_follower_ignores_previous_result_when_leader_fails(tmp_path):
+    leader_flight = SingleFlight(str(tmp_path))
+    follower_flight = SingleFlight(str(tmp_path))
+
+    # 직전 호출이 남긴 결과 (SHARED_RESULT_TTL 안)
+    assert leader_flight.do('key', lambda: {'status': '000', 'flight': 'previous'})['flight'] == 'previous'
+
+    started = threading.Event()
+    release = threading.Event()
+
+    def fail():
+        started.set()
+        release.wait(5)
+        raise ValueError('upstream down')
+
+    leader, outcome = start_leader(leader_flight, 'key', fail)
+    started.wait(5)
+    timer = threading.Timer(0.05, release.set)
+    timer.start()
+    result = follower_flight.do('key', lambda: {'status': '000', 'flight': 'follower'})
+    leader.join()
+
+    assert isinstance(outcome[0], ValueError)
+    assert result['flight'] == 'follower'
+    assert follower_flight.get_stats()['collapsed_cross_process'] == 0
+
+
+def test_async_distinct_keys_beyond_executor_size(tmp_path):
+    # 호출 안에서 기본 스레드 풀을 쓰는 경우 (asgi의 저장소 조회/저장)
+    flight = AsyncSingleFlight(SingleFlight(str(tmp_path)))
+    executor_size = 2
+
+    async def fetch(key):
+        await asyncio.to_thread(time.sleep, 0.01)
+        return {'key': key}
+
+    async def main():
+        asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=executor_size))
+        keys = [f'key-{i}' for i in range(executor_size * 4)]
+        return await asyncio.wait_for(
+            asyncio.gather(*(flight.do(key, functools.partial(fetch, key)) for key in keys)), timeout=10
+        )
+
+    results = asyncio.run(main())
+
+    assert [result['key'] for result in results] == [f'key-{i}' for i in range(executor_size * 4)]
+
+
+def test_async_follower_reuses_result_from_other_process(tmp_path):
+    leader_flight = SingleFlight(str(tmp_path))
+    follower_flight = AsyncSingleFlight(SingleFlight(str(tmp_path)))
+    started = threading.Event()
+    release = threading.Event()
+
+    def fetch():
+        started.set()
+        release.wait(5)
+        return {'status': '000'}
+
+    async def fail():
+        pytest.fail('follower should reuse the leader result')
+
+    leader, outcome = start_leader(leader_flight, 'key', fetch)
+    started.wait(5)
+    timer = threading.Timer(0.05, release.set)
+    timer.start()
+    result = asyncio.run(follower_flight.do('key', fail))
+    leader.join()
+
+    assert result == outcome[0] == {'status': '000'}
+    assert follower_flight.shared.get_stats()['collapsed_cross_process'] == 1